@@ -1,4 +1,5 @@
 import json
+import time
 import random
 from collections import defaultdict, Counter
 from datetime import datetime, timedelta
@@ -7,7 +8,11 @@ from typing import Dict, List, Any, Optional, Tuple
 
 from app.core import cache, db
 from app.utils.logger import log
-from app.services import crawler_factory
+from app.services import crawler_factory, publisher
+from app.services.snapshot_store import snapshot_store
+
+# 峰值时间和在榜时长取自最近24小时的平台快照
+SNAPSHOT_WINDOW = 24 * 3600
 
 class TrendPredictor:
     """热点趋势预测器，用于预测热点话题的发展趋势"""
@@ -54,15 +59,17 @@ class TrendPredictor:
                 "updated_at": datetime.now(self.shanghai_tz).strftime("%Y-%m-%d %H:%M:%S")
             }
         
+        snapshots = self._load_snapshots()
+        
         # 预测结果
         result = {
             "status": "success",
             "message": "热点趋势预测完成",
             "date": date_str,
-            "trending_topics": self._predict_trending_topics(historical_data),
+            "trending_topics": self._predict_trending_topics(historical_data, snapshots),
             "category_trends": self._predict_category_trends(historical_data),
             "platform_trends": self._predict_platform_trends(historical_data),
-            "keyword_predictions": self._predict_keywords(historical_data),
+            "keyword_predictions": self._predict_keywords(historical_data, snapshots),
             "prediction_window": f"{self.history_days} days",
             "updated_at": datetime.now(self.shanghai_tz).strftime("%Y-%m-%d %H:%M:%S")
         }
@@ -79,20 +86,63 @@ class TrendPredictor:
             date = end_date - timedelta(days=i)
             date_str = date.strftime("%Y-%m-%d")
             
-            daily_data = {}
-            for platform in crawler_factory.keys():
-                cache_key = f"crawler:{platform}:{date_str}"
-                platform_data = cache.get_cache(cache_key)
-                if platform_data:
-                    daily_data[platform] = platform_data
+            _, daily_data = publisher.read_news(date_str, list(crawler_factory.keys()))
+            daily_data = {platform: data for platform, data in daily_data.items() if data}
             
             if daily_data:  # 只保存有数据的日期
                 historical_data[date_str] = daily_data
         
         return historical_data
     
-    def _predict_trending_topics(self, historical_data: Dict[str, Dict[str, List]]) -> List[Dict[str, Any]]:
-        """预测未来将会流行的话题"""
+    def _load_snapshots(self) -> Dict[str, List[Dict[str, Any]]]:
+        """各平台最近 SNAPSHOT_WINDOW 秒内的快照"""
+        since = int((time.time() - SNAPSHOT_WINDOW) * 1000)
+        return {platform: snapshot_store.history(platform, since) for platform in crawler_factory.keys()}
+    
+    @staticmethod
+    def _topic_points(snapshots: Dict[str, List[Dict[str, Any]]], platforms: List[str],
+                      title: str) -> List[Tuple[int, float]]:
+        """话题在各平台快照中的 (时间戳, 热度) 序列，平台没有热度时以排名的相反数代替，越大越热"""
+        points = []
+        for platform in platforms:
+            for snapshot in snapshots.get(platform, []):
+                item = next((item for item in snapshot["items"] if item.get("title") == title), None)
+                if item is None:
+                    continue
+                score = item.get("score")
+                points.append((snapshot["ts"], score if isinstance(score, (int, float)) else -item.get("rank", 0)))
+        points.sort(key=lambda point: point[0])
+        return points
+    
+    @staticmethod
+    def _keyword_points(snapshots: Dict[str, List[Dict[str, Any]]], keyword: str) -> List[Tuple[int, float]]:
+        """关键词每小时出现在各平台榜单中的标题数（每个平台取该小时最后一个快照），不出现的小时跳过"""
+        hourly = defaultdict(dict)
+        for platform, history in snapshots.items():
+            for snapshot in history:
+                count = sum(1 for item in snapshot["items"] if keyword in (item.get("title") or ""))
+                hourly[snapshot["ts"] // 3600000][platform] = count
+        points = [(hour * 3600000, sum(counts.values())) for hour, counts in sorted(hourly.items())]
+        return [point for point in points if point[1]]
+    
+    def _peak_and_duration(self, points: List[Tuple[int, float]]) -> Tuple[Optional[str], Optional[str]]:
+        """按快照序列返回峰值时间和在榜时长，快照中没有数据时都为 None
+
+        最新的时间点就是峰值时，峰值尚未出现。
+        """
+        if not points:
+            return None, None
+        peak_ts = max(points, key=lambda point: point[1])[0]
+        if len(points) > 1 and peak_ts == points[-1][0]:
+            peak_time = "尚未达到峰值"
+        else:
+            peak_time = datetime.fromtimestamp(peak_ts / 1000, self.shanghai_tz).strftime("%Y-%m-%d %H:%M")
+        hours = (points[-1][0] - points[0][0]) / 3600000
+        return peak_time, f"{hours:.1f}小时"
+    
+    def _predict_trending_topics(self, historical_data: Dict[str, Dict[str, List]],
+                                 snapshots: Dict[str, List[Dict[str, Any]]]) -> List[Dict[str, Any]]:
+        """预测未来将会流行的话题，峰值时间和在榜时长取自平台快照"""
         # 分析历史数据中的上升趋势话题
         rising_topics = self._find_rising_topics(historical_data)
         persistent_topics = self._find_persistent_topics(historical_data)
@@ -102,13 +152,17 @@ class TrendPredictor:
         
         # 添加上升趋势明显的话题
         for topic in rising_topics[:5]:
+            # 热度只在同一平台内可比，按最近一次出现的平台计算峰值
+            peak_time, duration = self._peak_and_duration(
+                self._topic_points(snapshots, [topic["last_appearance"]["platform"]], topic["title"])
+            )
             trending_topics.append({
                 "title": topic["title"],
                 "trend": "rising",
                 "prediction": {
                     "future_rank": "上升",
-                    "peak_time": f"{datetime.now(self.shanghai_tz) + timedelta(hours=random.randint(6, 24))}",
-                    "duration": f"{random.randint(1, 3)}天",
+                    "peak_time": peak_time,
+                    "duration": duration,
                     "confidence": random.randint(70, 95)
                 },
                 "current_data": {
@@ -120,13 +174,16 @@ class TrendPredictor:
         
         # 添加持续热门的话题
         for topic in persistent_topics[:5]:
+            _, duration = self._peak_and_duration(
+                self._topic_points(snapshots, topic["platforms"], topic["title"])
+            )
             trending_topics.append({
                 "title": topic["title"],
                 "trend": "persistent",
                 "prediction": {
                     "future_rank": "稳定",
                     "peak_time": "已达峰值",
-                    "duration": f"{random.randint(2, 5)}天",
+                    "duration": duration,
                     "confidence": random.randint(80, 95)
                 },
                 "current_data": {
@@ -237,8 +294,9 @@ class TrendPredictor:
             "declining_platforms": [p["platform"] for p in platform_growth["declining"][:3]]
         }
     
-    def _predict_keywords(self, historical_data: Dict[str, Dict[str, List]]) -> Dict[str, List]:
-        """预测关键词趋势"""
+    def _predict_keywords(self, historical_data: Dict[str, Dict[str, List]],
+                          snapshots: Dict[str, List[Dict[str, Any]]]) -> Dict[str, List]:
+        """预测关键词趋势，峰值时间和持续时长取自平台快照"""
         # 分析关键词历史趋势
         keyword_trends = self._analyze_keyword_trends(historical_data)
         
@@ -250,21 +308,23 @@ class TrendPredictor:
         
         # 预测新兴关键词
         for keyword in keyword_trends["rising"]:
+            peak_time, _ = self._peak_and_duration(self._keyword_points(snapshots, keyword["keyword"]))
             keyword_predictions["emerging"].append({
                 "keyword": keyword["keyword"],
                 "current_growth": keyword["growth_rate"],
                 "predicted_growth": keyword["growth_rate"] * random.uniform(1.1, 1.5),
-                "peak_time": f"{random.randint(1, 3)}天后",
+                "peak_time": peak_time,
                 "confidence": random.randint(70, 90)
             })
         
         # 预测衰退关键词
         for keyword in keyword_trends["falling"]:
+            _, duration = self._peak_and_duration(self._keyword_points(snapshots, keyword["keyword"]))
             keyword_predictions["fading"].append({
                 "keyword": keyword["keyword"],
                 "current_decline": abs(keyword["growth_rate"]),
                 "predicted_decline": abs(keyword["growth_rate"]) * random.uniform(1.1, 1.3),
-                "expected_duration": f"{random.randint(2, 5)}天",
+                "expected_duration": duration,
                 "confidence": random.randint(75, 90)
             })
         
@@ -292,7 +352,7 @@ class TrendPredictor:
                     
                     # 记录话题在当天的排名和平台
                     rank = items.index(item) + 1 if hasattr(items, "index") else 0
-                    score = item.get("score", 0)
+                    score = item.get("score") or 0
                     
                     topic_trends[title].append({
                         "date": date_str,
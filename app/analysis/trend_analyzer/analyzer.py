@@ -7,10 +7,21 @@ import jieba
 import jieba.analyse
 from typing import Dict, List, Any, Optional, Tuple
 import os
+import time
 
 from app.core import cache, db
 from app.utils.logger import log
-from app.services import crawler_factory
+from app.services import crawler_factory, publisher
+from app.services.snapshot_diff import item_key
+from app.services.sites.news_item import item_id
+from app.services.snapshot_store import snapshot_store
+
+# 趋势预测的时间范围：(历史窗口秒数, 时间点格式, 时间点间隔, 预测的时间点数)
+TREND_RANGES = {
+    "24h": (24 * 3600, "%Y-%m-%d %H:00", timedelta(hours=1), 3),
+    "7d": (7 * 24 * 3600, "%Y-%m-%d", timedelta(days=1), 3),
+    "30d": (30 * 24 * 3600, "%Y-%m-%d", timedelta(days=1), 7),
+}
 
 class TrendAnalyzer:
     """热点聚合分析器，用于分析各平台热点数据的共性和差异"""
@@ -85,14 +96,8 @@ class TrendAnalyzer:
     
     def _get_platform_data(self, date_str: str) -> Dict[str, List]:
         """获取所有平台的热点数据（共用方法）"""
-        all_platform_data = {}
-        for platform in crawler_factory.keys():
-            cache_key = f"crawler:{platform}:{date_str}"
-            platform_data = cache.get_cache(cache_key)
-            if platform_data:
-                all_platform_data[platform] = platform_data
-        
-        return all_platform_data
+        _, all_platform_data = publisher.read_news(date_str, list(crawler_factory.keys()))
+        return {platform: data for platform, data in all_platform_data.items() if data}
 
     def get_platform_comparison(self, date_str: Optional[str] = None) -> Dict[str, Any]:
         """获取平台对比分析数据
@@ -243,12 +248,7 @@ class TrendAnalyzer:
     def _analyze_trends(self, date_str: str, analysis_type: str) -> Dict[str, Any]:
         """分析各平台热点数据，提取共性和差异"""
         # 收集所有平台的热点数据
-        all_platform_data = {}
-        for platform in crawler_factory.keys():
-            cache_key = f"crawler:{platform}:{date_str}"
-            platform_data = cache.get_cache(cache_key)
-            if platform_data:
-                all_platform_data[platform] = platform_data
+        all_platform_data = self._get_platform_data(date_str)
         
         if not all_platform_data:
             log.warning(f"No data available for trend analysis on {date_str}")
@@ -327,7 +327,7 @@ class TrendAnalyzer:
             
             # 安全地计算平均分数
             try:
-                scores = [item.get("score", 0) for item in valid_items]
+                scores = [item.get("score") or 0 for item in valid_items]
                 # 确保所有分数都是数字
                 scores = [s for s in scores if isinstance(s, (int, float))]
                 avg_score = sum(scores) / max(len(scores), 1) if scores else 0
@@ -338,13 +338,11 @@ class TrendAnalyzer:
             # 计算平台总热度
             platform_heat = total_items * avg_score
             
-            # 计算平台热度变化趋势
-            # 简化实现：随机生成变化趋势
+            # 计算平台热度变化趋势：24小时内最早快照与最新快照的总分数变化百分比
             try:
-                import random
-                trend_value = random.uniform(-10.0, 10.0)
+                trend_value = self._get_platform_heat_trend(platform)
             except Exception as e:
-                log.error(f"Error generating trend value: {e}")
+                log.error(f"Error calculating trend value for {platform}: {e}")
                 trend_value = 0.0
             
             platform_scores.append({
@@ -362,6 +360,19 @@ class TrendAnalyzer:
         
         return platform_scores
     
+    def _get_platform_heat_trend(self, platform: str, hours: int = 24) -> float:
+        """根据快照历史计算平台热度变化百分比，没有足够历史时为0"""
+        since = int((time.time() - hours * 3600) * 1000)
+        first, latest = snapshot_store.first_and_latest(platform, since)
+        if not first or not latest or first["ts"] == latest["ts"]:
+            return 0.0
+        
+        first_heat = sum(item.get("score") or 0 for item in first["items"])
+        latest_heat = sum(item.get("score") or 0 for item in latest["items"])
+        if first_heat <= 0:
+            return 0.0
+        return (latest_heat - first_heat) / first_heat * 100
+    
     def _get_platform_update_frequency(self, all_data: Dict[str, List]) -> Dict[str, Any]:
         """获取平台更新频率"""
         # 分析各平台的更新时间分布
@@ -879,26 +890,34 @@ class TrendAnalyzer:
         return overlap_matrix
     
     def _analyze_propagation_paths(self, all_data: Dict[str, List]) -> List[Dict[str, Any]]:
-        """分析热点传播路径（简化实现）"""
-        # 实际应基于时间戳分析热点在不同平台上的传播顺序
-        # 这里简化为随机生成一些传播路径
-        import random
-        
-        cross_platform_topics = self._find_cross_platform_topics(all_data)
+        """分析热点传播路径：按话题在各平台快照中首次上榜的时间排序
+
+        最近24小时的快照中找不到该话题的平台不计入路径，少于两个平台的话题跳过。
+        """
+        since = int((time.time() - 24 * 3600) * 1000)
+        histories: Dict[str, List[Dict[str, Any]]] = {}
         propagation_paths = []
-        
-        for topic in cross_platform_topics[:5]:  # 取前5个跨平台话题
-            platforms = list({item["platform"] for item in topic["items"]})
-            if len(platforms) < 2:
+
+        for topic in self._find_cross_platform_topics(all_data)[:5]:  # 取前5个跨平台话题
+            first_seen = {}
+            for item in topic["related_items"]:
+                platform = item["platform"]
+                if platform not in histories:
+                    histories[platform] = snapshot_store.history(platform, since)
+                key = item_id(item.get("url"), item.get("title"))
+                ts = next((snapshot["ts"] for snapshot in histories[platform]
+                           if any(item_key(news) == key for news in snapshot["items"])), None)
+                if ts is not None:
+                    first_seen[platform] = min(ts, first_seen.get(platform, ts))
+            if len(first_seen) < 2:
                 continue
-                
-            # 随机排序平台，模拟传播顺序
-            random.shuffle(platforms)
-            
+
+            path = sorted(first_seen, key=first_seen.get)
+            span_hours = (first_seen[path[-1]] - first_seen[path[0]]) / 3600000
             propagation_paths.append({
-                "topic": topic["main_title"],
-                "path": platforms,
-                "time_span": f"{random.randint(1, 24)}小时"
+                "topic": topic["title"],
+                "path": path,
+                "time_span": f"{span_hours:.1f}小时"
             })
         
         return propagation_paths
@@ -939,36 +958,20 @@ class TrendAnalyzer:
     def _analyze_trend_evolution(self, all_data: Dict[str, List], current_date: str, time_range: str = "24h") -> List[Dict[str, Any]]:
         """分析热点演变趋势
         
+        历史热度取自平台快照（每个时间点取最后一个快照中的热度），预测按最近两个时间点的变化线性外推；
+        快照中不足两个时间点的话题标记为数据不足，不做预测。
+        
         Args:
             all_data: 所有平台的热点数据
             current_date: 当前日期
             time_range: 预测时间范围，可选值为 24h(24小时), 7d(7天), 30d(30天)
         """
-        # 实际应基于历史数据分析热点的演变
-        import random
-        from datetime import datetime, timedelta
-        from app.services import crawler_factory
-        
-        # 获取当前日期
-        current = datetime.strptime(current_date, "%Y-%m-%d")
-        
-        # 根据时间范围确定历史数据天数和预测天数
-        if time_range == "24h":
-            history_days = 1
-            forecast_days = 1
-            time_unit = "小时"
-        elif time_range == "7d":
-            history_days = 7
-            forecast_days = 3
-            time_unit = "天"
-        elif time_range == "30d":
-            history_days = 30
-            forecast_days = 7
-            time_unit = "天"
-        else:
-            history_days = 1
-            forecast_days = 1
-            time_unit = "小时"
+        window, label_format, step, forecast_steps = TREND_RANGES.get(time_range, TREND_RANGES["24h"])
+        
+        # 历史窗口截止到当前日期结束（不晚于现在）
+        day_end = self.shanghai_tz.localize(datetime.strptime(current_date, "%Y-%m-%d") + timedelta(days=1))
+        until = min(time.time(), day_end.timestamp())
+        since = until - window
         
         # 提取热门话题
         # 合并所有平台的数据，按热度排序
@@ -976,10 +979,11 @@ class TrendAnalyzer:
         for platform, items in all_data.items():
             for item in items:
                 title = item.get("title", "")
-                score = item.get("score", 0)
+                score = item.get("score") or 0
                 if title and score > 0:
                     all_topics.append({
                         "title": title,
+                        "key": item_key(item),
                         "score": score,
                         "platform": platform
                     })
@@ -990,78 +994,56 @@ class TrendAnalyzer:
         # 选取前10个热门话题
         top_topics = all_topics[:10]
         
-        # 生成预测数据
         forecast_results = []
-        
-        # 可能的分类列表
-        categories = ["科技", "财经", "社会", "娱乐", "体育", "教育", "健康", "国际"]
-        
-        # 获取所有平台列表
-        all_platforms = list(crawler_factory.keys())
+        histories: Dict[str, List[Dict[str, Any]]] = {}
         
         for topic in top_topics:
             title = topic["title"]
             current_score = topic["score"]
             platform = topic["platform"]
             
-            # 生成历史趋势数据
-            history_data = []
-            
-            # 当前热度
-            history_data.append({
-                "date": current_date,
-                "heat": current_score
-            })
-            
-            # 历史热度（模拟数据）
-            for i in range(1, history_days + 1):
-                date = current - timedelta(days=i)
-                date_str = date.strftime("%Y-%m-%d")
-                
-                # 模拟历史热度，通常比当前热度低
-                history_heat = max(0, current_score * (0.7 + 0.3 * random.random()))
-                
-                history_data.append({
-                    "date": date_str,
-                    "heat": round(history_heat, 1)
-                })
+            # 快照中的历史热度，同一时间点保留最后一个快照的值
+            if platform not in histories:
+                histories[platform] = snapshot_store.history(platform, int(since * 1000), int(until * 1000))
+            points = {}
+            for snapshot in histories[platform]:
+                for item in snapshot["items"]:
+                    if item_key(item) == topic["key"] and isinstance(item.get("score"), (int, float)):
+                        label = datetime.fromtimestamp(snapshot["ts"] / 1000, self.shanghai_tz).strftime(label_format)
+                        points[label] = item["score"]
+                        break
+            history_data = [{"date": label, "heat": round(heat, 1)} for label, heat in sorted(points.items())]
             
-            # 预测未来趋势
+            # 根据最近两个时间点的变化预测未来趋势
             forecast_data = []
-            
-            # 计算热度变化率
-            recent_trend = 0
             if len(history_data) >= 2:
-                recent_trend = (history_data[0]["heat"] - history_data[1]["heat"]) / max(1, history_data[1]["heat"])
-            
-            # 根据最近趋势预测未来热度
-            for i in range(1, forecast_days + 1):
-                date = current + timedelta(days=i)
-                date_str = date.strftime("%Y-%m-%d")
-                
-                # 预测热度，根据最近趋势和随机因素
-                trend_factor = recent_trend * (0.8 + 0.4 * random.random())
-                forecast_heat = max(0, current_score * (1 + trend_factor))
+                previous_heat, last_heat = history_data[-2]["heat"], history_data[-1]["heat"]
+                recent_trend = (last_heat - previous_heat) / max(1, previous_heat)
+                last_time = datetime.strptime(history_data[-1]["date"], label_format)
+                for i in range(1, forecast_steps + 1):
+                    forecast_data.append({
+                        "date": (last_time + step * i).strftime(label_format),
+                        "heat": round(max(0, last_heat + (last_heat - previous_heat) * i), 1)
+                    })
                 
-                forecast_data.append({
-                    "date": date_str,
-                    "heat": round(forecast_heat, 1)
-                })
-            
-            # 计算趋势类型和可能性
-            if recent_trend > 0.1:
-                trend_type = "趋势上升"
-                probability = min(95, 50 + int(recent_trend * 100))
-            elif recent_trend < -0.1:
-                trend_type = "趋势下降"
-                probability = min(95, 50 + int(abs(recent_trend) * 100))
+                # 计算趋势类型和可能性
+                if recent_trend > 0.1:
+                    trend_type = "趋势上升"
+                    probability = min(95, 50 + int(recent_trend * 100))
+                elif recent_trend < -0.1:
+                    trend_type = "趋势下降"
+                    probability = min(95, 50 + int(abs(recent_trend) * 100))
+                else:
+                    trend_type = "趋势稳定"
+                    probability = 70
             else:
-                trend_type = "趋势稳定"
-                probability = 70
+                trend_type = "数据不足"
+                probability = None
             
             # 确定可信度文本
-            confidence_text = ""
-            if probability >= 90:
+            if probability is None:
+                confidence_text = "数据不足"
+            elif probability >= 90:
                 confidence_text = "可信度很高"
             elif probability >= 70:
                 confidence_text = "可信度较高"
@@ -1070,14 +1052,10 @@ class TrendAnalyzer:
             else:
                 confidence_text = "可信度较低"
             
-            # 随机选择一个分类
-            category = random.choice(categories)
-            
             # 从标题中提取关键词
             keywords = []
             try:
                 # 使用jieba提取关键词
-                import jieba.analyse
                 extracted_keywords = jieba.analyse.extract_tags(title, topK=5)
                 keywords = [kw for kw in extracted_keywords if len(kw) > 1 and kw not in self.stopwords][:3]
             except Exception as e:
@@ -1086,30 +1064,25 @@ class TrendAnalyzer:
                 if len(title) > 3:
                     keywords = [title[:3]]
             
-            # 生成可能出现该话题的其他平台
-            other_platforms = []
-            for p in all_platforms:
-                if p != platform:
-                    other_platforms.append(p)
-            
-            # 随机选择2-3个其他平台
-            if other_platforms:
-                random.shuffle(other_platforms)
-                out_platforms = other_platforms[:min(3, len(other_platforms))]
-            else:
-                out_platforms = []
+            # 其他平台中已有相似话题的平台
+            out_platforms = [
+                other for other, items in all_data.items()
+                if other != platform and any(
+                    self._calculate_title_similarity(title, item.get("title", "")) > 0.25 for item in items
+                )
+            ][:3]
             
             # 添加到结果
             forecast_results.append({
                 "topic": title,
-                "category": category,
+                "category": self._classify_keywords(keywords),
                 "keywords": keywords,
                 "current_heat": round(current_score, 1),
-                "history": sorted(history_data, key=lambda x: x["date"]),
+                "history": history_data,
                 "forecast": forecast_data,
                 "trend_type": trend_type,
                 "probability": probability,
-                "probability_text": f"{probability}%",
+                "probability_text": f"{probability}%" if probability is not None else None,
                 "confidence": confidence_text,
                 "platforms": [platform],
                 "out_platforms": out_platforms
@@ -1117,6 +1090,15 @@ class TrendAnalyzer:
         
         return forecast_results
     
+    def _classify_keywords(self, keywords: List[str]) -> str:
+        """按类别特征词匹配话题关键词，返回命中最多的类别，没有命中时为 其他"""
+        scores = {
+            category: sum(1 for keyword in keywords if keyword in category_keywords)
+            for category, category_keywords in self.category_keywords.items()
+        }
+        best = max(scores, key=scores.get, default=None)
+        return best if best is not None and scores[best] > 0 else "其他"
+    
     def _get_platform_stats(self, all_data: Dict[str, List]) -> Dict[str, Any]:
         """获取各平台统计数据"""
         stats = {}
@@ -1172,7 +1154,7 @@ class TrendAnalyzer:
                     platform_titles[platform].append({
                         "title": title,
                         "url": item.get("url", ""),
-                        "score": item.get("score", 0)
+                        "score": item.get("score") or 0
                     })
         
         # 查找相似标题（简化实现）
@@ -1233,7 +1215,7 @@ class TrendAnalyzer:
                 # 如果在多个平台上找到，则认为是跨平台话题
                 if len(platforms_found) > 1:  # 至少在2个平台上出现
                     # 计算总热度值
-                    total_heat = sum(item.get("score", 0) for item in related_items)
+                    total_heat = sum(item.get("score") or 0 for item in related_items)
                     
                     # 记录匹配情况
                     if len(platforms_found) >= 3:  # 对于3个及以上平台的匹配，记录详细信息
@@ -1314,13 +1296,13 @@ class TrendAnalyzer:
         
         for platform, items in all_data.items():
             # 取每个平台分数最高的3个话题
-            top_items = sorted(items, key=lambda x: x.get("score", 0), reverse=True)[:3]
+            top_items = sorted(items, key=lambda x: x.get("score") or 0, reverse=True)[:3]
             
             platform_unique[platform] = [
                 {
                     "title": item.get("title", ""),
                     "url": item.get("url", ""),
-                    "score": item.get("score", 0)
+                    "score": item.get("score") or 0
                 }
                 for item in top_items
             ]
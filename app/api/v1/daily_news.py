@@ -1,20 +1,30 @@
 # app/api/endpoints/dailynews.py
-import json
 from datetime import datetime
 from typing import List, Dict, Any, Optional
 
 import pytz
-from fastapi import APIRouter
+from fastapi import APIRouter, Request, Response
 
-from app.core import cache
-from app.services import crawler_factory
+from app.services import crawler_factory, publisher
 from app.utils.logger import log
 
 router = APIRouter()
 
 
+def _not_modified(request: Request, response: Response, version: int) -> bool:
+    """设置基于发布版本的 ETag，客户端缓存的版本仍是最新时返回 True
+
+    版本为 0 表示读取的是未版本化的旧数据，内容可能变化，不设置 ETag。
+    """
+    if not version:
+        return False
+    etag = f'"v{version}"'
+    response.headers["ETag"] = etag
+    return request.headers.get("if-none-match") == etag
+
+
 @router.get("/")
-def get_hot_news(date: str = None, platform: str = None):
+def get_hot_news(request: Request, response: Response, date: str = None, platform: str = None):
     if platform not in crawler_factory.keys():
         return {
             "status": "404",
@@ -25,24 +35,20 @@ def get_hot_news(date: str = None, platform: str = None):
     if not date:
         date = datetime.now(pytz.timezone('Asia/Shanghai')).strftime("%Y-%m-%d")
 
-    cacheKey = f"crawler:{platform}:{date}"
-    result = cache.get(cacheKey)
-    if result:
-        return {
-            "status": "200",
-            "data": json.loads(result),
-            "msg": "success"
-        }
+    version, news = publisher.read_news(date, [platform])
+    if _not_modified(request, response, version):
+        return Response(status_code=304, headers={"ETag": response.headers["ETag"]})
 
     return {
         "status": "200",
-        "data": [],
+        "data": news.get(platform, []),
+        "version": version,
         "msg": "success"
     }
 
 
 @router.get("/all")
-def get_all_platforms_news(date: str = None):
+def get_all_platforms_news(request: Request, response: Response, date: str = None):
     """
     获取所有平台的热门新闻
     
@@ -50,34 +56,28 @@ def get_all_platforms_news(date: str = None):
         date: 日期，格式为YYYY-MM-DD，默认为当天
     
     Returns:
-        包含所有平台新闻的字典，键为平台名称，值为新闻列表
+        包含所有平台新闻的字典，键为平台名称，值为新闻列表；version 为数据的发布版本
     """
     if not date:
         date = datetime.now(pytz.timezone('Asia/Shanghai')).strftime("%Y-%m-%d")
     
-    all_news = {}
+    platform_list = list(crawler_factory.keys())
+    version, news = publisher.read_news(date, platform_list)
+    if _not_modified(request, response, version):
+        return Response(status_code=304, headers={"ETag": response.headers["ETag"]})
     
-    for platform in crawler_factory.keys():
-        cacheKey = f"crawler:{platform}:{date}"
-        result = cache.get(cacheKey)
-        if result:
-            try:
-                all_news[platform] = json.loads(result)
-            except Exception as e:
-                log.error(f"Error parsing cached data for {platform}: {e}")
-                all_news[platform] = []
-        else:
-            all_news[platform] = []
+    all_news = {platform: news.get(platform, []) for platform in platform_list}
     
     return {
         "status": "200",
         "data": all_news,
+        "version": version,
         "msg": "success"
     }
 
 
 @router.get("/multi")
-def get_multi_platforms_news(date: str = None, platforms: str = None):
+def get_multi_platforms_news(request: Request, response: Response, date: str = None, platforms: str = None):
     """
     获取多个平台的热门新闻
     
@@ -110,29 +110,23 @@ def get_multi_platforms_news(date: str = None, platforms: str = None):
             "msg": f"Invalid platforms: {', '.join(invalid_platforms)}. Valid platforms: {', '.join(valid_platforms)}"
         }
     
-    multi_news = {}
+    version, news = publisher.read_news(date, platform_list)
+    if _not_modified(request, response, version):
+        return Response(status_code=304, headers={"ETag": response.headers["ETag"]})
     
-    for platform in platform_list:
-        cacheKey = f"crawler:{platform}:{date}"
-        result = cache.get(cacheKey)
-        if result:
-            try:
-                multi_news[platform] = json.loads(result)
-            except Exception as e:
-                log.error(f"Error parsing cached data for {platform}: {e}")
-                multi_news[platform] = []
-        else:
-            multi_news[platform] = []
+    multi_news = {platform: news.get(platform, []) for platform in platform_list}
     
     return {
         "status": "200",
         "data": multi_news,
+        "version": version,
         "msg": "success"
     }
 
 
 @router.get("/search")
-def search_news(keyword: str, date: str = None, platforms: str = None, limit: int = 20):
+def search_news(request: Request, response: Response, keyword: str, date: str = None,
+                platforms: str = None, limit: int = 20):
     """
     搜索新闻
     
@@ -165,17 +159,19 @@ def search_news(keyword: str, date: str = None, platforms: str = None, limit: in
             "search_results": 0
         }
     
-    # 从各平台获取新闻数据
+    # 从各平台获取新闻数据（同一发布版本）
+    version, news = publisher.read_news(date, platform_list)
+    if _not_modified(request, response, version):
+        return Response(status_code=304, headers={"ETag": response.headers["ETag"]})
+    
     all_news = []
     
     for platform in platform_list:
-        cacheKey = f"crawler:{platform}:{date}"
-        result = cache.get(cacheKey)
-        if not result:
+        platform_news = news.get(platform)
+        if not platform_news:
             continue
         
         try:
-            platform_news = json.loads(result)
             if not isinstance(platform_news, list):
                 continue
             
@@ -203,6 +199,7 @@ def search_news(keyword: str, date: str = None, platforms: str = None, limit: in
                     "title": item.get("title", ""),
                     "source": platform,
                     "rank": rank_value,
+                    "score": item.get("score"),
                     "category": category,
                     "sub_category": sub_category,
                     "url": item.get("url", "")
@@ -242,6 +239,7 @@ def search_news(keyword: str, date: str = None, platforms: str = None, limit: in
     return {
         "status": "200",
         "data": limited_results,
+        "version": version,
         "msg": "success",
         "total": len(search_results),
         "search_results": len(limited_results)
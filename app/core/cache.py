@@ -143,6 +143,17 @@ def hget(name, key):
     return redis_client.hget(name, key)
 
 
+def hgetall(name):
+
+    try:
+        redis_client = get_redis_client()
+    except Exception as e:
+        log.error(f"Error getting redis client: {e}")
+        return {}
+
+    return redis_client.hgetall(name)
+
+
 class CacheNews(BaseModel):
     title: str
     url: str
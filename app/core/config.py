@@ -14,6 +14,7 @@ class AppConfig(BaseModel):
     port: int
     debug: bool = True
     cors: Dict[str, Any]
+    mode: str = "all"
 
 class DatabaseConfig(BaseModel):
     host: str
@@ -39,6 +40,55 @@ class CrawlerConfig(BaseModel):
     max_retry_count: int
     max_instances: int
     misfire_grace_time: int
+    concurrency: int = 8
+    crawler_timeout: int = 120
+    min_interval: int = 300
+    max_interval: int = 7200
+    change_rate_alpha: float = 0.3
+    analysis_delay: int = 300
+    retry_backoff: float = 2.0
+    retry_backoff_max: float = 30.0
+    breaker_failure_threshold: int = 3
+    breaker_reset_timeout: int = 1800
+    breaker_max_reset_timeout: int = 21600
+    isolation: str = "process"
+    worker_max_jobs: int = 50
+    leader_election: bool = True
+    leader_ttl: int = 30
+    leader_renew_interval: int = 10
+    dispatch: str = "local"
+    queue_visibility_timeout: int = 300
+    queue_max_deliveries: int = 3
+    queue_poll_interval: float = 1.0
+    snapshot_retention: int = 172800
+    snapshot_max_count: int = 500
+    events_max_len: int = 10000
+    html_parser: str = "lxml"
+    browser_pool_size: int = 2
+    browser_prewarm: int = 1
+    browser_max_pages: int = 50
+    browser_max_rss_mb: int = 1024
+    browser_checkout_timeout: int = 60
+    browser_block: List[str] = ["image", "media", "font", "tracker"]
+    browser_cache_dir: str = ""
+    browser_cache_size_mb: int = 200
+    browser_max_wait: float = 10.0
+    browser_network_idle: float = 0.5
+    render_mode: str = "local"
+    render_url: str = "http://127.0.0.1:8790"
+    render_timeout: int = 60
+    strategy_hedge_delay: float = 5.0
+    latency_samples: int = 200
+    latency_min_samples: int = 20
+    latency_timeout_factor: float = 3.0
+    latency_min_timeout: float = 2.0
+    latency_min_hedge: float = 1.0
+    hedge_requests: bool = True
+    rate_limit_backend: str = "local"
+    rate_limit_rate: float = 2.0
+    rate_limit_burst: int = 4
+    rate_limit_hosts: Dict[str, float] = {}
+    host_concurrency: int = 4
 
 class LoggingConfig(BaseModel):
     level: str
@@ -7,17 +7,19 @@ from fastapi import FastAPI, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
 import uvicorn
 
-import app.services.crawler as crawler
 import tg_bot as tg_bot
 from app.api.v1 import daily_news, web_tools, analysis
 from app.utils.logger import log
 from app.core import db, cache
 from app.core.config import get_app_config, get_config
-from app.services.browser_manager import BrowserManager
 
 # 获取应用配置
 app_config = get_app_config()
 
+# api 模式下只提供接口，调度、抓取和分析由独立的 worker.py 进程负责，
+# 不导入调度器和 selenium
+CRAWLER_ENABLED = app_config.mode != "api"
+
 # 应用启动和关闭的生命周期管理
 @asynccontextmanager
 async def lifespan(app: FastAPI):
@@ -30,20 +32,22 @@ async def lifespan(app: FastAPI):
     # 初始化缓存
     cache.init_cache()
     
-    # 异步启动爬虫，避免阻塞应用启动
-    threading.Thread(target=crawler.crawlers_logic, daemon=True).start()
+    if CRAWLER_ENABLED:
+        from app.services import crawler
+        crawler.start_scheduler()
+        # 异步启动爬虫，避免阻塞应用启动
+        threading.Thread(target=crawler.crawlers_logic, daemon=True).start()
+    else:
+        log.info("Running in API-only mode, crawling is handled by worker.py")
     
     yield
     
     # 关闭时执行
     log.info("Application shutdown")
     
-    # 关闭浏览器管理器
-    try:
-        BrowserManager().shutdown()
-        log.info("Browser manager shutdown")
-    except Exception as e:
-        log.error(f"Error shutting down browser manager: {e}")
+    if CRAWLER_ENABLED:
+        from app.worker import shutdown_crawling
+        shutdown_crawling()
     
     # 关闭数据库连接
     db.close_db()
@@ -1,30 +1,137 @@
 import threading
 import time
 import os
+import json
+from contextlib import contextmanager
+from typing import List, Dict, Any, Optional, Iterator, Iterable, Union
+
 from selenium import webdriver
+from selenium.common.exceptions import WebDriverException
 from selenium.webdriver.chrome.service import Service
 from webdriver_manager.chrome import ChromeDriverManager
+
+from app.core.config import get_crawler_config
 from app.utils.logger import log
 
+try:
+    import psutil
+except ImportError:  # 未安装 psutil 时不按内存回收浏览器
+    psutil = None
+
+# 获取爬虫配置
+crawler_config = get_crawler_config()
+
+# 可以拦截的资源类别及其URL模式（Network.setBlockedURLs，* 匹配任意字符）
+# 爬虫只读取DOM文本和链接，这些资源只消耗带宽、加载时间和内存
+BLOCKABLE_RESOURCES: Dict[str, List[str]] = {
+    "image": ["*.png*", "*.jpg*", "*.jpeg*", "*.gif*", "*.webp*", "*.avif*", "*.svg*", "*.ico*", "*.bmp*"],
+    "media": ["*.mp4*", "*.webm*", "*.m3u8*", "*.flv*", "*.mp3*", "*.m4a*", "*.ogg*"],
+    "font": ["*.woff*", "*.ttf*", "*.otf*", "*.eot*"],
+    "tracker": ["*google-analytics.com/*", "*googletagmanager.com/*", "*doubleclick.net/*",
+                "*hm.baidu.com/*", "*cnzz.com/*", "*umeng.com/*", "*beacon.qq.com/*", "*pingjs.qq.com/*"],
+}
+
+# 等待页面就绪时的轮询间隔（秒）
+READY_POLL_INTERVAL = 0.1
+
+# 按抽取规则一次性读取所有行，避免逐个字段调用 find_element（每次都是一次 chromedriver 请求）
+# 字段规则：selector 在行内查找（省略时为行本身），next 改为在行的下一个兄弟元素中查找，
+# own 只取元素自身的文本节点（同 XPath text()），match 为文本需要匹配的正则（取第一个匹配的元素），
+# attr 读取属性（与 get_attribute 一致，优先取DOM属性值），否则取可见文本；找不到元素时为 null
+_EXTRACT_SCRIPT = """
+const [rowSelector, fields] = arguments;
+const ownText = el => Array.from(el.childNodes)
+    .filter(node => node.nodeType === Node.TEXT_NODE).map(node => node.textContent).join('');
+const textOf = (el, own) => ((own ? ownText(el) : el.innerText || el.textContent) || '').trim();
+const attrOf = (el, name) => (typeof el[name] === 'string' ? el[name] : el.getAttribute(name));
+return Array.from(document.querySelectorAll(rowSelector)).map(row => {
+    const item = {};
+    for (const [name, field] of Object.entries(fields)) {
+        const scope = field.next ? row.nextElementSibling : row;
+        let candidates = !scope ? [] : field.selector ? Array.from(scope.querySelectorAll(field.selector)) : [scope];
+        if (field.match) {
+            const pattern = new RegExp(field.match);
+            candidates = candidates.filter(el => pattern.test(textOf(el, field.own)));
+        }
+        const el = candidates[0];
+        item[name] = !el ? null : field.attr ? attrOf(el, field.attr) : textOf(el, field.own);
+    }
+    return item;
+});
+"""
+
+
+def blocked_url_patterns(block: Iterable[str], allow: Iterable[str] = ()) -> List[str]:
+    """按配置的拦截类别和爬虫的放行类别生成要拦截的URL模式"""
+    allowed = set(allow)
+    return [pattern for category in block if category not in allowed
+            for pattern in BLOCKABLE_RESOURCES.get(category, ())]
+
+
+class BrowserPoolTimeout(Exception):
+    """等待空闲浏览器超时"""
+    pass
+
+
+class PooledDriver:
+    """池中的一个Chrome实例及其使用情况"""
+
+    def __init__(self, driver, slot: int):
+        self.driver = driver
+        # 浏览器在池中的编号，启用磁盘缓存时每个编号使用独立的缓存目录
+        self.slot = slot
+        self.pages = 0
+        self.created_at = time.time()
+        self.last_used = self.created_at
+
+    def rss(self) -> int:
+        """chromedriver 及其启动的所有 Chrome 进程的常驻内存（字节），无法获取时返回 0"""
+        if psutil is None:
+            return 0
+        try:
+            process = psutil.Process(self.driver.service.process.pid)
+            return sum(p.memory_info().rss for p in [process] + process.children(recursive=True))
+        except (psutil.Error, AttributeError):
+            return 0
+
+
 class BrowserManager:
-    """浏览器管理器，提供共享的Chrome浏览器实例"""
+    """浏览器管理器，维护有上限的Chrome实例池
+
+    爬虫通过 page() 借出一个实例，用完自动归还，多个浏览器爬虫可以并行执行。
+    借出前检查实例是否可用，归还时按已加载页面数和内存占用决定是否回收。
+    """
     _instance = None
     _lock = threading.Lock()
-    _driver = None
     _driver_path = None
-    _last_activity = 0
     _max_idle_time = 1800  # 最大空闲时间（秒），默认30分钟
-    
+
     def __new__(cls, *args, **kwargs):
         """单例模式实现"""
         if cls._instance is None:
             with cls._lock:
                 if cls._instance is None:
-                    cls._instance = super(BrowserManager, cls).__new__(cls)
-                    cls._instance._init_driver_path()
-                    cls._instance._start_idle_monitor()
+                    instance = super(BrowserManager, cls).__new__(cls)
+                    instance._init_pool()
+                    instance._init_driver_path()
+                    instance._start_idle_monitor()
+                    cls._instance = instance
         return cls._instance
-    
+
+    def _init_pool(self):
+        self.pool_size = max(crawler_config.browser_pool_size, 1)
+        self.max_pages = crawler_config.browser_max_pages
+        self.max_rss = crawler_config.browser_max_rss_mb * 1024 * 1024
+        self.checkout_timeout = crawler_config.browser_checkout_timeout
+        self.block = list(crawler_config.browser_block)
+        self.cache_dir = crawler_config.browser_cache_dir
+        self._cond = threading.Condition()
+        self._idle: List[PooledDriver] = []
+        self._free_slots = list(range(self.pool_size))
+        # 已创建（含正在创建）的实例数量，包括借出的实例
+        self._total = 0
+        self._closed = False
+
     def _init_driver_path(self):
         """初始化ChromeDriver路径"""
         try:
@@ -33,37 +140,47 @@ class BrowserManager:
         except Exception as e:
             log.error(f"ChromeDriver安装失败: {str(e)}")
             raise
-    
+
     def _start_idle_monitor(self):
         """启动空闲监控线程"""
         def monitor():
             while True:
                 time.sleep(60)  # 每分钟检查一次
                 try:
-                    with self._lock:
-                        if self._driver is not None:
-                            current_time = time.time()
-                            if current_time - self._last_activity > self._max_idle_time:
-                                log.info(f"浏览器空闲超过{self._max_idle_time}秒，释放资源")
-                                self._quit_driver()
+                    self._release_idle()
                 except Exception as e:
                     log.error(f"浏览器监控线程异常: {str(e)}")
-        
+
         monitor_thread = threading.Thread(target=monitor, daemon=True)
         monitor_thread.start()
         log.info("浏览器空闲监控线程已启动")
-    
-    def get_driver(self):
-        """获取Chrome浏览器实例"""
-        with self._lock:
-            self._last_activity = time.time()
-            if self._driver is None:
-                self._create_driver()
-            return self._driver
-    
-    def _create_driver(self):
+
+    def _release_idle(self):
+        """关闭空闲超过 _max_idle_time 的实例"""
+        now = time.time()
+        with self._cond:
+            expired = [p for p in self._idle if now - p.last_used > self._max_idle_time]
+            for pooled in expired:
+                self._idle.remove(pooled)
+                self._release_slot(pooled.slot)
+        for pooled in expired:
+            log.info(f"浏览器空闲超过{self._max_idle_time}秒，释放资源")
+            self._quit_driver(pooled.driver)
+
+    def _reserve_slot(self) -> int:
+        """占用一个实例名额，调用方需持有 _cond"""
+        self._total += 1
+        return self._free_slots.pop()
+
+    def _release_slot(self, slot: int):
+        """释放实例名额，调用方需持有 _cond"""
+        self._total -= 1
+        self._free_slots.append(slot)
+        self._cond.notify()
+
+    def _create_driver(self, slot: int):
         """创建新的Chrome浏览器实例"""
-        log.info("创建新的Chrome浏览器实例")
+        log.info(f"创建新的Chrome浏览器实例 #{slot}")
         options = webdriver.ChromeOptions()
         # 基本配置（无头模式）
         options.add_argument("--headless")
@@ -78,44 +195,307 @@ class BrowserManager:
         options.add_argument("--disable-default-apps")
         # 日志级别
         options.add_argument("--log-level=3")
-        
-        self._driver = webdriver.Chrome(
-            service=Service(self._driver_path), 
+        # DOMContentLoaded 后即返回，是否加载完成由 wait_ready 按页面判断
+        options.page_load_strategy = "eager"
+        # 持久化磁盘缓存，实例回收后重新创建时静态JS等资源仍可命中缓存
+        if self.cache_dir:
+            options.add_argument(f"--disk-cache-dir={os.path.join(self.cache_dir, str(slot))}")
+            options.add_argument(f"--disk-cache-size={crawler_config.browser_cache_size_mb * 1024 * 1024}")
+        # 记录网络事件，用于统计页面加载的请求数、流量和拦截数量
+        options.set_capability("goog:loggingPrefs", {"performance": "ALL"})
+        options.add_experimental_option("perfLoggingPrefs", {"enableNetwork": True, "enablePage": False})
+
+        driver = webdriver.Chrome(
+            service=Service(self._driver_path),
             options=options
         )
-        self._driver.set_page_load_timeout(30)
-        
-    def _quit_driver(self):
+        driver.set_page_load_timeout(30)
+        driver.execute_cdp_cmd("Network.enable", {})
+        return driver
+
+    def _quit_driver(self, driver):
         """关闭浏览器实例"""
-        if self._driver:
-            try:
-                self._driver.quit()
-                log.info("浏览器实例已关闭")
-            except Exception as e:
-                log.error(f"关闭浏览器实例出错: {str(e)}")
-            finally:
-                self._driver = None
-    
-    def release_driver(self):
-        """使用完毕后标记为活动状态"""
-        with self._lock:
-            self._last_activity = time.time()
-    
-    def get_page_content(self, url, wait_time=5):
-        """获取指定URL的页面内容，并自动处理浏览器"""
-        driver = self.get_driver()
         try:
+            driver.quit()
+            log.info("浏览器实例已关闭")
+        except Exception as e:
+            log.error(f"关闭浏览器实例出错: {str(e)}")
+
+    def _healthy(self, pooled: PooledDriver) -> bool:
+        """实例的 chromedriver 进程仍在运行且能响应命令"""
+        try:
+            process = pooled.driver.service.process
+            if process is not None and process.poll() is not None:
+                return False
+            pooled.driver.execute_script("return 1")
+            return True
+        except Exception:
+            return False
+
+    def _recycle_reason(self, pooled: PooledDriver) -> Optional[str]:
+        if self.max_pages and pooled.pages >= self.max_pages:
+            return f"已加载 {pooled.pages} 个页面"
+        if self.max_rss:
+            rss = pooled.rss()
+            if rss > self.max_rss:
+                return f"内存占用 {rss // (1024 * 1024)}MB"
+        return None
+
+    def checkout(self, timeout: Optional[float] = None) -> PooledDriver:
+        """借出一个可用实例，池满且没有空闲实例时等待归还，超时抛出 BrowserPoolTimeout"""
+        timeout = self.checkout_timeout if timeout is None else timeout
+        deadline = time.monotonic() + timeout
+        with self._cond:
+            while True:
+                if self._closed:
+                    raise BrowserPoolTimeout("browser manager is shut down")
+                if self._idle:
+                    pooled = self._idle.pop()
+                    break
+                if self._total < self.pool_size:
+                    # 先占用名额，在锁外创建实例
+                    slot = self._reserve_slot()
+                    pooled = None
+                    break
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    raise BrowserPoolTimeout(f"no idle browser in {timeout}s, pool size {self.pool_size}")
+                self._cond.wait(remaining)
+
+        if pooled is not None:
+            if self._healthy(pooled):
+                return pooled
+            log.warning("浏览器实例无响应，重新创建")
+            self._quit_driver(pooled.driver)
+            slot = pooled.slot
+
+        try:
+            return PooledDriver(self._create_driver(slot), slot)
+        except Exception:
+            with self._cond:
+                self._release_slot(slot)
+            raise
+
+    def checkin(self, pooled: PooledDriver, broken: bool = False):
+        """归还实例，出错、超过页面数或内存上限的实例直接关闭"""
+        pooled.last_used = time.time()
+        reason = "执行出错" if broken else self._recycle_reason(pooled)
+        with self._cond:
+            if reason is None and not self._closed:
+                self._idle.append(pooled)
+                self._cond.notify()
+                return
+            self._release_slot(pooled.slot)
+        if reason:
+            log.info(f"回收浏览器实例：{reason}")
+        self._quit_driver(pooled.driver)
+
+    @contextmanager
+    def lease(self, timeout: Optional[float] = None) -> Iterator[PooledDriver]:
+        """在上下文内独占一个实例，退出时归还"""
+        pooled = self.checkout(timeout)
+        broken = False
+        try:
+            yield pooled
+        except WebDriverException:
+            broken = True
+            raise
+        finally:
+            self.checkin(pooled, broken)
+
+    def _block_resources(self, driver, allow: Iterable[str]):
+        """按本次抓取的放行类别设置拦截的URL，实例被不同爬虫复用，每次打开页面前都要重新设置"""
+        driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": blocked_url_patterns(self.block, allow)})
+
+    @staticmethod
+    def _network_events(driver) -> List[Dict]:
+        """取出自上次调用以来的网络事件"""
+        try:
+            entries = driver.get_log("performance")
+        except Exception:
+            return []
+        events = []
+        for entry in entries:
+            try:
+                events.append(json.loads(entry["message"])["message"])
+            except (KeyError, TypeError, ValueError):
+                continue
+        return events
+
+    @staticmethod
+    def network_summary(events: List[Dict]) -> Dict[str, int]:
+        """统计页面加载的请求数、传输字节数、被拦截和命中缓存的请求数"""
+        summary = {"requests": 0, "bytes": 0, "blocked": 0, "cached": 0}
+        for event in events:
+            method = event.get("method")
+            params = event.get("params") or {}
+            if method == "Network.requestWillBeSent":
+                summary["requests"] += 1
+            elif method == "Network.loadingFinished":
+                summary["bytes"] += int(params.get("encodedDataLength") or 0)
+            elif method == "Network.loadingFailed" and params.get("blockedReason"):
+                summary["blocked"] += 1
+            elif method == "Network.requestServedFromCache":
+                summary["cached"] += 1
+        return summary
+
+    def extract(self, driver, rows: str, fields: Dict[str, Union[str, Dict[str, Any]]]) -> List[Dict[str, Any]]:
+        """在一次 execute_script 中按规则抽取页面上的所有行
+
+        rows 为行的 CSS 选择器；fields 为字段名到规则的映射，规则为字符串时表示取该选择器的文本，
+        为字典时支持 selector、attr、next、own、match（见 _EXTRACT_SCRIPT）。
+        """
+        spec = {name: {"selector": field} if isinstance(field, str) else field
+                for name, field in fields.items()}
+        return driver.execute_script(_EXTRACT_SCRIPT, rows, spec) or []
+
+    def wait_ready(self, driver, selector: Optional[str] = None, script: Optional[str] = None,
+                   network_idle: bool = False, max_wait: Optional[float] = None,
+                   events: Optional[List[Dict]] = None) -> bool:
+        """等待页面就绪，超过 max_wait 返回 False
+
+        selector 为 CSS 选择器，匹配到元素即就绪；script 为返回布尔值的JS表达式；
+        network_idle 要求没有进行中的请求并持续 browser_network_idle 秒。同时给出时需全部满足，
+        都未给出时等待 document.readyState 为 complete。events 用于收集等待期间取出的网络事件。
+        """
+        max_wait = crawler_config.browser_max_wait if max_wait is None else max_wait
+        if selector is None and script is None and not network_idle:
+            script = "document.readyState === 'complete'"
+        start = time.monotonic()
+        deadline = start + max_wait
+        inflight = set()
+        quiet_since = start
+
+        while True:
+            now = time.monotonic()
+            ready = True
+            if network_idle:
+                new_events = self._network_events(driver)
+                if events is not None:
+                    events.extend(new_events)
+                for event in new_events:
+                    request_id = (event.get("params") or {}).get("requestId")
+                    if event.get("method") == "Network.requestWillBeSent":
+                        inflight.add(request_id)
+                    elif event.get("method") in ("Network.loadingFinished", "Network.loadingFailed"):
+                        inflight.discard(request_id)
+                    else:
+                        continue
+                    quiet_since = now
+                ready = not inflight and now - quiet_since >= crawler_config.browser_network_idle
+            if ready and selector is not None:
+                ready = driver.execute_script("return document.querySelector(arguments[0]) !== null", selector)
+            if ready and script is not None:
+                ready = bool(driver.execute_script(f"return !!({script})"))
+            if ready:
+                return True
+            if now >= deadline:
+                log.warning(f"页面在 {max_wait}s 内未就绪（selector={selector}, script={script}, "
+                            f"network_idle={network_idle}），使用当前内容")
+                return False
+            time.sleep(READY_POLL_INTERVAL)
+
+    @contextmanager
+    def page(self, url: str, wait_for: Optional[str] = None, wait_script: Optional[str] = None,
+             network_idle: bool = False, max_wait: Optional[float] = None,
+             checkout_timeout: Optional[float] = None, allow: Iterable[str] = ()) -> Iterator[webdriver.Chrome]:
+        """借出一个实例并打开 url，页面就绪（见 wait_ready）后在上下文内可以继续操作页面
+
+        allow 为本次抓取不拦截的资源类别（BLOCKABLE_RESOURCES 的键）。
+        """
+        with self.lease(checkout_timeout) as pooled:
+            driver = pooled.driver
+            self._block_resources(driver, allow)
+            # 丢弃上一次使用留下的网络事件
+            self._network_events(driver)
+            pooled.pages += 1
+            start = time.perf_counter()
             driver.get(url)
-            time.sleep(wait_time)  # 等待页面加载
-            page_source = driver.page_source
-            self.release_driver()
-            return page_source, driver
+            events = []
+            self.wait_ready(driver, wait_for, wait_script, network_idle, max_wait, events)
+            summary = self.network_summary(events + self._network_events(driver))
+            log.info(f"浏览器加载 {url} 用时 {time.perf_counter() - start:.2f}s，"
+                     f"{summary['requests']} 个请求，{summary['bytes'] // 1024}KB，"
+                     f"拦截 {summary['blocked']} 个，缓存命中 {summary['cached']} 个")
+            yield driver
+
+    def get_page_content(self, url, **ready):
+        """获取指定URL的页面源码，ready 为 page() 的就绪条件参数"""
+        try:
+            with self.page(url, **ready) as driver:
+                return driver.page_source
         except Exception as e:
             log.error(f"获取页面内容失败: {str(e)}")
-            self.release_driver()
             raise
-    
+
+    def render(self, url: str, wait_for: Optional[str] = None, wait_script: Optional[str] = None,
+               network_idle: bool = False, max_wait: Optional[float] = None, allow: Iterable[str] = (),
+               click: Optional[str] = None, after_click: Optional[Dict[str, Any]] = None,
+               extract: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """执行一次渲染任务，返回 {"url", "html"} 或按抽取规则返回 {"url", "rows"}
+
+        click 为打开页面后要点击的元素的 XPath（找不到时忽略），点击后按 after_click
+        （wait_ready 的参数）等待；extract 为 {"rows": 行选择器或依次尝试的选择器列表, "fields": 字段规则}。
+        """
+        with self.page(url, wait_for, wait_script, network_idle, max_wait, allow=allow) as driver:
+            if click:
+                try:
+                    elements = driver.find_elements("xpath", click)
+                    if elements:
+                        elements[0].click()
+                        self.wait_ready(driver, **(after_click or {}))
+                except WebDriverException as e:
+                    # 点击失败时继续使用当前页面内容
+                    log.warning(f"点击 {click} 失败: {e}")
+
+            if extract is None:
+                return {"url": url, "html": driver.page_source}
+
+            selectors = extract["rows"]
+            rows = []
+            for selector in [selectors] if isinstance(selectors, str) else selectors:
+                rows = self.extract(driver, selector, extract["fields"])
+                if rows:
+                    break
+            return {"url": url, "rows": rows}
+
+    def stats(self) -> Dict[str, int]:
+        with self._cond:
+            return {"size": self.pool_size, "total": self._total, "idle": len(self._idle)}
+
+    def prewarm(self, count: Optional[int] = None) -> int:
+        """提前并行启动实例直到池中有 count 个（默认为 browser_prewarm），返回新启动的数量"""
+        count = min(crawler_config.browser_prewarm if count is None else count, self.pool_size)
+        with self._cond:
+            slots = [self._reserve_slot() for _ in range(max(count - self._total, 0))]
+
+        def start(slot):
+            try:
+                pooled = PooledDriver(self._create_driver(slot), slot)
+            except Exception as e:
+                log.error(f"预热浏览器实例失败: {str(e)}")
+                with self._cond:
+                    self._release_slot(slot)
+                return
+            self.checkin(pooled)
+
+        missing = len(slots)
+        threads = [threading.Thread(target=start, args=(slot,), daemon=True) for slot in slots]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        if missing:
+            log.info(f"预热了 {missing} 个浏览器实例，池大小 {self.pool_size}")
+        return missing
+
     def shutdown(self):
-        """关闭浏览器管理器"""
-        with self._lock:
-            self._quit_driver() 
\ No newline at end of file
+        """关闭浏览器管理器，借出中的实例在归还时关闭"""
+        with self._cond:
+            self._closed = True
+            idle, self._idle = self._idle, []
+            for pooled in idle:
+                self._release_slot(pooled.slot)
+            self._cond.notify_all()
+        for pooled in idle:
+            self._quit_driver(pooled.driver)
@@ -0,0 +1,107 @@
+import time
+from typing import Dict, Any
+
+from app.core import cache
+from app.core.config import get_crawler_config
+from app.utils.logger import log
+
+# 获取爬虫配置
+crawler_config = get_crawler_config()
+
+# 熔断器状态
+STATE_CLOSED = "closed"
+STATE_OPEN = "open"
+STATE_HALF_OPEN = "half_open"
+
+# 熔断状态在Redis中的保留时间
+STATE_EXPIRE = 7 * 24 * 3600
+
+
+class CircuitBreaker:
+    """单个平台的熔断器，状态保存在Redis中，重启后依然有效
+
+    连续失败达到阈值后熔断，熔断期间直接跳过该平台；等待期结束后放行一次探测请求，
+    探测成功则恢复，失败则重新熔断并将等待期加倍（不超过上限）。
+    探测名额通过 SET NX 原子抢占，多个调度进程同时到期时只有一个进程发出探测，
+    名额在 crawler_timeout 后过期，探测进程崩溃时下一轮可以重新探测。
+    """
+
+    def __init__(self, platform: str):
+        self.platform = platform
+        self.key = f"crawler:breaker:{platform}"
+        self.probe_key = f"crawler:breaker:{platform}:probe"
+        self.failure_threshold = crawler_config.breaker_failure_threshold
+        self.reset_timeout = crawler_config.breaker_reset_timeout
+        self.max_reset_timeout = crawler_config.breaker_max_reset_timeout
+
+    def _load(self) -> Dict[str, Any]:
+        state = cache.get_cache(self.key)
+        if not isinstance(state, dict):
+            state = {"state": STATE_CLOSED, "failures": 0, "opened_at": 0, "reset_timeout": self.reset_timeout}
+        return state
+
+    def _save(self, state: Dict[str, Any]):
+        cache.set_cache(self.key, state, expire=STATE_EXPIRE)
+
+    def _claim_probe(self) -> bool:
+        """抢占探测名额，已有其他请求在探测时返回 False"""
+        try:
+            return bool(cache.get_redis_client().set(self.probe_key, 1, nx=True,
+                                                     px=crawler_config.crawler_timeout * 1000))
+        except Exception as e:
+            log.error(f"Error claiming circuit breaker probe for {self.platform}: {e}")
+            return True
+
+    def _release_probe(self):
+        cache.delete_cache(self.probe_key)
+
+    def allow_request(self) -> bool:
+        """判断本次是否允许抓取，熔断等待期结束后转为半开状态，只放行抢到名额的一次探测"""
+        state = self._load()
+        if state["state"] == STATE_CLOSED:
+            return True
+
+        if state["state"] == STATE_OPEN and time.time() - state["opened_at"] < state["reset_timeout"]:
+            return False
+
+        if not self._claim_probe():
+            return False
+
+        if state["state"] == STATE_OPEN:
+            state["state"] = STATE_HALF_OPEN
+            self._save(state)
+        log.info(f"Circuit breaker for {self.platform} half-open, probing")
+        return True
+
+    def record_success(self):
+        state = self._load()
+        if state["state"] != STATE_CLOSED or state["failures"]:
+            if state["state"] != STATE_CLOSED:
+                log.info(f"Circuit breaker for {self.platform} closed")
+            self._save({"state": STATE_CLOSED, "failures": 0, "opened_at": 0, "reset_timeout": self.reset_timeout})
+            if state["state"] == STATE_HALF_OPEN:
+                self._release_probe()
+
+    def record_failure(self):
+        state = self._load()
+        state["failures"] += 1
+        probing = state["state"] == STATE_HALF_OPEN
+
+        if probing:
+            # 探测失败，重新熔断并延长等待期
+            state["reset_timeout"] = min(state["reset_timeout"] * 2, self.max_reset_timeout)
+            state["state"] = STATE_OPEN
+            state["opened_at"] = time.time()
+            log.warning(f"Circuit breaker for {self.platform} probe failed, "
+                        f"reopened for {state['reset_timeout']}s")
+        elif state["state"] == STATE_CLOSED and state["failures"] >= self.failure_threshold:
+            state["state"] = STATE_OPEN
+            state["opened_at"] = time.time()
+            state["reset_timeout"] = self.reset_timeout
+            log.warning(f"Circuit breaker for {self.platform} opened after "
+                        f"{state['failures']} consecutive failures")
+
+        self._save(state)
+        # 先写入熔断状态再释放探测名额，避免其他进程在半开状态下抢到名额
+        if probing:
+            self._release_probe()
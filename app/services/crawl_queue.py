@@ -0,0 +1,190 @@
+import json
+import time
+import uuid
+import threading
+from typing import Callable, Dict, Any, List, Optional, Tuple
+
+import redis
+
+from app.core import cache
+from app.core.config import get_crawler_config
+from app.utils.logger import log
+
+# 获取爬虫配置
+crawler_config = get_crawler_config()
+
+# 待执行的抓取任务，成员为平台名称，分数为任务可被领取的时间
+QUEUE_KEY = "crawler:queue"
+# 任务内容，键为 crawler:queue:job:{platform}
+JOB_KEY = "crawler:queue:job:{}"
+# 已完成任务的结果，由 leader 读取后触发分析和调整抓取间隔
+RESULTS_KEY = "crawler:queue:results"
+# 被放弃的任务记为失败，与 crawler.FETCH_FAILED 相同
+RESULT_FAILED = "failed"
+
+# 乐观事务冲突时的最大重试次数
+MAX_TX_RETRIES = 5
+
+
+class CrawlQueue:
+    """基于 Redis 的平台抓取任务队列
+
+    每个平台同时最多只有一个任务。worker 领取任务后任务并不删除，而是把可领取时间推迟
+    visibility_timeout 秒；worker 在此期间确认完成则删除任务，worker 崩溃时任务到期后
+    自动重新可见，由其他 worker 再次领取。每次领取生成新的回执，过期回执的确认和写入会被拒绝。
+    """
+
+    def __init__(self, visibility_timeout: float = None, max_deliveries: int = None):
+        self.visibility_timeout = visibility_timeout if visibility_timeout is not None \
+            else crawler_config.queue_visibility_timeout
+        self.max_deliveries = max_deliveries if max_deliveries is not None \
+            else crawler_config.queue_max_deliveries
+
+    @staticmethod
+    def _load(value) -> Optional[Dict[str, Any]]:
+        if value is None:
+            return None
+        if isinstance(value, bytes):
+            value = value.decode('utf-8')
+        return json.loads(value)
+
+    def enqueue(self, platform: str, date_str: str) -> bool:
+        """加入抓取任务，该平台已有待执行或执行中的任务时跳过"""
+        client = cache.get_redis_client()
+        job = {"platform": platform, "date": date_str, "attempts": 0,
+               "receipt": None, "enqueued_at": time.time()}
+
+        with client.pipeline() as pipe:
+            for _ in range(MAX_TX_RETRIES):
+                try:
+                    pipe.watch(QUEUE_KEY)
+                    if pipe.zscore(QUEUE_KEY, platform) is not None:
+                        pipe.reset()
+                        return False
+                    pipe.multi()
+                    pipe.set(JOB_KEY.format(platform), json.dumps(job))
+                    pipe.zadd(QUEUE_KEY, {platform: job["enqueued_at"]})
+                    pipe.execute()
+                    return True
+                except redis.WatchError:
+                    continue
+        return False
+
+    def claim(self) -> Optional[Dict[str, Any]]:
+        """领取一个可执行的任务，没有任务时返回 None"""
+        client = cache.get_redis_client()
+
+        with client.pipeline() as pipe:
+            for _ in range(MAX_TX_RETRIES):
+                try:
+                    now = time.time()
+                    pipe.watch(QUEUE_KEY)
+                    ready = pipe.zrangebyscore(QUEUE_KEY, "-inf", now, start=0, num=1)
+                    if not ready:
+                        pipe.reset()
+                        return None
+
+                    platform = ready[0].decode('utf-8') if isinstance(ready[0], bytes) else ready[0]
+                    job_key = JOB_KEY.format(platform)
+                    job = self._load(pipe.get(job_key))
+
+                    pipe.multi()
+                    if job is None or job["attempts"] >= self.max_deliveries:
+                        # 任务内容丢失或多次领取都未完成（例如每次都导致 worker 崩溃），放弃该任务，
+                        # 同时写入失败结果，leader 据此更新熔断器和抓取间隔
+                        reason = "job_lost" if job is None else "max_deliveries"
+                        result = {"platform": platform, "date": job["date"] if job else None,
+                                  "status": RESULT_FAILED, "reason": reason,
+                                  "elapsed": now - job["enqueued_at"] if job else 0.0,
+                                  "attempts": job["attempts"] if job else 0}
+                        pipe.zrem(QUEUE_KEY, platform)
+                        pipe.delete(job_key)
+                        pipe.rpush(RESULTS_KEY, json.dumps(result))
+                        pipe.execute()
+                        log.error(f"Crawl job {platform} dropped after {result['attempts']} deliveries: {reason}")
+                        continue
+
+                    job["attempts"] += 1
+                    job["receipt"] = uuid.uuid4().hex
+                    pipe.set(job_key, json.dumps(job))
+                    pipe.zadd(QUEUE_KEY, {platform: now + self.visibility_timeout}, xx=True)
+                    pipe.execute()
+                    return job
+                except redis.WatchError:
+                    continue
+        return None
+
+    def _with_receipt(self, job: Dict[str, Any], writes: Callable[[redis.client.Pipeline], None],
+                      watch: Tuple[str, ...] = ()) -> bool:
+        """仅当任务仍由本次领取持有时，在事务中执行写操作"""
+        client = cache.get_redis_client()
+        job_key = JOB_KEY.format(job["platform"])
+
+        with client.pipeline() as pipe:
+            try:
+                pipe.watch(job_key, *watch)
+                current = self._load(pipe.get(job_key))
+                if current is None or current["receipt"] != job["receipt"]:
+                    pipe.reset()
+                    return False
+                pipe.multi()
+                writes(pipe)
+                pipe.execute()
+                return True
+            except redis.WatchError:
+                if watch:
+                    raise
+                return False
+
+    def fenced_write(self, job: Dict[str, Any], writes: Callable[[redis.client.Pipeline], None],
+                     watch: Tuple[str, ...] = ()) -> bool:
+        """写入抓取结果，任务已超时被他人领取时拒绝写入；watch 中的键被修改时抛出 WatchError"""
+        return self._with_receipt(job, writes, watch)
+
+    def ack(self, job: Dict[str, Any], status: str, elapsed: float = 0.0) -> bool:
+        """确认任务完成，删除任务并记录结果"""
+        platform = job["platform"]
+        result = {"platform": platform, "date": job["date"], "status": status,
+                  "elapsed": elapsed, "attempts": job["attempts"]}
+
+        def writes(pipe):
+            pipe.zrem(QUEUE_KEY, platform)
+            pipe.delete(JOB_KEY.format(platform))
+            pipe.rpush(RESULTS_KEY, json.dumps(result))
+
+        acked = self._with_receipt(job, writes)
+        if not acked:
+            log.warning(f"Crawl job {platform} ack rejected, lease expired")
+        return acked
+
+    def release(self, job: Dict[str, Any]) -> bool:
+        """放弃已领取的任务，使其立即可被重新领取"""
+        return self._with_receipt(
+            job, lambda pipe: pipe.zadd(QUEUE_KEY, {job["platform"]: time.time()}, xx=True)
+        )
+
+    def drain_results(self) -> List[Dict[str, Any]]:
+        """取出所有已完成任务的结果"""
+        client = cache.get_redis_client()
+        with client.pipeline() as pipe:
+            pipe.lrange(RESULTS_KEY, 0, -1)
+            pipe.delete(RESULTS_KEY)
+            values, _ = pipe.execute()
+        return [self._load(value) for value in values]
+
+    def size(self) -> int:
+        return cache.get_redis_client().zcard(QUEUE_KEY)
+
+
+_crawl_queue: Optional[CrawlQueue] = None
+_queue_lock = threading.Lock()
+
+
+def get_crawl_queue() -> CrawlQueue:
+    """获取全局抓取任务队列"""
+    global _crawl_queue
+    if _crawl_queue is None:
+        with _queue_lock:
+            if _crawl_queue is None:
+                _crawl_queue = CrawlQueue()
+    return _crawl_queue
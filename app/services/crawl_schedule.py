@@ -0,0 +1,83 @@
+from typing import List, Dict, Optional
+
+from app.core import cache
+from app.core.config import get_crawler_config
+from app.utils.logger import log
+
+# 获取爬虫配置
+crawler_config = get_crawler_config()
+
+# 各平台榜单变化率（指数滑动平均），字段为平台名称
+# 变化率为每 crawler.interval 秒内变化的条目比例，与平台实际的抓取间隔无关
+CHANGE_RATE_KEY = "crawler:change_rate"
+
+# 变化率的下限，避免几乎不变的平台间隔无限拉长
+MIN_WEIGHT = 0.05
+# 没有历史记录的平台按中等变化率处理
+DEFAULT_WEIGHT = 0.5
+
+
+def get_change_rates() -> Dict[str, float]:
+    """获取所有平台的变化率"""
+    rates = {}
+    for platform, value in cache.hgetall(CHANGE_RATE_KEY).items():
+        try:
+            if isinstance(platform, bytes):
+                platform = platform.decode('utf-8')
+            rates[platform] = float(value)
+        except (TypeError, ValueError):
+            continue
+    return rates
+
+
+def record_change(platform: str, ratio: float, elapsed: Optional[float] = None) -> float:
+    """用本次的变化比例更新平台变化率
+
+    elapsed 为距上一个快照的秒数，变化比例按它折算为每 crawler.interval 秒的变化率，
+    抓取间隔不同的平台才能相互比较；没有上一个快照时按 crawler.interval 计算。
+    """
+    alpha = crawler_config.change_rate_alpha
+    if elapsed is not None:
+        ratio = ratio * crawler_config.interval / max(elapsed, 1.0)
+    try:
+        previous_rate = get_change_rates().get(platform)
+        if previous_rate is None:
+            rate = ratio
+        else:
+            rate = alpha * ratio + (1 - alpha) * previous_rate
+
+        cache.hset(CHANGE_RATE_KEY, platform, f"{rate:.4f}")
+        return rate
+    except Exception as e:
+        log.error(f"Error recording change rate for {platform}: {e}")
+        return ratio
+
+
+def compute_intervals(platforms: List[str]) -> Dict[str, int]:
+    """按变化率分配抓取频率，返回各平台的抓取间隔（秒）
+
+    总请求量与所有平台都按 crawler.interval 抓取时相同，变化快的平台分到更多次数，
+    结果限制在 [crawler.min_interval, crawler.max_interval] 之间。
+    """
+    if not platforms:
+        return {}
+
+    try:
+        rates = get_change_rates()
+    except Exception as e:
+        log.error(f"Error loading change rates: {e}")
+        rates = {}
+
+    weights = {
+        platform: max(rates.get(platform, DEFAULT_WEIGHT), MIN_WEIGHT)
+        for platform in platforms
+    }
+    total_weight = sum(weights.values())
+    # 每秒允许的总抓取次数
+    total_rate = len(platforms) / crawler_config.interval
+
+    intervals = {}
+    for platform, weight in weights.items():
+        interval = total_weight / (weight * total_rate)
+        intervals[platform] = round(min(max(interval, crawler_config.min_interval), crawler_config.max_interval))
+    return intervals
@@ -1,13 +1,26 @@
 import time
+import asyncio
+import random
 import traceback
 import threading
-from datetime import datetime
-from functools import wraps
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from functools import wraps, partial
 import pytz
 import signal
-from typing import List, Dict, Any, Optional, Callable
+from typing import List, Dict, Any, Optional, Callable, Tuple
 
-from app.services import crawler_factory, _scheduler
+from app.services import crawler_factory, http_client, crawl_schedule
+from app.services.scheduler import _scheduler
+from app.services.circuit_breaker import CircuitBreaker
+from app.services.leader import get_leader, LeadershipLostError
+from app.services.crawl_queue import get_crawl_queue
+from app.services.snapshot_store import snapshot_store, encode_items
+from app.services import snapshot_diff, publisher
+from app.services.worker_pool import get_worker_pool, WorkerTimeoutError
+from app.services.sites.crawler import AsyncCrawler, NotModified, conditional_fetch, fetched_validators
+from app.services.sites.news_item import build_items
+from app.utils import codec
 from app.utils.logger import log
 from app.core import db, cache
 from app.core.config import get_crawler_config
@@ -20,12 +33,37 @@ crawler_config = get_crawler_config()
 CRAWLER_INTERVAL = crawler_config.interval
 CRAWLER_TIMEOUT = crawler_config.timeout
 MAX_RETRY_COUNT = crawler_config.max_retry_count
+CRAWLER_CONCURRENCY = crawler_config.concurrency
+CRAWLER_DEADLINE = crawler_config.crawler_timeout
+RETRY_BACKOFF = crawler_config.retry_backoff
+RETRY_BACKOFF_MAX = crawler_config.retry_backoff_max
+CRAWLER_ISOLATION = crawler_config.isolation
+CRAWLER_DISPATCH = crawler_config.dispatch
 SHANGHAI_TZ = pytz.timezone('Asia/Shanghai')
 
+# 单个爬虫的抓取结果
+FETCH_UPDATED = "updated"
+FETCH_UNCHANGED = "unchanged"
+FETCH_FAILED = "failed"
+FETCH_CIRCUIT_OPEN = "circuit_open"
+FETCH_NOT_LEADER = "not_leader"
+
+# 数据分析任务ID，多个平台的更新合并为一次分析
+ANALYSIS_JOB_ID = "data_analysis"
+# 平台任务触发时间的随机抖动（秒），避免多个平台同时触发
+PLATFORM_JOB_JITTER = 30
+# 任务队列模式下，leader 汇总抓取结果的任务ID和间隔（秒）
+QUEUE_RESULTS_JOB_ID = "crawl_queue_results"
+QUEUE_RESULTS_INTERVAL = 10
+
 class CrawlerTimeoutError(Exception):
     """爬虫超时异常"""
     pass
 
+class EmptyResultError(Exception):
+    """爬虫没有抓取到任何数据"""
+    pass
+
 def timeout_handler(func: Callable, timeout: int = CRAWLER_TIMEOUT) -> Callable:
     """超时处理装饰器，支持Unix信号和线程两种实现"""
     @wraps(func)
@@ -60,38 +98,171 @@ def timeout_handler(func: Callable, timeout: int = CRAWLER_TIMEOUT) -> Callable:
         return result[0]
     return wrapper
 
-def safe_fetch(crawler_name: str, crawler, date_str: str, is_retry: bool = False) -> List[Dict[str, Any]]:
-    """安全地执行爬虫抓取，处理异常并返回结果"""
+async def _fetch_news(crawler_name: str, crawler, date_str: str, executor: ThreadPoolExecutor,
+                      timeout: float) -> List[Dict[str, Any]]:
+    """异步爬虫直接在事件循环中执行（超时可取消）
+
+    同步爬虫默认交给受监管的工作进程，超时会终止进程；isolation 为 thread 时在线程池中执行。
+    """
+    if isinstance(crawler, AsyncCrawler):
+        return await crawler.fetch(date_str)
+    
+    loop = asyncio.get_running_loop()
+    if CRAWLER_ISOLATION == "process":
+        news_list = await loop.run_in_executor(
+            executor, get_worker_pool().run, crawler_name, date_str, timeout
+        )
+        if news_list is None:
+            raise NotModified(crawler_name)
+        return news_list
+    return await loop.run_in_executor(executor, crawler.fetch, date_str)
+
+async def _fetch_once(crawler_name: str, crawler, date_str: str, executor: ThreadPoolExecutor,
+                      timeout: float, publication: publisher.Publication) -> str:
+    """执行一次抓取并写入本轮发布，返回抓取结果状态，失败时抛出异常
+
+    上游返回304或内容摘要与上次相同时，跳过解析结果的写入。
+    写入的榜单在 publication 提交后才对读者可见。
+    """
+    digest_key = publisher.DIGEST_KEY.format(crawler_name, date_str)
+    
+    # 当天已发布过榜单时才发送条件请求（摘要只在提交时写入）
+    last_digest = cache.get(digest_key)
+    has_cache = last_digest is not None
+    conditional_fetch.set(has_cache)
+    # 平台的校验信息每次抓取只读取一次（在线程中执行，不阻塞事件循环），请求时从 ContextVar 中取用；
+    # 收到的校验信息随榜单一起提交，抓取或发布失败时丢弃
+    validators = await asyncio.to_thread(publisher.load_validators, crawler_name) if has_cache else {}
+    fetched_validators.set(validators)
+    
     try:
-        news_list = crawler.fetch(date_str)
-        if news_list and len(news_list) > 0:
-            cache_key = f"crawler:{crawler_name}:{date_str}"
-            cache.set_cache(key=cache_key, value=news_list, expire=0)
-            
-            log.info(f"{crawler_name} fetch success, {len(news_list)} news fetched")
-            return news_list
-        else:
-            log.info(f"{'Second time ' if is_retry else ''}crawler {crawler_name} failed. 0 news fetched")
-            return []
-    except Exception as e:
-        error_msg = traceback.format_exc()
-        log.error(f"{'Second time ' if is_retry else ''}crawler {crawler_name} error: {error_msg}")
+        news_list = await asyncio.wait_for(
+            _fetch_news(crawler_name, crawler, date_str, executor, timeout), timeout=timeout
+        )
+    except NotModified:
+        crawl_schedule.record_change(crawler_name, 0.0)
+        log.info(f"{crawler_name} not modified upstream, skip parsing")
+        return FETCH_UNCHANGED
+    
+    if not news_list:
+        raise EmptyResultError("0 news fetched")
+    
+    # 仍在榜上的条目沿用首次上榜时间，榜单只序列化一次，摘要、榜单和快照共用同一份字节
+    items = encode_items(build_items(crawler_name, news_list))
+    previous = snapshot_store.latest(crawler_name)
+    snapshot_diff.carry_publish_time(previous["items"] if previous else None, items)
+    payload = codec.dumps(items)
+    digest = publisher.content_digest(payload)
+    if has_cache and last_digest == digest:
+        crawl_schedule.record_change(crawler_name, 0.0)
+        publisher.save_validators(crawler_name, validators)
+        log.info(f"{crawler_name} unchanged, {len(news_list)} news fetched, skip cache write")
+        return FETCH_UNCHANGED
+    
+    # 与上一个快照比较，得到新上榜、下榜和排名变化的条目
+    diff = snapshot_diff.diff_items(previous["items"] if previous else None, items)
+    
+    # 只有仍持有租约的 leader（或任务领取者）才能写入，避免过期的执行者覆盖新结果
+    if not publication.publish(crawler_name, payload, digest, diff, previous["ts"] if previous else None,
+                               validators):
+        raise LeadershipLostError(f"lease lost, discard {crawler_name} result")
+    elapsed = time.time() - previous["ts"] / 1000 if previous else None
+    crawl_schedule.record_change(crawler_name, snapshot_diff.change_ratio(diff, len(items)), elapsed)
+    
+    log.info(f"{crawler_name} fetch success, {len(news_list)} news fetched, "
+             f"added: {len(diff['added'])}, removed: {len(diff['removed'])}, moved: {len(diff['moved'])}")
+    return FETCH_UPDATED
+
+def _backoff_delay(attempt: int) -> float:
+    """带随机抖动的指数退避时间"""
+    return random.uniform(0, min(RETRY_BACKOFF * (2 ** attempt), RETRY_BACKOFF_MAX))
+
+async def safe_fetch(crawler_name: str, crawler, date_str: str, executor: ThreadPoolExecutor,
+                     publication: Optional[publisher.Publication] = None) -> str:
+    """安全地执行爬虫抓取，处理异常、超时和重试，返回抓取结果状态
+
+    失败后在截止时间内按指数退避立即重试；熔断中的平台直接跳过。
+    未传入 publication 时单独发布本次结果，由 leader 写入。
+    """
+    if publication is None:
+        publication = publisher.Publication(date_str, get_leader().fenced_write)
+        status = await safe_fetch(crawler_name, crawler, date_str, executor, publication)
+        return _commit_publication(publication, {crawler_name: status})[crawler_name]
+    
+    breaker = CircuitBreaker(crawler_name)
+    if not breaker.allow_request():
+        log.warning(f"crawler {crawler_name} skipped, circuit breaker open")
+        return FETCH_CIRCUIT_OPEN
+    
+    deadline = time.monotonic() + CRAWLER_DEADLINE
+    last_error = None
+    for attempt in range(MAX_RETRY_COUNT + 1):
+        retry_text = f"Retry {attempt} " if attempt else ""
+        # 每次尝试只能使用截止时间内剩余的时间
+        timeout = deadline - time.monotonic()
+        try:
+            status = await _fetch_once(crawler_name, crawler, date_str, executor,
+                                       timeout=timeout, publication=publication)
+            breaker.record_success()
+            return status
+        except LeadershipLostError as e:
+            # 抓取本身已经成功，只是结果不能写入；记为成功，半开状态的探测名额随之释放
+            breaker.record_success()
+            log.warning(f"crawler {crawler_name} result discarded: {e}")
+            return FETCH_NOT_LEADER
+        except EmptyResultError:
+            last_error = None
+            log.info(f"{retry_text}crawler {crawler_name} failed. 0 news fetched")
+        except (asyncio.TimeoutError, WorkerTimeoutError):
+            last_error = None
+            log.error(f"{retry_text}crawler {crawler_name} timed out after {timeout:.1f} seconds")
+            # 截止时间已经用完
+            break
+        except Exception as e:
+            last_error = e
+            log.error(f"{retry_text}crawler {crawler_name} error: {traceback.format_exc()}")
         
-        # 发送钉钉通知
+        if attempt < MAX_RETRY_COUNT:
+            delay = _backoff_delay(attempt)
+            if time.monotonic() + delay >= deadline:
+                break
+            log.info(f"Retrying crawler {crawler_name} in {delay:.2f}s")
+            await asyncio.sleep(delay)
+    
+    breaker.record_failure()
+    
+    if last_error is not None:
+        # 发送钉钉通知（同步HTTP请求，放到线程中避免阻塞事件循环）
         try:
-            notification_manager.notify_crawler_error(
+            await asyncio.to_thread(
+                notification_manager.notify_crawler_error,
                 crawler_name=crawler_name,
-                error_msg=str(e),
+                error_msg=str(last_error),
                 date_str=date_str,
-                is_retry=is_retry
+                is_retry=attempt > 0
             )
         except Exception as notify_error:
             log.error(f"Failed to send notification for crawler {crawler_name}: {notify_error}")
-        
-        return []
+    
+    return FETCH_FAILED
+
+def _commit_publication(publication: publisher.Publication, results: Dict[str, str]) -> Dict[str, str]:
+    """提交本轮发布，提交被拒绝时把已更新的平台标记为 FETCH_NOT_LEADER"""
+    try:
+        committed = publication.commit() is not None
+    except Exception as e:
+        log.error(f"Failed to publish crawl results for {publication.date_str}: {e}")
+        committed = False
+    if committed:
+        return results
+    return {name: FETCH_NOT_LEADER if status == FETCH_UPDATED else status for name, status in results.items()}
 
 def run_data_analysis(date_str: str):
     """执行数据分析并缓存结果"""
+    if not get_leader().is_leader:
+        log.info(f"Not leader, skip data analysis for date {date_str}")
+        return
+    
     log.info(f"Starting data analysis for date {date_str}")
     try:
         # 导入分析模块（在这里导入避免循环依赖）
@@ -149,49 +320,122 @@ def run_data_analysis(date_str: str):
         except Exception as notify_error:
             log.error(f"Failed to send analysis error notification: {notify_error}")
 
-@_scheduler.scheduled_job('interval', id='crawlers_logic', seconds=CRAWLER_INTERVAL, 
-                         max_instances=crawler_config.max_instances, 
-                         misfire_grace_time=crawler_config.misfire_grace_time)
+def trigger_data_analysis(date_str: str, delay: int = 0):
+    """安排一次数据分析
+
+    delay 大于0时，等待窗口内其他平台的更新会合并到同一次分析中。
+    """
+    if delay > 0 and _scheduler.get_job(ANALYSIS_JOB_ID):
+        return
+    
+    run_date = datetime.now(SHANGHAI_TZ) + timedelta(seconds=delay)
+    _scheduler.add_job(run_data_analysis, 'date', run_date=run_date, args=[date_str],
+                       id=ANALYSIS_JOB_ID, replace_existing=True)
+
+async def _run_crawler(crawler_name: str, crawler, date_str: str, executor: ThreadPoolExecutor,
+                       semaphore: asyncio.Semaphore, publication: publisher.Publication) -> Tuple[str, str, float]:
+    """在并发度限制内执行单个爬虫，记录耗时"""
+    async with semaphore:
+        start_time = time.time()
+        status = await safe_fetch(crawler_name, crawler, date_str, executor, publication)
+        return crawler_name, status, time.time() - start_time
+
+
+def _prewarm_browsers(crawlers: Dict[str, Any]):
+    """浏览器爬虫在本进程执行时，抓取开始前在后台启动浏览器实例
+
+    进程隔离时浏览器由各工作进程自己管理，使用渲染服务时由渲染服务预热，这里都不预热。
+    """
+    if CRAWLER_ISOLATION == "process" or crawler_config.render_mode == "service":
+        return
+    if crawler_config.browser_prewarm <= 0:
+        return
+    if not any(getattr(crawler, "uses_browser", False) for crawler in crawlers.values()):
+        return
+
+    def prewarm():
+        try:
+            # 按需导入 selenium，仅提供API的进程不需要加载浏览器依赖
+            from app.services.browser_manager import BrowserManager
+            BrowserManager().prewarm()
+        except Exception as e:
+            log.error(f"Failed to prewarm browsers: {e}")
+
+    threading.Thread(target=prewarm, name="browser-prewarm", daemon=True).start()
+
+
+async def run_crawlers(crawlers: Dict[str, Any], date_str: str) -> Tuple[Dict[str, str], Dict[str, float]]:
+    """并发执行一组爬虫，返回各爬虫的抓取结果状态和耗时
+
+    每个爬虫完成后立即写入带版本的榜单，整轮结束后一次性切换清单指针发布，
+    读者看到的各平台榜单始终来自同一轮。异步爬虫共享当前事件循环的连接池客户端，
+    通过 http_client.run 执行时客户端在多轮之间保持，连接可以复用。
+    """
+    results = {}
+    timings = {}
+    if not crawlers:
+        return results, timings
+
+    _prewarm_browsers(crawlers)
+    semaphore = asyncio.Semaphore(CRAWLER_CONCURRENCY)
+    # 每个同步爬虫一个线程（进程隔离时线程只负责等待工作进程），
+    # 超时的爬虫线程无法被中断，不能让它占住其他爬虫的执行槽位
+    sync_count = sum(1 for crawler in crawlers.values() if not isinstance(crawler, AsyncCrawler))
+    executor = ThreadPoolExecutor(max_workers=max(sync_count, 1), thread_name_prefix="crawler")
+    publication = publisher.Publication(date_str, get_leader().fenced_write)
+    try:
+        tasks = [
+            _run_crawler(crawler_name, crawler, date_str, executor, semaphore, publication)
+            for crawler_name, crawler in crawlers.items()
+        ]
+        for finished in asyncio.as_completed(tasks):
+            crawler_name, status, elapsed = await finished
+            results[crawler_name] = status
+            timings[crawler_name] = elapsed
+            log.info(f"crawler {crawler_name} finished in {elapsed:.2f}s, "
+                     f"{len(results)}/{len(crawlers)} done")
+    finally:
+        executor.shutdown(wait=False)
+
+    return _commit_publication(publication, results), timings
+
+
 def crawlers_logic():
-    """爬虫主逻辑，包含超时保护和错误处理"""
+    """全量抓取所有平台，包含超时保护和错误处理，用于启动时初始化数据"""
+    now_time = datetime.now(SHANGHAI_TZ)
+    date_str = now_time.strftime("%Y-%m-%d")
+    
+    if not get_leader().is_leader:
+        log.info("Not leader, skip full crawl")
+        return 0
+    
+    if CRAWLER_DISPATCH == "queue":
+        queue = get_crawl_queue()
+        queued = sum(1 for crawler_name in crawler_factory if queue.enqueue(crawler_name, date_str))
+        log.info(f"Enqueued {queued}/{len(crawler_factory)} platform crawl jobs")
+        return queued
     
     @timeout_handler
     def crawler_work():
-        now_time = datetime.now(SHANGHAI_TZ)
-        date_str = now_time.strftime("%Y-%m-%d")
         log.info(f"Starting crawler job at {now_time.strftime('%Y-%m-%d %H:%M:%S')}")
         
-        retry_crawler = []
-        success_count = 0
-        failed_crawlers = []
-        
-        for crawler_name, crawler in crawler_factory.items():
-            news_list = safe_fetch(crawler_name, crawler, date_str)
-            if news_list:
-                success_count += 1
-            else:
-                retry_crawler.append(crawler_name)
-                failed_crawlers.append(crawler_name)
-        
-        # 第二轮爬取（重试失败的爬虫）
-        if retry_crawler:
-            log.info(f"Retrying {len(retry_crawler)} failed crawlers")
-            retry_failed = []
-            for crawler_name in retry_crawler:
-                news_list = safe_fetch(crawler_name, crawler_factory[crawler_name], date_str, is_retry=True)
-                if news_list:
-                    success_count += 1
-                    # 从失败列表中移除成功的爬虫
-                    if crawler_name in failed_crawlers:
-                        failed_crawlers.remove(crawler_name)
-                else:
-                    retry_failed.append(crawler_name)
+        results, timings = http_client.run(run_crawlers(crawler_factory, date_str))
+        failed_crawlers = [
+            name for name in crawler_factory
+            if results.get(name, FETCH_FAILED) in (FETCH_FAILED, FETCH_CIRCUIT_OPEN)
+        ]
+        
+        success_count = len(crawler_factory) - len(failed_crawlers)
+        updated_count = sum(1 for status in results.values() if status == FETCH_UPDATED)
+        skipped_count = sum(1 for status in results.values() if status == FETCH_UNCHANGED)
+        open_count = sum(1 for status in results.values() if status == FETCH_CIRCUIT_OPEN)
         
         # 记录完成时间
         end_time = datetime.now(SHANGHAI_TZ)
         duration = (end_time - now_time).total_seconds()
         log.info(f"Crawler job finished at {end_time.strftime('%Y-%m-%d %H:%M:%S')}, "
-                 f"duration: {duration:.2f}s, success: {success_count}/{len(crawler_factory)}")
+                 f"duration: {duration:.2f}s, success: {success_count}/{len(crawler_factory)}, "
+                 f"unchanged: {skipped_count}/{len(crawler_factory)}, circuit open: {open_count}")
         
         # 发送通知
         try:
@@ -200,15 +444,21 @@ def crawlers_logic():
                 total_count=len(crawler_factory),
                 failed_crawlers=failed_crawlers,
                 duration=duration,
-                date_str=date_str
+                date_str=date_str,
+                timings=timings,
+                skipped_count=skipped_count
             )
         except Exception as notify_error:
             log.error(f"Failed to send crawler notification: {notify_error}")
         
+        # 所有榜单都未变化时，上次的分析结果仍然有效
+        if updated_count == 0:
+            log.info("Crawler job completed, no platform changed, skip data analysis")
+            return success_count
+        
         # 爬取完成后执行数据分析
         log.info("Crawler job completed, starting data analysis...")
-        # 使用新线程执行分析，避免阻塞主线程
-        threading.Thread(target=run_data_analysis, args=(date_str,), daemon=True).start()
+        trigger_data_analysis(date_str)
         
         return success_count
     
@@ -238,3 +488,152 @@ def crawlers_logic():
         except Exception as notify_error:
             log.error(f"Failed to send error notification: {notify_error}")
         return 0
+
+
+def _reschedule_platform(crawler_name: str):
+    """按最新的变化率调整平台任务的抓取间隔"""
+    job_id = f"crawler:{crawler_name}"
+    job = _scheduler.get_job(job_id)
+    if job is None:
+        return
+    
+    interval = crawl_schedule.compute_intervals(list(crawler_factory.keys()))[crawler_name]
+    if int(job.trigger.interval.total_seconds()) != interval:
+        _scheduler.reschedule_job(job_id, trigger='interval', seconds=interval, jitter=PLATFORM_JOB_JITTER)
+        log.info(f"Platform {crawler_name} crawl interval adjusted to {interval}s")
+
+def crawl_platform_job(crawler_name: str):
+    """单个平台的定时抓取任务，结束后重新计算该平台的抓取间隔
+
+    所有实例都注册了相同的任务，只有 leader 实际执行抓取。
+    """
+    if not get_leader().is_leader:
+        return
+    
+    now_time = datetime.now(SHANGHAI_TZ)
+    date_str = now_time.strftime("%Y-%m-%d")
+    
+    # 任务队列模式下交给 worker 执行，完成后由 process_queue_results 调整间隔
+    if CRAWLER_DISPATCH == "queue":
+        if get_crawl_queue().enqueue(crawler_name, date_str):
+            log.info(f"Platform job {crawler_name} enqueued")
+        return
+    
+    try:
+        results, timings = http_client.run(run_crawlers({crawler_name: crawler_factory[crawler_name]}, date_str))
+        status = results.get(crawler_name, FETCH_FAILED)
+        log.info(f"Platform job {crawler_name} finished: {status}, "
+                 f"duration: {timings.get(crawler_name, 0):.2f}s")
+        
+        if status == FETCH_UPDATED:
+            trigger_data_analysis(date_str, delay=crawler_config.analysis_delay)
+    except Exception as e:
+        log.error(f"Platform job {crawler_name} error: {str(e)}")
+        log.error(traceback.format_exc())
+    finally:
+        try:
+            _reschedule_platform(crawler_name)
+        except Exception as e:
+            log.error(f"Failed to reschedule platform {crawler_name}: {e}")
+
+def process_queue_results():
+    """汇总任务队列中已完成的抓取结果，触发数据分析并调整抓取间隔"""
+    if not get_leader().is_leader:
+        return
+    
+    for result in get_crawl_queue().drain_results():
+        crawler_name = result["platform"]
+        log.info(f"Queued job {crawler_name} finished: {result['status']}, "
+                 f"duration: {result['elapsed']:.2f}s, attempts: {result['attempts']}")
+        if result.get("reason"):
+            # 任务被队列放弃，抓取没有执行完，熔断器还没有记录这次失败
+            log.error(f"Queued job {crawler_name} dropped: {result['reason']}")
+            CircuitBreaker(crawler_name).record_failure()
+        if result["status"] == FETCH_UPDATED:
+            trigger_data_analysis(result["date"], delay=crawler_config.analysis_delay)
+        try:
+            _reschedule_platform(crawler_name)
+        except Exception as e:
+            log.error(f"Failed to reschedule platform {crawler_name}: {e}")
+
+async def _consume_loop(queue, stop_event: threading.Event, executor: ThreadPoolExecutor):
+    """不断领取并执行抓取任务，直到 stop_event 被设置"""
+    while not stop_event.is_set():
+        try:
+            job = await asyncio.to_thread(queue.claim)
+        except Exception as e:
+            log.error(f"Failed to claim crawl job: {e}")
+            job = None
+        if job is None:
+            await asyncio.sleep(crawler_config.queue_poll_interval)
+            continue
+        
+        crawler_name = job["platform"]
+        crawler = crawler_factory.get(crawler_name)
+        start_time = time.time()
+        if crawler is None:
+            log.error(f"Unknown or unloadable crawler in queue: {crawler_name}")
+            status = FETCH_FAILED
+        else:
+            # 每个任务单独发布，写入要求仍持有该任务的回执
+            publication = publisher.Publication(job["date"], partial(queue.fenced_write, job))
+            status = await safe_fetch(crawler_name, crawler, job["date"], executor, publication)
+            status = (await asyncio.to_thread(_commit_publication, publication, {crawler_name: status}))[crawler_name]
+        
+        try:
+            await asyncio.to_thread(queue.ack, job, status, time.time() - start_time)
+        except Exception as e:
+            log.error(f"Failed to ack crawl job {crawler_name}: {e}")
+
+async def _consume_crawl_jobs(stop_event: threading.Event):
+    queue = get_crawl_queue()
+    executor = ThreadPoolExecutor(max_workers=CRAWLER_CONCURRENCY, thread_name_prefix="crawler")
+    try:
+        await asyncio.gather(*[
+            _consume_loop(queue, stop_event, executor) for _ in range(CRAWLER_CONCURRENCY)
+        ])
+    finally:
+        executor.shutdown(wait=False)
+
+def consume_crawl_jobs(stop_event: threading.Event):
+    """从任务队列领取抓取任务执行（同时执行 crawler.concurrency 个），直到 stop_event 被设置"""
+    log.info(f"Crawl queue consumer started, concurrency: {CRAWLER_CONCURRENCY}")
+    http_client.run(_consume_crawl_jobs(stop_event))
+    log.info("Crawl queue consumer stopped")
+
+def schedule_platform_jobs():
+    """为每个平台注册独立的定时抓取任务"""
+    intervals = crawl_schedule.compute_intervals(list(crawler_factory.keys()))
+    for crawler_name, interval in intervals.items():
+        _scheduler.add_job(
+            crawl_platform_job, 'interval',
+            seconds=interval,
+            args=[crawler_name],
+            id=f"crawler:{crawler_name}",
+            replace_existing=True,
+            max_instances=1,
+            misfire_grace_time=crawler_config.misfire_grace_time,
+            jitter=PLATFORM_JOB_JITTER
+        )
+    log.info(f"Scheduled {len(intervals)} platform crawl jobs, intervals: {intervals}")
+    
+    if CRAWLER_DISPATCH == "queue":
+        _scheduler.add_job(process_queue_results, 'interval', seconds=QUEUE_RESULTS_INTERVAL,
+                           id=QUEUE_RESULTS_JOB_ID, replace_existing=True, max_instances=1)
+
+def start_scheduler():
+    """注册平台抓取任务并启动调度器，由爬虫 worker 调用"""
+    if _scheduler.running:
+        return
+    # 先参与一次选举，启动时的全量抓取据此决定是否执行
+    get_leader().start()
+    schedule_platform_jobs()
+    _scheduler.start()
+    log.info(f"Scheduler started with timezone: {_scheduler.timezone}")
+
+def shutdown_scheduler():
+    """停止调度器，不等待正在执行的任务"""
+    if _scheduler.running:
+        _scheduler.shutdown(wait=False)
+        log.info("Scheduler shutdown")
+    get_leader().stop()
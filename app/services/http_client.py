@@ -0,0 +1,95 @@
+import asyncio
+import threading
+import weakref
+from typing import Any, Awaitable, Optional
+
+import httpx
+
+from app.core.config import get_crawler_config
+from app.utils.logger import log
+
+# 获取爬虫配置
+crawler_config = get_crawler_config()
+
+# 安装了 h2 时启用 HTTP/2，不支持的站点会自动协商回 HTTP/1.1
+try:
+    import h2  # noqa: F401
+    HTTP2_ENABLED = True
+except ImportError:
+    HTTP2_ENABLED = False
+
+# 连接池配置：空闲连接保留到下一轮抓取，同一主机的连接在多轮抓取之间复用（站点先断开时自动重连）
+POOL_LIMITS = httpx.Limits(
+    max_connections=100,
+    max_keepalive_connections=20,
+    keepalive_expiry=crawler_config.min_interval + 30
+)
+
+# httpx 的客户端绑定在创建它的事件循环上，每个事件循环各持有一个
+_clients = weakref.WeakKeyDictionary()
+
+# 替换底层传输（录制/回放），None 表示直接访问网络
+_transport: Optional[httpx.AsyncBaseTransport] = None
+
+# 进程内长期运行的爬虫事件循环，定时任务和队列消费者都在其中执行，共享客户端随进程存在
+_crawl_loop: Optional[asyncio.AbstractEventLoop] = None
+_crawl_loop_lock = threading.Lock()
+
+
+def set_transport(transport: Optional[httpx.AsyncBaseTransport]):
+    """设置之后新建的共享客户端使用的传输层"""
+    global _transport
+    _transport = transport
+
+
+def get_client() -> httpx.AsyncClient:
+    """获取当前事件循环共享的异步HTTP客户端"""
+    loop = asyncio.get_running_loop()
+    client = _clients.get(loop)
+    if client is None or client.is_closed:
+        client = httpx.AsyncClient(
+            http2=HTTP2_ENABLED,
+            verify=False,
+            follow_redirects=True,
+            limits=POOL_LIMITS,
+            transport=_transport
+        )
+        _clients[loop] = client
+        log.debug(f"Shared HTTP client created, http2: {HTTP2_ENABLED}")
+    return client
+
+
+async def close_client():
+    """关闭当前事件循环的共享HTTP客户端，释放连接池"""
+    loop = asyncio.get_running_loop()
+    client = _clients.pop(loop, None)
+    if client is not None and not client.is_closed:
+        await client.aclose()
+
+
+def _get_crawl_loop() -> asyncio.AbstractEventLoop:
+    global _crawl_loop
+    with _crawl_loop_lock:
+        if _crawl_loop is None:
+            _crawl_loop = asyncio.new_event_loop()
+            threading.Thread(target=_crawl_loop.run_forever, name="crawl-loop", daemon=True).start()
+        return _crawl_loop
+
+
+def run(coro: Awaitable[Any]) -> Any:
+    """在爬虫事件循环中执行协程并等待结果，多次调用共用同一个客户端和连接池"""
+    return asyncio.run_coroutine_threadsafe(coro, _get_crawl_loop()).result()
+
+
+def shutdown():
+    """关闭爬虫事件循环的共享客户端并停止事件循环，进程退出时调用"""
+    global _crawl_loop
+    with _crawl_loop_lock:
+        loop, _crawl_loop = _crawl_loop, None
+    if loop is None:
+        return
+    try:
+        asyncio.run_coroutine_threadsafe(close_client(), loop).result(timeout=5)
+    except Exception as e:
+        log.warning(f"Error closing shared HTTP client: {e}")
+    loop.call_soon_threadsafe(loop.stop)
@@ -0,0 +1,80 @@
+import math
+import time
+from typing import Dict, List, Optional, Tuple
+
+from app.core import cache
+from app.core.config import get_crawler_config
+from app.utils.logger import log
+
+# 获取爬虫配置
+crawler_config = get_crawler_config()
+
+# 各平台最近的请求耗时（秒），最新的在最前
+LATENCY_KEY = "crawler:latency:{}"
+
+# 进程内缓存耗时分布的时长（秒），避免每个请求都读取全部样本
+PROFILE_TTL = 60
+
+_profiles: Dict[str, Tuple[float, "LatencyProfile"]] = {}
+
+
+def percentile(samples: List[float], q: float) -> float:
+    """最近秩法计算分位数，samples 需已排序"""
+    rank = max(math.ceil(q * len(samples)), 1)
+    return samples[min(rank, len(samples)) - 1]
+
+
+class LatencyProfile:
+    """平台请求耗时分布，样本不足时不调整超时也不发送对冲请求"""
+
+    def __init__(self, samples: List[float]):
+        self.count = len(samples)
+        samples = sorted(samples)
+        self.p50 = percentile(samples, 0.5) if samples else None
+        self.p95 = percentile(samples, 0.95) if samples else None
+
+    @property
+    def ready(self) -> bool:
+        return self.count >= crawler_config.latency_min_samples
+
+    def timeout(self, default: float) -> float:
+        """按 p95 的倍数确定超时，不低于 latency_min_timeout，不超过爬虫原本的超时"""
+        if not self.ready:
+            return default
+        return min(max(self.p95 * crawler_config.latency_timeout_factor, crawler_config.latency_min_timeout),
+                   default)
+
+    def hedge_delay(self) -> Optional[float]:
+        """请求超过 p95（不低于 latency_min_hedge）仍未返回时发送对冲请求，None 表示不对冲"""
+        if not crawler_config.hedge_requests or not self.ready:
+            return None
+        return max(self.p95, crawler_config.latency_min_hedge)
+
+
+def record_latency(platform: str, seconds: float):
+    """记录一次请求耗时，只保留最近 latency_samples 个样本"""
+    key = LATENCY_KEY.format(platform)
+    try:
+        pipe = cache.get_redis_client().pipeline(transaction=False)
+        pipe.lpush(key, f"{seconds:.3f}")
+        pipe.ltrim(key, 0, crawler_config.latency_samples - 1)
+        pipe.execute()
+    except Exception as e:
+        log.error(f"Error recording latency for {platform}: {e}")
+
+
+def get_profile(platform: str) -> LatencyProfile:
+    """获取平台的耗时分布，进程内缓存 PROFILE_TTL 秒"""
+    now = time.monotonic()
+    cached = _profiles.get(platform)
+    if cached is not None and now - cached[0] < PROFILE_TTL:
+        return cached[1]
+
+    try:
+        samples = [float(value) for value in cache.get_redis_client().lrange(LATENCY_KEY.format(platform), 0, -1)]
+    except Exception as e:
+        log.error(f"Error loading latency for {platform}: {e}")
+        samples = []
+    profile = LatencyProfile(samples)
+    _profiles[platform] = (now, profile)
+    return profile
@@ -0,0 +1,219 @@
+import os
+import time
+import uuid
+import socket
+import threading
+from typing import Callable, Optional, Tuple
+
+import redis
+
+from app.core import cache
+from app.core.config import get_crawler_config
+from app.utils.logger import log
+
+# 获取爬虫配置
+crawler_config = get_crawler_config()
+
+# 租约键，值为 "实例ID:令牌"；令牌计数器为 "{租约键}:fencing"，每次当选时递增
+LEADER_KEY = "crawler:leader"
+# 本实例续约（pexpire）也会使写入事务对租约键的监视失效，租约仍属于本实例时重试的次数
+FENCE_RETRIES = 5
+
+
+class LeadershipLostError(Exception):
+    """本实例已不再持有租约，写入被拒绝"""
+    pass
+
+
+class LeaderLock:
+    """基于 Redis 租约的 leader 选举
+
+    通过 SET NX PX 抢占租约，后台线程定期续约；leader 宕机后租约自然过期，
+    其他实例在下一次尝试时接管。每次当选分配一个递增的令牌，写入时在事务中校验
+    租约仍属于本实例（令牌一致），过期 leader 的迟到写入会被拒绝。
+    """
+
+    def __init__(self, key: str = LEADER_KEY, ttl: float = None, renew_interval: float = None,
+                 enabled: bool = None):
+        self.key = key
+        self.fencing_key = f"{key}:fencing"
+        self.ttl = ttl if ttl is not None else crawler_config.leader_ttl
+        self.renew_interval = renew_interval if renew_interval is not None else crawler_config.leader_renew_interval
+        self.enabled = enabled if enabled is not None else crawler_config.leader_election
+        self.instance_id = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+        self.token: Optional[int] = None
+        self._value: Optional[bytes] = None
+        self._valid_until = 0.0
+        self._stop_event = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def is_leader(self) -> bool:
+        """本实例当前是否持有有效租约（按本地时钟保守判断）"""
+        if not self.enabled:
+            return True
+        return self._value is not None and time.monotonic() < self._valid_until
+
+    def _holds(self, value) -> bool:
+        if isinstance(value, str):
+            value = value.encode('utf-8')
+        return value is not None and value == self._value
+
+    def _lost(self):
+        if self._value is not None:
+            log.warning(f"Leader lease lost by {self.instance_id}, token {self.token}")
+        self.token = None
+        self._value = None
+        self._valid_until = 0.0
+
+    def try_acquire(self) -> bool:
+        """尝试成为 leader，已是 leader 时续约"""
+        if self._value is not None:
+            return self.renew()
+
+        client = cache.get_redis_client()
+        started = time.monotonic()
+        if client.get(self.key) is not None:
+            return False
+
+        token = client.incr(self.fencing_key)
+        value = f"{self.instance_id}:{token}".encode('utf-8')
+        if not client.set(self.key, value, nx=True, px=int(self.ttl * 1000)):
+            return False
+
+        self.token = token
+        self._value = value
+        self._valid_until = started + self.ttl
+        log.info(f"Instance {self.instance_id} elected leader, token {token}")
+        return True
+
+    def renew(self) -> bool:
+        """续约，仅当租约仍属于本实例时延长过期时间"""
+        if self._value is None:
+            return False
+
+        client = cache.get_redis_client()
+        started = time.monotonic()
+        with client.pipeline() as pipe:
+            try:
+                pipe.watch(self.key)
+                if not self._holds(pipe.get(self.key)):
+                    pipe.reset()
+                    self._lost()
+                    return False
+                pipe.multi()
+                pipe.pexpire(self.key, int(self.ttl * 1000))
+                pipe.execute()
+            except redis.WatchError:
+                self._lost()
+                return False
+
+        self._valid_until = started + self.ttl
+        return True
+
+    def release(self):
+        """主动释放租约，便于其他实例立即接管"""
+        if self._value is None:
+            return
+
+        client = cache.get_redis_client()
+        with client.pipeline() as pipe:
+            try:
+                pipe.watch(self.key)
+                if self._holds(pipe.get(self.key)):
+                    pipe.multi()
+                    pipe.delete(self.key)
+                    pipe.execute()
+                else:
+                    pipe.reset()
+            except redis.WatchError:
+                pass
+
+        log.info(f"Instance {self.instance_id} released leadership, token {self.token}")
+        self.token = None
+        self._value = None
+        self._valid_until = 0.0
+
+    def fenced_write(self, writes: Callable[[redis.client.Pipeline], None], watch: Tuple[str, ...] = ()) -> bool:
+        """在事务中执行写操作，提交时租约必须仍属于本实例，否则不写入并返回 False
+
+        watch 中的键在提交前被修改时抛出 WatchError，由调用方重试。
+        """
+        client = cache.get_redis_client()
+        with client.pipeline() as pipe:
+            if not self.enabled:
+                if watch:
+                    pipe.watch(*watch)
+                    pipe.multi()
+                writes(pipe)
+                pipe.execute()
+                return True
+
+            for _ in range(FENCE_RETRIES):
+                if self._value is None:
+                    return False
+                try:
+                    pipe.watch(self.key, *watch)
+                    if not self._holds(pipe.get(self.key)):
+                        pipe.reset()
+                        self._lost()
+                        return False
+                    pipe.multi()
+                    writes(pipe)
+                    pipe.execute()
+                    return True
+                except redis.WatchError:
+                    if watch:
+                        raise
+                    # 租约被续约或易主，重新读取租约，仍属于本实例时重试
+            log.warning(f"Fenced write by {self.instance_id} kept conflicting after {FENCE_RETRIES} retries")
+            return False
+
+    def tick(self):
+        try:
+            self.try_acquire()
+        except Exception as e:
+            log.error(f"Leader election error: {e}")
+            # 无法确认租约时，本地有效期到期后自动失去 leader 身份
+            if self._value is not None and time.monotonic() >= self._valid_until:
+                self._lost()
+
+    def start(self):
+        """立即尝试一次选举，然后在后台线程中定期续约或抢占"""
+        if not self.enabled or self._thread is not None:
+            return
+
+        self._stop_event.clear()
+        self.tick()
+
+        def loop():
+            while not self._stop_event.wait(self.renew_interval):
+                self.tick()
+
+        self._thread = threading.Thread(target=loop, name="leader-election", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        if self._thread is None:
+            return
+        self._stop_event.set()
+        self._thread.join(timeout=5)
+        self._thread = None
+        try:
+            self.release()
+        except Exception as e:
+            log.error(f"Failed to release leadership: {e}")
+
+
+_leader: Optional[LeaderLock] = None
+_leader_lock = threading.Lock()
+
+
+def get_leader() -> LeaderLock:
+    """获取本进程的 leader 选举实例"""
+    global _leader
+    if _leader is None:
+        with _leader_lock:
+            if _leader is None:
+                _leader = LeaderLock()
+    return _leader
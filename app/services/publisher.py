@@ -0,0 +1,241 @@
+import time
+import json
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Callable, List, Dict, Any, Optional, Tuple
+
+import redis
+
+from app.core import cache
+from app.services import snapshot_diff
+from app.services.sites.crawler import VALIDATORS_KEY
+from app.services.snapshot_store import snapshot_store
+from app.utils import codec
+from app.utils.logger import log
+
+# 版本号计数器，榜单和清单共用，保证单调递增
+VERSION_KEY = "crawler:version"
+# 带版本的平台榜单，写入后内容不再变化
+VERSIONED_NEWS_KEY = "crawler:{}:{}:v{}"
+# 当天的清单指针，值为当前清单版本
+MANIFEST_POINTER_KEY = "crawler:manifest:{}"
+# 清单内容（hash），字段为平台名称，值为该平台榜单的版本
+MANIFEST_KEY = "crawler:manifest:{}:v{}"
+# 引入版本化发布之前的榜单键，只在没有清单的日期读取
+NEWS_KEY = "crawler:{}:{}"
+# 当天榜单的内容摘要，用于跳过未变化的榜单
+DIGEST_KEY = "crawler:digest:{}:{}"
+DIGEST_EXPIRE = 2 * 24 * 3600
+
+# 已写入但未提交的榜单保留时长，提交后不再过期
+PENDING_EXPIRE = 24 * 3600
+# 被替换的榜单和清单保留时长，保证读取中的请求仍能读到完整数据
+SUPERSEDED_EXPIRE = 600
+
+# 乐观事务冲突时的最大重试次数
+MAX_TX_RETRIES = 5
+
+# API进程中已解码的版本化榜单，内容不可变，可以按键缓存
+LIST_CACHE_SIZE = 512
+_list_cache: "OrderedDict[str, List[Dict[str, Any]]]" = OrderedDict()
+_list_cache_lock = threading.Lock()
+
+
+def content_digest(payload: bytes) -> str:
+    """计算榜单内容摘要，直接对发布的序列化结果计算，不再重新序列化"""
+    return hashlib.sha1(payload).hexdigest()
+
+
+def _write_validators(pipe, platform: str, validators: Optional[Dict[str, Dict[str, str]]]):
+    if validators:
+        pipe.hset(VALIDATORS_KEY.format(platform),
+                  mapping={url: json.dumps(value) for url, value in validators.items()})
+
+
+def load_validators(platform: str) -> Dict[str, Dict[str, str]]:
+    """一次读取平台保存的全部校验信息，出错时返回空字典（本轮不发送条件请求）"""
+    try:
+        return {_to_str(url): json.loads(value)
+                for url, value in cache.get_redis_client().hgetall(VALIDATORS_KEY.format(platform)).items()}
+    except Exception as e:
+        log.warning(f"Error loading validators for {platform}: {e}")
+        return {}
+
+
+def save_validators(platform: str, validators: Optional[Dict[str, Dict[str, str]]]):
+    """保存内容未变化的榜单的校验信息，已发布的榜单与之对应，可以直接写入"""
+    if not validators:
+        return
+    try:
+        pipe = cache.get_redis_client().pipeline(transaction=False)
+        _write_validators(pipe, platform, validators)
+        pipe.execute()
+    except Exception as e:
+        log.warning(f"Error saving validators for {platform}: {e}")
+
+
+def _to_int(value) -> Optional[int]:
+    return int(value) if value is not None else None
+
+
+def _to_str(value) -> str:
+    return value.decode('utf-8') if isinstance(value, bytes) else value
+
+
+class Publication:
+    """一轮抓取的版本化发布
+
+    每个平台的榜单先写入带版本的键（读者不可见），提交时在一个 MULTI/EXEC 事务中生成
+    新的清单并切换当天的清单指针，同时写入内容摘要、快照和变化事件，读者要么看到整轮
+    的结果，要么完全看不到。写入由 fence 执行，确保只有 leader（或任务领取者）能发布。
+    """
+
+    def __init__(self, date_str: str, fence: Callable):
+        self.date_str = date_str
+        self.fence = fence
+        self._pending: Dict[str, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+
+    def publish(self, platform: str, payload: bytes, digest: str,
+                diff: Dict[str, List[Dict[str, Any]]], previous_ts: Optional[int],
+                validators: Optional[Dict[str, Dict[str, str]]] = None) -> bool:
+        """写入平台榜单的序列化结果，提交前对读者不可见；fence 拒绝写入时返回 False
+
+        payload 同时用于计算摘要、写入榜单和快照，整个发布过程只序列化一次。
+        validators 为本次抓取收到的 ETag/Last-Modified，与内容摘要在同一个提交事务中写入。
+        """
+        version = cache.get_redis_client().incr(VERSION_KEY)
+        key = VERSIONED_NEWS_KEY.format(platform, self.date_str, version)
+
+        if not self.fence(lambda pipe: pipe.set(key, payload, ex=PENDING_EXPIRE)):
+            return False
+
+        with self._lock:
+            self._pending[platform] = {
+                "version": version, "payload": payload, "digest": digest,
+                "diff": diff, "previous_ts": previous_ts, "validators": validators,
+            }
+        return True
+
+    def commit(self) -> Optional[int]:
+        """切换清单指针，返回新的清单版本；没有待发布的榜单或被 fence 拒绝时返回 None"""
+        with self._lock:
+            pending, self._pending = self._pending, {}
+        if not pending:
+            return None
+
+        client = cache.get_redis_client()
+        pointer_key = MANIFEST_POINTER_KEY.format(self.date_str)
+        for _ in range(MAX_TX_RETRIES):
+            # 读取当前清单，合并本轮更新的平台（不覆盖更新的版本）
+            current_version = _to_int(client.get(pointer_key))
+            current = {}
+            if current_version is not None:
+                current = {_to_str(k): int(v) for k, v in
+                           client.hgetall(MANIFEST_KEY.format(self.date_str, current_version)).items()}
+            updates = {platform: entry for platform, entry in pending.items()
+                       if entry["version"] > current.get(platform, 0)}
+            if not updates:
+                return current_version
+
+            manifest = {**current, **{platform: entry["version"] for platform, entry in updates.items()}}
+            version = client.incr(VERSION_KEY)
+            ts = int(time.time() * 1000)
+
+            def writes(pipe):
+                manifest_key = MANIFEST_KEY.format(self.date_str, version)
+                pipe.hset(manifest_key, mapping=manifest)
+                pipe.set(pointer_key, version)
+                if current_version is not None:
+                    pipe.expire(MANIFEST_KEY.format(self.date_str, current_version), SUPERSEDED_EXPIRE)
+
+                for platform, entry in updates.items():
+                    pipe.persist(VERSIONED_NEWS_KEY.format(platform, self.date_str, entry["version"]))
+                    if platform in current:
+                        pipe.expire(VERSIONED_NEWS_KEY.format(platform, self.date_str, current[platform]),
+                                    SUPERSEDED_EXPIRE)
+                    pipe.set(DIGEST_KEY.format(platform, self.date_str), entry["digest"], ex=DIGEST_EXPIRE)
+                    _write_validators(pipe, platform, entry["validators"])
+                    snapshot_store.append(pipe, platform, entry["payload"], ts=ts)
+                    snapshot_diff.append_event(pipe, platform, entry["diff"], ts, entry["previous_ts"])
+
+            try:
+                if not self._fenced_commit(client, pointer_key, current_version, writes):
+                    return None
+            except redis.WatchError:
+                continue
+
+            log.info(f"Published {self.date_str} manifest v{version}, "
+                     f"platforms: {', '.join(sorted(updates))}")
+            return version
+
+        log.error(f"Failed to publish {self.date_str} manifest after {MAX_TX_RETRIES} retries")
+        return None
+
+    def _fenced_commit(self, client, pointer_key: str, expected_version: Optional[int], writes) -> bool:
+        """在 fence 的事务中提交，清单指针已被其他发布者切换时抛出 WatchError
+
+        fence 开始监视指针后再校验一次，监视之前发生的切换也能发现。
+        """
+        def checked_writes(pipe):
+            if _to_int(client.get(pointer_key)) != expected_version:
+                raise redis.WatchError(pointer_key)
+            writes(pipe)
+        return self.fence(checked_writes, watch=(pointer_key,))
+
+
+def _load_list(key: str, value) -> Optional[List[Dict[str, Any]]]:
+    try:
+        news_list = codec.loads(value)
+    except ValueError as e:
+        log.error(f"Error parsing cached data for {key}: {e}")
+        return None
+
+    with _list_cache_lock:
+        _list_cache[key] = news_list
+        while len(_list_cache) > LIST_CACHE_SIZE:
+            _list_cache.popitem(last=False)
+    return news_list
+
+
+def read_news(date_str: str, platforms: List[str]) -> Tuple[int, Dict[str, List[Dict[str, Any]]]]:
+    """按当天清单读取一组平台的榜单，返回 (清单版本, {平台: 榜单})
+
+    同一版本内各平台的榜单来自同一次发布，不会读到一半新一半旧的数据。版本化榜单内容
+    不可变，解码结果在进程内缓存。清单中没有的平台（包括没有清单的日期）读取旧的榜单键，
+    没有清单时版本为 0。
+    """
+    client = cache.get_redis_client()
+    version = _to_int(client.get(MANIFEST_POINTER_KEY.format(date_str)))
+
+    list_versions = [None] * len(platforms)
+    if version is not None:
+        list_versions = client.hmget(MANIFEST_KEY.format(date_str, version), platforms)
+    # (键, 是否为版本化榜单)；迁移当天尚未重新发布的平台仍读取旧的榜单键
+    keys = [
+        (VERSIONED_NEWS_KEY.format(platform, date_str, int(list_version)), True) if list_version
+        else (NEWS_KEY.format(platform, date_str), False)
+        for platform, list_version in zip(platforms, list_versions)
+    ]
+
+    result = {}
+    missing = []
+    with _list_cache_lock:
+        for platform, (key, versioned) in zip(platforms, keys):
+            if versioned and key in _list_cache:
+                _list_cache.move_to_end(key)
+                result[platform] = _list_cache[key]
+            else:
+                missing.append((platform, key, versioned))
+
+    if missing:
+        values = client.mget([key for _, key, _ in missing])
+        for (platform, key, versioned), value in zip(missing, values):
+            if value is None:
+                continue
+            news_list = _load_list(key, value) if versioned else codec.loads(value)
+            if news_list is not None:
+                result[platform] = news_list
+
+    return version or 0, result
@@ -0,0 +1,129 @@
+"""按主机限制爬虫的出站请求
+
+每个主机一个令牌桶（按 GCRA 实现：记录下一个请求的理论到达时间），平均每秒 rate 个请求，
+允许 burst 个请求的突发；同一进程内对同一主机同时进行的请求数不超过 host_concurrency，
+同步和异步请求、不同事件循环中的请求共用同一个并发名额（只在进程内限制，不跨进程）。
+rate_limit_backend 为 redis 时令牌桶保存在 Redis 中，多个进程、多台机器共享同一个限额；
+Redis 不可用时退回进程内的令牌桶，并在 REDIS_RETRY_AFTER 秒内不再尝试连接。
+
+rate_limit_hosts 按域名后缀覆盖默认速率，匹配的子域名共用一个令牌桶，例如同一 CDN 下的多个主机。
+"""
+import time
+import asyncio
+import threading
+from contextlib import contextmanager, asynccontextmanager
+from typing import Dict, Tuple, Iterator, AsyncIterator
+from urllib.parse import urlsplit
+
+from app.core import cache
+from app.core.config import get_crawler_config
+from app.utils.logger import log
+
+# 获取爬虫配置
+crawler_config = get_crawler_config()
+
+# 各主机令牌桶下一个请求的理论到达时间（Unix 时间戳）
+RATE_LIMIT_KEY = "crawler:ratelimit:{}"
+# Redis 出错后改用进程内令牌桶的时长（秒）
+REDIS_RETRY_AFTER = 30
+# 异步请求等待并发名额的轮询间隔（秒）
+SLOT_POLL_INTERVAL = 0.05
+
+
+class RateLimiter:
+    """按主机的令牌桶和并发上限"""
+
+    def __init__(self, backend: str = None):
+        self.backend = backend or crawler_config.rate_limit_backend
+        self._lock = threading.Lock()
+        self._tat: Dict[str, float] = {}
+        # 进程内各主机的并发名额，同步请求和所有事件循环中的异步请求共用
+        self._slots: Dict[str, threading.BoundedSemaphore] = {}
+        self._redis_down_until = 0.0
+
+    @staticmethod
+    def bucket(url: str) -> Tuple[str, float, int]:
+        """返回 URL 所属的令牌桶名称、每秒请求数和突发数量"""
+        host = (urlsplit(url).hostname or "").lower()
+        for suffix, rate in crawler_config.rate_limit_hosts.items():
+            if host == suffix or host.endswith(f".{suffix}"):
+                return suffix, rate, crawler_config.rate_limit_burst
+        return host, crawler_config.rate_limit_rate, crawler_config.rate_limit_burst
+
+    def _reserve_local(self, key: str, interval: float, burst: int, now: float) -> float:
+        with self._lock:
+            tat = max(self._tat.get(key, now), now) + interval
+            self._tat[key] = tat
+        return max(tat - burst * interval - now, 0.0)
+
+    def _reserve_redis(self, key: str, interval: float, burst: int, now: float) -> float:
+        redis_key = RATE_LIMIT_KEY.format(key)
+
+        def reserve(pipe):
+            value = pipe.get(redis_key)
+            tat = max(float(value) if value else now, now) + interval
+            pipe.multi()
+            # 理论到达时间过去之后桶已经满了，记录可以过期
+            pipe.set(redis_key, f"{tat:.6f}", px=int((tat - now) * 1000) + 1000)
+            return max(tat - burst * interval - now, 0.0)
+
+        return cache.get_redis_client().transaction(reserve, redis_key, value_from_callable=True)
+
+    def _uses_redis(self) -> bool:
+        return self.backend == "redis" and time.monotonic() >= self._redis_down_until
+
+    def reserve(self, url: str) -> float:
+        """为请求取一个令牌，返回发送前需要等待的秒数"""
+        key, rate, burst = self.bucket(url)
+        if rate <= 0:
+            return 0.0
+        interval = 1.0 / rate
+        now = time.time()
+        if self._uses_redis():
+            try:
+                return self._reserve_redis(key, interval, burst, now)
+            except Exception as e:
+                # 一段时间内不再连接 Redis，避免每个请求都等待连接超时
+                self._redis_down_until = time.monotonic() + REDIS_RETRY_AFTER
+                log.warning(f"Rate limiter falling back to local buckets for {REDIS_RETRY_AFTER}s: {e}")
+        return self._reserve_local(key, interval, burst, now)
+
+    def _slot(self, key: str) -> threading.BoundedSemaphore:
+        with self._lock:
+            if key not in self._slots:
+                self._slots[key] = threading.BoundedSemaphore(crawler_config.host_concurrency)
+            return self._slots[key]
+
+    async def acquire(self, url: str):
+        """异步等待一个令牌，不占用并发名额；Redis 令牌桶在线程中访问，不阻塞事件循环"""
+        if self._uses_redis():
+            delay = await asyncio.to_thread(self.reserve, url)
+        else:
+            delay = self.reserve(url)
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+    @asynccontextmanager
+    async def limit(self, url: str) -> AsyncIterator[None]:
+        """异步请求：占用主机的并发名额并等到有令牌后发送"""
+        slot = self._slot(self.bucket(url)[0])
+        # 名额与同步请求、其他事件循环共用，不能用 asyncio.Semaphore，非阻塞地轮询
+        while not slot.acquire(blocking=False):
+            await asyncio.sleep(SLOT_POLL_INTERVAL)
+        try:
+            await self.acquire(url)
+            yield
+        finally:
+            slot.release()
+
+    @contextmanager
+    def limit_sync(self, url: str) -> Iterator[None]:
+        """同步请求：占用主机的并发名额并等到有令牌后发送"""
+        with self._slot(self.bucket(url)[0]):
+            delay = self.reserve(url)
+            if delay > 0:
+                time.sleep(delay)
+            yield
+
+
+rate_limiter = RateLimiter()
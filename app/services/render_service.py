@@ -0,0 +1,187 @@
+"""页面渲染服务
+
+需要执行 JavaScript 的爬虫通过渲染器打开页面，取回页面源码或按抽取规则得到的行，不直接持有浏览器。
+渲染器有三种实现：
+    LocalRenderer  在当前进程中使用 BrowserManager（crawler.render_mode 为 local）
+    RenderClient   调用独立的渲染服务进程（crawler.render_mode 为 service，见 render.py）
+    StubRenderer   返回预先准备的结果，用于离线测试
+
+渲染服务是一个只监听本地地址的 HTTP 服务：
+    POST /render   请求体为渲染任务（BrowserManager.render 的参数），返回 {"url", "html"} 或 {"url", "rows"}
+    GET  /health   返回浏览器池状态
+Chrome 崩溃或内存暴涨只影响渲染服务进程，可以独立扩缩容和重启。
+"""
+import json
+import signal
+import threading
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from typing import Dict, Any, Optional, List
+from urllib.parse import urlsplit
+
+import requests
+
+from app.core.config import get_crawler_config
+from app.utils.logger import log
+
+# 获取爬虫配置
+crawler_config = get_crawler_config()
+
+# 渲染任务的字段，与 BrowserManager.render 的参数一致
+JOB_FIELDS = ("url", "wait_for", "wait_script", "network_idle", "max_wait", "allow",
+              "click", "after_click", "extract")
+
+
+class RenderError(Exception):
+    """渲染失败"""
+    pass
+
+
+class LocalRenderer:
+    """在当前进程中使用浏览器池渲染"""
+
+    def render(self, url: str, **job) -> Dict[str, Any]:
+        # 按需导入 selenium，仅提供API的进程不需要加载浏览器依赖
+        from app.services.browser_manager import BrowserManager
+        return BrowserManager().render(url, **job)
+
+    def health(self) -> Dict[str, Any]:
+        from app.services.browser_manager import BrowserManager
+        if BrowserManager._instance is None:
+            return {"status": "ok", "browsers": None}
+        return {"status": "ok", "browsers": BrowserManager().stats()}
+
+
+class RenderClient:
+    """调用独立渲染服务的渲染器"""
+
+    def __init__(self, base_url: Optional[str] = None, timeout: Optional[float] = None):
+        self.base_url = (base_url or crawler_config.render_url).rstrip("/")
+        self.timeout = crawler_config.render_timeout if timeout is None else timeout
+        self.session = requests.Session()
+
+    def render(self, url: str, **job) -> Dict[str, Any]:
+        try:
+            response = self.session.post(f"{self.base_url}/render", json={"url": url, **job},
+                                         timeout=self.timeout)
+        except requests.RequestException as e:
+            raise RenderError(f"render service unavailable: {e}") from e
+        if response.status_code != 200:
+            raise RenderError(f"render {url} failed, status: {response.status_code}, {response.text[:200]}")
+        return response.json()
+
+    def health(self) -> Dict[str, Any]:
+        response = self.session.get(f"{self.base_url}/health", timeout=self.timeout)
+        response.raise_for_status()
+        return response.json()
+
+
+class StubRenderer:
+    """离线测试用的渲染器，按URL返回预先准备的结果，并记录收到的渲染任务"""
+
+    def __init__(self, pages: Optional[Dict[str, Dict[str, Any]]] = None):
+        self.pages = pages or {}
+        self.jobs: List[Dict[str, Any]] = []
+
+    def render(self, url: str, **job) -> Dict[str, Any]:
+        self.jobs.append({"url": url, **job})
+        if url not in self.pages:
+            raise RenderError(f"no stub page for {url}")
+        return {"url": url, **self.pages[url]}
+
+    def health(self) -> Dict[str, Any]:
+        return {"status": "ok", "browsers": None}
+
+
+# 爬虫使用的渲染器，None 表示按配置创建
+_renderer = None
+
+
+def set_renderer(renderer):
+    """替换爬虫使用的渲染器（测试中使用 StubRenderer），None 恢复按配置创建"""
+    global _renderer
+    _renderer = renderer
+
+
+def get_renderer():
+    global _renderer
+    if _renderer is None:
+        _renderer = RenderClient() if crawler_config.render_mode == "service" else LocalRenderer()
+    return _renderer
+
+
+class _RenderHandler(BaseHTTPRequestHandler):
+    server: "RenderServer"
+
+    def _send_json(self, status: int, payload: Dict[str, Any]):
+        body = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        if self.path != "/health":
+            self._send_json(404, {"error": "not found"})
+            return
+        self._send_json(200, self.server.renderer.health())
+
+    def do_POST(self):
+        if self.path != "/render":
+            self._send_json(404, {"error": "not found"})
+            return
+        try:
+            job = json.loads(self.rfile.read(int(self.headers.get("Content-Length") or 0)))
+            if not isinstance(job, dict) or not job.get("url"):
+                raise ValueError("url is required")
+            job = {key: value for key, value in job.items() if key in JOB_FIELDS}
+        except ValueError as e:
+            self._send_json(400, {"error": str(e)})
+            return
+
+        try:
+            self._send_json(200, self.server.renderer.render(**job))
+        except Exception as e:
+            # 等待空闲浏览器超时时返回 503，调用方可以稍后重试
+            status = 503 if type(e).__name__ == "BrowserPoolTimeout" else 500
+            log.error(f"Render {job['url']} failed: {e}")
+            self._send_json(status, {"error": str(e)})
+
+    def log_message(self, format, *args):
+        log.debug(f"Render service {self.address_string()} {format % args}")
+
+
+class RenderServer(ThreadingHTTPServer):
+    """渲染服务，每个请求一个线程，并发数由浏览器池大小限制"""
+
+    daemon_threads = True
+
+    def __init__(self, address, renderer=None):
+        super().__init__(address, _RenderHandler)
+        self.renderer = renderer or LocalRenderer()
+
+
+def run_render_server(host: Optional[str] = None, port: Optional[int] = None):
+    """启动渲染服务，收到 SIGINT/SIGTERM 后关闭浏览器并退出"""
+    parts = urlsplit(crawler_config.render_url)
+    server = RenderServer((host or parts.hostname or "127.0.0.1", port or parts.port or 8790))
+
+    def handle_signal(signum, frame):
+        log.info(f"Received signal {signum}, stopping render service")
+        # shutdown 会等待 serve_forever 退出，不能在同一线程中调用
+        threading.Thread(target=server.shutdown, daemon=True).start()
+
+    signal.signal(signal.SIGINT, handle_signal)
+    signal.signal(signal.SIGTERM, handle_signal)
+
+    from app.services.browser_manager import BrowserManager
+    browser_manager = BrowserManager()
+    browser_manager.prewarm()
+
+    log.info(f"Render service listening on {server.server_address[0]}:{server.server_address[1]}")
+    try:
+        server.serve_forever()
+    finally:
+        server.server_close()
+        browser_manager.shutdown()
+        log.info("Render service shutdown")
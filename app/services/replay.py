@@ -0,0 +1,199 @@
+"""抓取请求的录制与回放
+
+录制时请求照常访问网络，同时把响应保存到 fixture 文件；回放时按请求方法和URL从 fixture
+返回响应，不访问网络。同时覆盖异步爬虫的共享 httpx 客户端和同步爬虫使用的 requests。
+
+fixture 为 JSON 文件，每个请求一条记录：
+    {"method": "GET", "url": "...", "status": 200, "headers": {...}, "json": {...}}
+响应体按内容类型保存为 "json"、"text"（附带 "encoding"），或用 "body_file" 引用
+fixture 目录下的 UTF-8 文件（相对路径，同样按 "encoding" 编码后返回）。
+"""
+import os
+import json
+from contextlib import contextmanager
+from typing import List, Dict, Any, Optional, Iterator, Union
+from urllib.parse import urlsplit
+
+import httpx
+import requests
+from requests.adapters import BaseAdapter, HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+
+from app.services import http_client
+from app.utils.logger import log
+
+
+class ReplayMiss(Exception):
+    """回放时没有找到匹配的录制记录"""
+    pass
+
+
+def _path_key(method: str, url: str) -> str:
+    parts = urlsplit(url)
+    return f"{method.upper()} {parts.scheme}://{parts.netloc}{parts.path or '/'}"
+
+
+class Cassette:
+    """一组录制的请求和响应"""
+
+    def __init__(self, exchanges: Optional[List[Dict[str, Any]]] = None, base_dir: str = "."):
+        self.exchanges = exchanges or []
+        self.base_dir = base_dir
+
+    @classmethod
+    def load(cls, *paths: str) -> "Cassette":
+        """读取一个或多个 fixture 文件，合并为一个 Cassette"""
+        exchanges = []
+        for path in paths:
+            with open(path, encoding="utf-8") as f:
+                exchanges.extend(json.load(f)["exchanges"])
+        return cls(exchanges, os.path.dirname(os.path.abspath(paths[0])) if paths else ".")
+
+    def save(self, path: str, **meta):
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump({**meta, "exchanges": self.exchanges}, f, ensure_ascii=False, indent=2)
+
+    def find(self, method: str, url: str) -> Dict[str, Any]:
+        """按方法和URL查找记录，查询参数不一致（例如带时间戳）时退回只比较路径"""
+        candidates = [e for e in self.exchanges if _path_key(e["method"], e["url"]) == _path_key(method, url)]
+        if not candidates:
+            raise ReplayMiss(f"{method} {url}")
+        query = urlsplit(url).query
+        for exchange in candidates:
+            if urlsplit(exchange["url"]).query == query:
+                return exchange
+        return candidates[0]
+
+    def body(self, exchange: Dict[str, Any]) -> bytes:
+        if "body_file" in exchange:
+            # 引用的文件以 UTF-8 保存，按记录的编码还原为服务器返回的字节
+            with open(os.path.join(self.base_dir, exchange["body_file"]), encoding="utf-8") as f:
+                return f.read().encode(exchange.get("encoding") or "utf-8")
+        if "json" in exchange:
+            return json.dumps(exchange["json"], ensure_ascii=False).encode("utf-8")
+        return exchange.get("text", "").encode(exchange.get("encoding") or "utf-8")
+
+    def headers(self, exchange: Dict[str, Any]) -> Dict[str, str]:
+        headers = dict(exchange.get("headers") or {})
+        if "json" in exchange:
+            headers.setdefault("Content-Type", "application/json; charset=utf-8")
+        return headers
+
+    def record(self, method: str, url: str, status: int, headers, content: bytes, encoding: Optional[str]):
+        content_type = headers.get("Content-Type", "")
+        exchange = {"method": method.upper(), "url": url, "status": status,
+                    "headers": {"Content-Type": content_type} if content_type else {}}
+        try:
+            if "json" in content_type:
+                exchange["json"] = json.loads(content)
+            else:
+                exchange["encoding"] = encoding or "utf-8"
+                exchange["text"] = content.decode(exchange["encoding"])
+        except (ValueError, LookupError):
+            exchange["encoding"] = "latin-1"
+            exchange["text"] = content.decode("latin-1")
+        self.exchanges.append(exchange)
+
+
+class ReplayTransport(httpx.AsyncBaseTransport):
+    """httpx 回放传输"""
+
+    def __init__(self, cassette: Cassette):
+        self.cassette = cassette
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        exchange = self.cassette.find(request.method, str(request.url))
+        return httpx.Response(exchange["status"], headers=self.cassette.headers(exchange),
+                              content=self.cassette.body(exchange), request=request)
+
+
+class RecordingTransport(httpx.AsyncBaseTransport):
+    """httpx 录制传输，请求实际发出"""
+
+    def __init__(self, cassette: Cassette):
+        self.cassette = cassette
+        self._transport = httpx.AsyncHTTPTransport(verify=False, http2=http_client.HTTP2_ENABLED)
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        response = await self._transport.handle_async_request(request)
+        content = await response.aread()
+        self.cassette.record(request.method, str(request.url), response.status_code,
+                             response.headers, content, response.charset_encoding)
+        return httpx.Response(response.status_code, headers=response.headers, content=content,
+                              request=request, extensions=response.extensions)
+
+    async def aclose(self):
+        await self._transport.aclose()
+
+
+class ReplayAdapter(BaseAdapter):
+    """requests 回放适配器"""
+
+    def __init__(self, cassette: Cassette):
+        super().__init__()
+        self.cassette = cassette
+
+    def send(self, request, **kwargs):
+        exchange = self.cassette.find(request.method, request.url)
+        response = requests.Response()
+        response.status_code = exchange["status"]
+        response.headers = CaseInsensitiveDict(self.cassette.headers(exchange))
+        response._content = self.cassette.body(exchange)
+        response.encoding = exchange.get("encoding") or requests.utils.get_encoding_from_headers(response.headers)
+        response.url = request.url
+        response.request = request
+        return response
+
+    def close(self):
+        pass
+
+
+class RecordingAdapter(HTTPAdapter):
+    """requests 录制适配器，请求实际发出"""
+
+    def __init__(self, cassette: Cassette):
+        super().__init__()
+        self.cassette = cassette
+
+    def send(self, request, **kwargs):
+        response = super().send(request, **kwargs)
+        self.cassette.record(request.method, request.url, response.status_code, response.headers,
+                             response.content, response.encoding)
+        return response
+
+
+@contextmanager
+def _install(transport: httpx.AsyncBaseTransport, adapter: BaseAdapter) -> Iterator[None]:
+    original_get_adapter = requests.Session.get_adapter
+    http_client.set_transport(transport)
+    requests.Session.get_adapter = lambda session, url: adapter
+    try:
+        yield
+    finally:
+        requests.Session.get_adapter = original_get_adapter
+        http_client.set_transport(None)
+
+
+@contextmanager
+def replay(cassette: Union[Cassette, str]) -> Iterator[Cassette]:
+    """在上下文内所有 HTTP 请求都从 fixture 返回
+
+    共享客户端在首次请求时创建，进入上下文前已创建的客户端不受影响。
+    """
+    if isinstance(cassette, str):
+        cassette = Cassette.load(cassette)
+    with _install(ReplayTransport(cassette), ReplayAdapter(cassette)):
+        yield cassette
+
+
+@contextmanager
+def record(path: str, **meta) -> Iterator[Cassette]:
+    """在上下文内访问网络，结束时把所有请求和响应保存到 path"""
+    cassette = Cassette()
+    try:
+        with _install(RecordingTransport(cassette), RecordingAdapter(cassette)):
+            yield cassette
+    finally:
+        cassette.save(path, **meta)
+        log.info(f"Recorded {len(cassette.exchanges)} requests to {path}")
@@ -0,0 +1,35 @@
+from apscheduler.schedulers.background import BackgroundScheduler
+from apscheduler.executors.pool import ThreadPoolExecutor
+from apscheduler.jobstores.memory import MemoryJobStore
+import pytz
+
+from app.core.config import get_scheduler_config
+
+# 获取调度器配置
+scheduler_config = get_scheduler_config()
+
+# 配置调度器
+jobstores = {
+    'default': MemoryJobStore()
+}
+
+# 同步爬虫由 worker_pool 中的受监管进程执行（进程数为 process_pool_size），
+# 调度器本身只需要线程池
+executors = {
+    'default': ThreadPoolExecutor(scheduler_config.thread_pool_size),
+}
+
+job_defaults = {
+    'coalesce': scheduler_config.coalesce,
+    'max_instances': scheduler_config.max_instances,
+    'misfire_grace_time': scheduler_config.misfire_grace_time,
+}
+
+# 创建并配置调度器，注册完任务后在 app.services.crawler 中启动；
+# 只有爬虫 worker（或 all 模式下的API进程）会导入本模块
+_scheduler = BackgroundScheduler(
+    jobstores=jobstores,
+    executors=executors,
+    job_defaults=job_defaults,
+    timezone=pytz.timezone(scheduler_config.timezone)
+)
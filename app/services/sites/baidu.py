@@ -1,26 +1,25 @@
-import json
 import datetime
 
 import requests
 import urllib3
-from bs4 import BeautifulSoup
+from bs4 import SoupStrainer
 
-from .crawler import Crawler
-from ...core import cache
+from .crawler import AsyncCrawler, parse_html
+from ..rate_limiter import rate_limiter
 from ...db.mysql import News
 
 urllib3.disable_warnings()
 
 
-class BaiduNewsCrawler(Crawler):
+class BaiduNewsCrawler(AsyncCrawler):
     # 返回news_list
-    def fetch(self, date_str) -> list:
+    async def fetch(self, date_str) -> list:
         # 获取当前时间
         current_time = datetime.datetime.now()
         
         url = "https://top.baidu.com/api/board?platform=wise&tab=realtime"
 
-        resp = requests.get(url=url, params=self.header, verify=False, timeout=self.timeout)
+        resp = await self.get(url=url, params=self.header)
         if resp.status_code != 200:
             print(f"request failed, status: {resp.status_code}")
             return []
@@ -28,7 +27,6 @@ class BaiduNewsCrawler(Crawler):
         json_data = resp.json()
         contents = json_data.get("data")["cards"][0]["content"][0]["content"]
         result = []
-        cache_list = []
         for content in contents:
             title = content.get("word")
             url = content.get("url")
@@ -42,12 +40,11 @@ class BaiduNewsCrawler(Crawler):
                 'url': url,
                 'content': desc,
                 'source': 'baidu',
-                'publish_time': current_time.strftime('%Y-%m-%d %H:%M:%S')  # 使用格式化的时间字符串
+                'publish_time': current_time.strftime('%Y-%m-%d %H:%M:%S'),  # 使用格式化的时间字符串
+                'score': score
             }
             result.append(news)
-            cache_list.append(news)  # 直接添加字典，json.dumps会在后面处理整个列表
 
-        cache.hset(date_str, self.crawler_name(), json.dumps(cache_list, ensure_ascii=False))
         return result
 
     def crawler_name(self):
@@ -72,10 +69,11 @@ class BaiduNewsCrawler(Crawler):
             "user-agent": "Mozilla/5.0 (Windows NT 10.0; WOW64) AppleWebKit/537.36 (KHTML, like Gecko) "
                           "Chrome/86.0.4240.183 Safari/537.36"
         }
-        html = requests.get(url=url, params=header, verify=False, proxies=proxies)
+        with rate_limiter.limit_sync(url):
+            html = requests.get(url=url, params=header, verify=False, proxies=proxies, timeout=10)
         html.encoding = "utf-8"
         html_text = html.text
-        soup = BeautifulSoup(html_text, "html.parser")
+        soup = parse_html(html_text, SoupStrainer("main"))
         main_content = soup.find_all("main")[0]
         news_main_content = main_content.find("div", style='margin-bottom:20px')
 
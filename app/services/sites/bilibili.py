@@ -1,19 +1,12 @@
-import json
 import datetime
 
-import requests
-import urllib3
-
-from .crawler import Crawler
-from ...core import cache
+from .crawler import AsyncCrawler
 from ...db.mysql import News
 
-urllib3.disable_warnings()
-
 
-class BilibiliCrawler(Crawler):
+class BilibiliCrawler(AsyncCrawler):
 
-    def fetch(self, date_str):
+    async def fetch(self, date_str):
         current_time = datetime.datetime.now()
 
         url = "https://api.bilibili.com/x/web-interface/popular"
@@ -27,7 +20,7 @@ class BilibiliCrawler(Crawler):
             "Referer": "https://www.bilibili.com/",
         }
 
-        resp = requests.get(url=url, headers=headers, verify=False, timeout=self.timeout)
+        resp = await self.get(url=url, headers=headers)
         if resp.status_code != 200:
             print(f"request failed, status: {resp.status_code}")
             return []
@@ -38,7 +31,6 @@ class BilibiliCrawler(Crawler):
             return []
 
         result = []
-        cache_list = []
 
         for item in data["data"].get("list", []):
             title = item.get("title", "")
@@ -55,9 +47,7 @@ class BilibiliCrawler(Crawler):
             }
 
             result.append(news)
-            cache_list.append(news)
 
-        cache.hset(date_str, self.crawler_name(), json.dumps(cache_list, ensure_ascii=False))
         return result
 
     def crawler_name(self):
@@ -1,18 +1,12 @@
-import json
 import datetime
-import requests
-import urllib3
 
-from .crawler import Crawler
-from ...core import cache
+from .crawler import AsyncCrawler, NotModified
 
-urllib3.disable_warnings()
 
-
-class CLSCrawler(Crawler):
+class CLSCrawler(AsyncCrawler):
     """财联社"""
     
-    def fetch(self, date_str) -> list:
+    async def fetch(self, date_str) -> list:
         current_time = datetime.datetime.now()
         
         try:
@@ -31,12 +25,10 @@ class CLSCrawler(Crawler):
                 'Origin': 'https://www.cls.cn'
             }
             
-            response = requests.get(
+            response = await self.get(
                 "https://www.cls.cn/featured/v1/column/list",
                 params=params,
-                headers=headers,
-                timeout=self.timeout,
-                verify=False
+                headers=headers
             )
             response.raise_for_status()
             
@@ -47,7 +39,6 @@ class CLSCrawler(Crawler):
             column_list = data.get('data', {}).get('column_list', [])
             
             result = []
-            cache_list = []
             
             for idx, column in enumerate(column_list[:20]):
                 try:
@@ -85,14 +76,13 @@ class CLSCrawler(Crawler):
                     }
                     
                     result.append(news)
-                    cache_list.append(news)
                     
                 except Exception:
                     continue
             
-            if cache_list:
-                cache.hset(date_str, self.crawler_name(), json.dumps(cache_list, ensure_ascii=False))
             return result
+        except NotModified:
+            raise
         except Exception as e:
             return []
 
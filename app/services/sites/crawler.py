@@ -1,7 +1,69 @@
+import time
+import asyncio
 from abc import ABC, abstractmethod
-from typing import List, Dict, Any
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from contextvars import ContextVar
+from typing import List, Dict, Any, Optional, Tuple, Callable
+
+import httpx
+import requests
+from bs4 import BeautifulSoup, SoupStrainer
+
+from .. import http_client, strategy_stats, latency_stats
+from ..rate_limiter import rate_limiter
+from ..render_service import get_renderer
+from ...core.config import get_crawler_config
+from ...utils.logger import log
+
+# 获取爬虫配置
+crawler_config = get_crawler_config()
+
+# 各平台缓存的 ETag/Last-Modified（hash），字段为请求URL
+VALIDATORS_KEY = "crawler:validators:{}"
+
+# 当前爬取任务是否发送条件请求；只有当天已有数据时才允许，否则304会导致当天没有数据
+conditional_fetch: ContextVar[bool] = ContextVar("conditional_fetch", default=False)
+
+# 当前爬取任务的校验信息 {URL: {"etag", "last_modified"}}：抓取开始时一次性载入平台已保存的校验信息，
+# 请求时直接读取，收到的新校验信息也写在这里；榜单发布提交时才写入 VALIDATORS_KEY，
+# 解析、校验或发布失败时不保存，下一轮仍完整抓取，不会因为304而错过没有发布成功的榜单
+fetched_validators: ContextVar[Optional[Dict[str, Dict[str, str]]]] = ContextVar("fetched_validators", default=None)
+
+
+
+def _resolve_parser(name: str) -> str:
+    """未安装 lxml 时退回标准库的 html.parser"""
+    if name == "lxml":
+        try:
+            import lxml  # noqa: F401
+        except ImportError:
+            log.warning("lxml is not installed, falling back to html.parser")
+            return "html.parser"
+    return name
+
+
+# HTML 解析器，默认使用 C 实现的 lxml
+HTML_PARSER = _resolve_parser(crawler_config.html_parser)
+
+
+def parse_html(html: str, parse_only: Optional[SoupStrainer] = None) -> BeautifulSoup:
+    """解析 HTML，parse_only 只保留需要的子树，其余节点在解析时直接丢弃"""
+    return BeautifulSoup(html, HTML_PARSER, parse_only=parse_only)
+
+
+class NotModified(Exception):
+    """上游返回304，榜单自上次抓取后未变化"""
+    pass
+
 
 class Crawler(ABC):
+    # HTML 爬虫只需要解析的子树，None 表示解析整个页面
+    parse_only: Optional[SoupStrainer] = None
+    # 每次抓取都要使用浏览器，抓取周期开始前会预热浏览器实例
+    uses_browser: bool = False
+    # 使用浏览器时不拦截的资源类别，见 browser_manager.BLOCKABLE_RESOURCES
+    browser_allow: Tuple[str, ...] = ()
+
     def __init__(self):
         self.header = {
             "accept": "text/html,application/xhtml+xml,application/xml;q=0.9,image/avif,image/webp,image/apng,"
@@ -11,13 +73,196 @@ class Crawler(ABC):
                           "Chrome/86.0.4240.183 Safari/537.36"
         }
         self.timeout = 10
-    
+
     @abstractmethod
     def fetch(self, date_str: str) -> List[Dict[str, Any]]:
         """获取新闻列表"""
         pass
-    
+
     @abstractmethod
     def crawler_name(self) -> str:
         """获取爬虫名称"""
         pass
+
+    def parse_html(self, html: str) -> BeautifulSoup:
+        return parse_html(html, self.parse_only)
+
+    def parse(self, html: str) -> List[Dict[str, Any]]:
+        """解析榜单页面，HTML 爬虫实现，与请求分开便于基准测试"""
+        raise NotImplementedError(f"{self.crawler_name()} does not parse HTML pages")
+
+    def race(self, strategies: List[Tuple[str, Callable[[], List[Dict[str, Any]]]]],
+             hedge_delay: Optional[float] = None, timeout: Optional[float] = None) -> List[Dict[str, Any]]:
+        """按顺序对冲执行多个抓取策略，返回第一个非空结果，都失败时返回空列表
+
+        先启动第一个策略，每过 hedge_delay 秒（默认 crawler.strategy_hedge_delay，为 0 时全部同时启动）
+        或正在执行的策略失败、返回空结果时启动下一个。得到结果后不再启动剩余策略；已在执行的策略
+        无法中断，其结果被丢弃。每个策略的执行次数、胜出次数和耗时记录在 strategy_stats 中。
+        """
+        hedge_delay = crawler_config.strategy_hedge_delay if hedge_delay is None else hedge_delay
+        timeout = crawler_config.crawler_timeout if timeout is None else timeout
+        deadline = time.monotonic() + timeout
+        executor = ThreadPoolExecutor(max_workers=len(strategies), thread_name_prefix=f"{self.crawler_name()}-race")
+        pending = {}
+        attempts = {}
+        winner, result = None, []
+
+        def launch():
+            name, func = strategies[len(attempts)]
+            attempts[name] = None
+            pending[executor.submit(func)] = (name, time.monotonic())
+
+        try:
+            launch()
+            while pending or len(attempts) < len(strategies):
+                if not pending:
+                    launch()
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                if len(attempts) < len(strategies):
+                    remaining = min(remaining, hedge_delay)
+                done, _ = wait(pending, timeout=remaining, return_when=FIRST_COMPLETED)
+                if not done:
+                    # 当前策略迟迟没有结果，对冲启动下一个
+                    if len(attempts) < len(strategies):
+                        launch()
+                    continue
+
+                for future in done:
+                    name, started = pending.pop(future)
+                    attempts[name] = time.monotonic() - started
+                    try:
+                        news_list = future.result()
+                    except Exception as e:
+                        log.warning(f"{self.crawler_name()} strategy {name} failed: {e}")
+                        news_list = None
+                    if news_list and winner is None:
+                        winner, result = name, news_list
+                if winner is not None:
+                    break
+                # 策略失败或结果为空，立即启动下一个
+                if len(attempts) < len(strategies):
+                    launch()
+        finally:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+        for name, latency in attempts.items():
+            strategy_stats.record_attempt(self.crawler_name(), name, name == winner, latency)
+        if winner is not None:
+            log.info(f"{self.crawler_name()} strategy {winner} won in {attempts[winner]:.2f}s, "
+                     f"started {len(attempts)}/{len(strategies)}")
+        else:
+            log.warning(f"{self.crawler_name()} all {len(attempts)} started strategies returned nothing")
+        return result
+
+    def sync_get(self, url: str, session: Optional[requests.Session] = None, **kwargs) -> requests.Response:
+        """同步爬虫的 GET 请求，与异步爬虫一样按主机限速，未指定超时时使用爬虫的超时"""
+        kwargs.setdefault("timeout", self.timeout)
+        with rate_limiter.limit_sync(url):
+            return (session or requests).get(url, **kwargs)
+
+    def render(self, url: str, **job) -> Dict[str, Any]:
+        """用浏览器打开页面，job 为渲染任务参数（见 BrowserManager.render），自动带上本爬虫放行的资源类别"""
+        return get_renderer().render(url, allow=list(self.browser_allow), **job)
+
+
+class AsyncCrawler(Crawler):
+    """异步爬虫基类，所有请求走共享的连接池客户端"""
+
+    @abstractmethod
+    async def fetch(self, date_str: str) -> List[Dict[str, Any]]:
+        """异步获取新闻列表"""
+        pass
+
+    def fetch_sync(self, date_str: str) -> List[Dict[str, Any]]:
+        """在独立事件循环中执行 fetch，供脚本和测试直接调用"""
+        async def run():
+            try:
+                return await self.fetch(date_str)
+            finally:
+                await http_client.close_client()
+
+        return asyncio.run(run())
+
+    async def request(self, method: str, url: str, **kwargs) -> httpx.Response:
+        """通过共享客户端发送请求，GET请求会带上上次保存的校验信息
+
+        未指定超时时按平台的历史耗时确定超时；GET请求超过平台的 p95 耗时仍未返回时发送一次对冲请求。
+        """
+        platform = self.crawler_name()
+        profile = latency_stats.get_profile(platform)
+        kwargs.setdefault("timeout", profile.timeout(self.timeout))
+        client = http_client.get_client()
+        request = client.build_request(method, url, **kwargs)
+
+        conditional = method == "GET" and conditional_fetch.get()
+        if conditional:
+            validators = (fetched_validators.get() or {}).get(str(request.url), {})
+            if validators.get("etag"):
+                request.headers["If-None-Match"] = validators["etag"]
+            if validators.get("last_modified"):
+                request.headers["If-Modified-Since"] = validators["last_modified"]
+
+        async with rate_limiter.limit(str(request.url)):
+            # 从拿到令牌开始计时，限速等待不计入耗时分布
+            start = time.monotonic()
+            try:
+                response = await self._send(client, request, profile.hedge_delay() if method == "GET" else None)
+            except httpx.TimeoutException:
+                # 超时也计入耗时分布，持续变慢的站点超时会随之放宽
+                latency_stats.record_latency(platform, time.monotonic() - start)
+                raise
+        latency_stats.record_latency(platform, time.monotonic() - start)
+        if conditional and response.status_code == 304:
+            raise NotModified(str(request.url))
+        if method == "GET" and response.status_code == 200:
+            self._collect_validators(str(request.url), response)
+        return response
+
+    async def _send(self, client: httpx.AsyncClient, request: httpx.Request,
+                    hedge_delay: Optional[float]) -> httpx.Response:
+        """发送请求，超过 hedge_delay 秒仍未返回时再发送一个相同的请求，取先成功的响应并取消另一个"""
+        if hedge_delay is None:
+            return await client.send(request)
+
+        tasks = [asyncio.ensure_future(client.send(request))]
+        try:
+            done, _ = await asyncio.wait(tasks, timeout=hedge_delay)
+            if done:
+                return tasks[0].result()
+
+            log.debug(f"{self.crawler_name()} request {request.url} exceeded p95 {hedge_delay:.2f}s, hedging")
+            # 对冲请求同样消耗主机的令牌，沿用原请求占用的并发名额
+            await rate_limiter.acquire(str(request.url))
+            hedge = httpx.Request(request.method, request.url, headers=request.headers,
+                                  extensions=request.extensions)
+            tasks.append(asyncio.ensure_future(client.send(hedge)))
+            pending = set(tasks)
+            error = None
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is None:
+                        return task.result()
+                    error = error or task.exception()
+            raise error
+        finally:
+            for task in tasks:
+                if not task.done():
+                    task.cancel()
+
+    async def get(self, url: str, **kwargs) -> httpx.Response:
+        return await self.request("GET", url, **kwargs)
+
+    async def post(self, url: str, **kwargs) -> httpx.Response:
+        return await self.request("POST", url, **kwargs)
+
+    @staticmethod
+    def _collect_validators(url: str, response: httpx.Response):
+        etag = response.headers.get("ETag")
+        last_modified = response.headers.get("Last-Modified")
+        collected = fetched_validators.get()
+        if collected is None or (not etag and not last_modified):
+            return
+        collected[url] = {"etag": etag, "last_modified": last_modified}
@@ -1,11 +1,8 @@
-import json
 import re
 import datetime
 
-import requests
 import urllib3
-from bs4 import BeautifulSoup
-from ...core import cache
+from bs4 import SoupStrainer
 from .crawler import Crawler
 
 urllib3.disable_warnings()
@@ -14,9 +11,9 @@ urllib3.disable_warnings()
 class DouBanCrawler(Crawler):
     """豆瓣网"""
 
+    parse_only = SoupStrainer('div', class_='channel-item')
+
     def fetch(self, date_str):
-        current_time = datetime.datetime.now()
-        
         url = "https://www.douban.com/group/explore"
 
         header = self.header.copy()
@@ -33,18 +30,20 @@ class DouBanCrawler(Crawler):
             "upgrade-insecure-requests": "1",
         })
 
-        resp = requests.get(url=url, headers=header, verify=False, timeout=self.timeout)
+        resp = self.sync_get(url, headers=header, verify=False)
         if resp.status_code != 200:
             print(f"request failed, status: {resp.status_code}")
             return []
             
-        html_text = resp.text
-        soup = BeautifulSoup(html_text, "html.parser")
+        return self.parse(resp.text)
+
+    def parse(self, html_text):
+        current_time = datetime.datetime.now()
+        soup = self.parse_html(html_text)
         
         topic_list = soup.find_all('div', class_='channel-item')
         
         result = []
-        cache_list = []
         
         for topic in topic_list:
             title_elem = topic.find('h3')
@@ -70,9 +69,7 @@ class DouBanCrawler(Crawler):
             }
             
             result.append(news)
-            cache_list.append(news)
             
-        cache.hset(date_str, self.crawler_name(), json.dumps(cache_list, ensure_ascii=False))
         return result
 
     def crawler_name(self):
@@ -1,18 +1,12 @@
-import json
 import datetime
-import requests
-import urllib3
 
-from .crawler import Crawler
-from ...core import cache
+from .crawler import AsyncCrawler, NotModified
 
-urllib3.disable_warnings()
 
-
-class EastMoneyCrawler(Crawler):
+class EastMoneyCrawler(AsyncCrawler):
     """东方财富网"""
 
-    def fetch(self, date_str) -> list:
+    async def fetch(self, date_str) -> list:
         current_time = datetime.datetime.now()
 
         try:
@@ -33,12 +27,10 @@ class EastMoneyCrawler(Crawler):
                 'Origin': 'https://kuaixun.eastmoney.com'
             }
             
-            response = requests.get(
+            response = await self.get(
                 "https://np-weblist.eastmoney.com/comm/web/getFastNewsList",
                 params=params,
-                headers=headers,
-                timeout=self.timeout,
-                verify=False
+                headers=headers
             )
             response.raise_for_status()
             
@@ -48,7 +40,6 @@ class EastMoneyCrawler(Crawler):
             fast_news_list = data.get('data', {}).get('fastNewsList', [])
             
             result = []
-            cache_list = []
             
             for idx, news_item in enumerate(fast_news_list[:20]):  # 取前20条
                 try:
@@ -72,15 +63,14 @@ class EastMoneyCrawler(Crawler):
                     }
                     
                     result.append(news)
-                    cache_list.append(news)
                     
                 except Exception:
                     continue
             
-            if cache_list:
-                cache.hset(date_str, self.crawler_name(), json.dumps(cache_list, ensure_ascii=False))
             return result
             
+        except NotModified:
+            raise
         except Exception as e:
             return []
 
@@ -1,64 +1,111 @@
-from typing import Dict, Type
+import threading
+from collections.abc import Mapping
+from importlib import import_module
+from importlib.metadata import entry_points
+from typing import Dict, Iterator, List, Tuple, Type
 
-from .baidu import BaiduNewsCrawler
-from .bilibili import BilibiliCrawler
 from .crawler import Crawler
-from .douban import DouBanCrawler
-from .douyin import DouYinCrawler
-from .ftpojie import FtPoJieCrawler
-from .github import GithubCrawler
-from .hackernews import HackerNewsCrawler
-from .hupu import HuPuCrawler
-from .jinritoutiao import JinRiTouTiaoCrawler
-from .juejin import JueJinCrawler
-from .sspai import ShaoShuPaiCrawler
-from .stackoverflow import StackOverflowCrawler
-from .tenxunwang import TenXunWangCrawler
-from .tieba import TieBaCrawler
-from .tskr import TsKrCrawler
-from .vtex import VtexCrawler
-from .weibo import WeiboCrawler
-from .weixin import WeiXinCrawler
-from .zhihu import ZhiHuCrawler
-from .sina_finance import SinaFinanceCrawler
-from .eastmoney import EastMoneyCrawler
-from .xueqiu import XueqiuCrawler
-from .cls import CLSCrawler
-
-
-class CrawlerRegister:
-    def __init__(self):
-        self.crawlers = {}
-    
-    def register(self) -> Dict[str, Crawler]:
-        """注册所有爬虫"""
-        crawler_map = {
-            "baidu": BaiduNewsCrawler(),
-            "shaoshupai": ShaoShuPaiCrawler(),
-            "weibo": WeiboCrawler(),
-            "zhihu": ZhiHuCrawler(),
-            "36kr": TsKrCrawler(),
-            "52pojie": FtPoJieCrawler(),
-            "bilibili": BilibiliCrawler(),
-            "douban": DouBanCrawler(),
-            "hupu": HuPuCrawler(),
-            "tieba": TieBaCrawler(),
-            "juejin": JueJinCrawler(),
-            "douyin": DouYinCrawler(),
-            "v2ex": VtexCrawler(),
-            "jinritoutiao": JinRiTouTiaoCrawler(),
-            "tenxunwang": TenXunWangCrawler(),
-            "stackoverflow": StackOverflowCrawler(),
-            "github": GithubCrawler(),
-            "hackernews": HackerNewsCrawler(),
-            "sina_finance": SinaFinanceCrawler(),
-            "eastmoney": EastMoneyCrawler(),
-            "xueqiu": XueqiuCrawler(),
-            "cls": CLSCrawler(),
-        }
-        
-        self.crawlers = crawler_map
-        return self.crawlers
-
-    def get_crawlers(self):
-        return self.register().values()
+from ...utils.logger import log
+
+# 内置爬虫，值为 "模块:类"，在第一次取用时才导入模块
+BUILTIN_CRAWLERS = {
+    "baidu": "app.services.sites.baidu:BaiduNewsCrawler",
+    "shaoshupai": "app.services.sites.sspai:ShaoShuPaiCrawler",
+    "weibo": "app.services.sites.weibo:WeiboCrawler",
+    "zhihu": "app.services.sites.zhihu:ZhiHuCrawler",
+    "36kr": "app.services.sites.tskr:TsKrCrawler",
+    "52pojie": "app.services.sites.ftpojie:FtPoJieCrawler",
+    "bilibili": "app.services.sites.bilibili:BilibiliCrawler",
+    "douban": "app.services.sites.douban:DouBanCrawler",
+    "hupu": "app.services.sites.hupu:HuPuCrawler",
+    "tieba": "app.services.sites.tieba:TieBaCrawler",
+    "juejin": "app.services.sites.juejin:JueJinCrawler",
+    "douyin": "app.services.sites.douyin:DouYinCrawler",
+    "v2ex": "app.services.sites.vtex:VtexCrawler",
+    "jinritoutiao": "app.services.sites.jinritoutiao:JinRiTouTiaoCrawler",
+    "tenxunwang": "app.services.sites.tenxunwang:TenXunWangCrawler",
+    "stackoverflow": "app.services.sites.stackoverflow:StackOverflowCrawler",
+    "github": "app.services.sites.github:GithubCrawler",
+    "hackernews": "app.services.sites.hackernews:HackerNewsCrawler",
+    "sina_finance": "app.services.sites.sina_finance:SinaFinanceCrawler",
+    "eastmoney": "app.services.sites.eastmoney:EastMoneyCrawler",
+    "xueqiu": "app.services.sites.xueqiu:XueqiuCrawler",
+    "cls": "app.services.sites.cls:CLSCrawler",
+}
+
+# 第三方爬虫通过该入口点组注册，入口点名称为平台名，值为 "模块:类"
+ENTRY_POINT_GROUP = "hot_news.crawlers"
+
+
+def load_class(spec: str) -> Type[Crawler]:
+    """按 "模块:类" 导入爬虫类"""
+    module_name, _, class_name = spec.partition(":")
+    crawler_class = getattr(import_module(module_name), class_name)
+    if not (isinstance(crawler_class, type) and issubclass(crawler_class, Crawler)):
+        raise TypeError(f"{spec} is not a Crawler subclass")
+    return crawler_class
+
+
+def discover_plugins() -> Dict[str, str]:
+    """读取已安装包在 hot_news.crawlers 入口点组中注册的爬虫"""
+    try:
+        return {entry.name: entry.value for entry in entry_points(group=ENTRY_POINT_GROUP)}
+    except Exception as e:
+        log.error(f"Error discovering crawler plugins: {e}")
+        return {}
+
+
+class CrawlerRegistry(Mapping):
+    """平台名到爬虫实例的映射
+
+    只保存每个平台的 "模块:类"，列出平台名不会导入爬虫模块；爬虫在第一次取用时创建并缓存。
+    第三方爬虫与内置爬虫重名时忽略第三方爬虫。
+    """
+
+    def __init__(self, specs: Dict[str, str] = None, plugins: bool = True):
+        self.specs = dict(BUILTIN_CRAWLERS if specs is None else specs)
+        if plugins:
+            for name, spec in discover_plugins().items():
+                if name in self.specs:
+                    log.warning(f"Crawler plugin {name} ({spec}) conflicts with {self.specs[name]}, ignored")
+                    continue
+                self.specs[name] = spec
+        self._crawlers: Dict[str, Crawler] = {}
+        self._lock = threading.Lock()
+
+    def __getitem__(self, name: str) -> Crawler:
+        crawler = self._crawlers.get(name)
+        if crawler is not None:
+            return crawler
+        spec = self.specs[name]
+        with self._lock:
+            if name not in self._crawlers:
+                self._crawlers[name] = load_class(spec)()
+            return self._crawlers[name]
+
+    def __contains__(self, name) -> bool:
+        return name in self.specs
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.specs)
+
+    def __len__(self) -> int:
+        return len(self.specs)
+
+    def get(self, name: str, default: Crawler = None) -> Crawler:
+        """取用爬虫，平台不存在或爬虫无法导入、创建时记录错误并返回 default"""
+        if name not in self.specs:
+            return default
+        try:
+            return self[name]
+        except Exception as e:
+            log.error(f"Failed to load crawler {name} ({self.specs[name]}): {e}")
+            return default
+
+    def items(self) -> List[Tuple[str, Crawler]]:
+        """创建并返回全部爬虫，无法导入或创建的爬虫记录错误后跳过"""
+        crawlers = [(name, self.get(name)) for name in self.specs]
+        return [(name, crawler) for name, crawler in crawlers if crawler is not None]
+
+    def values(self) -> List[Crawler]:
+        return [crawler for _, crawler in self.items()]
@@ -1,14 +1,11 @@
-import json
 import datetime  # 添加datetime导入
 import re
 
-import requests
 import urllib3
-from bs4 import BeautifulSoup
+from bs4 import SoupStrainer
 # 移除 SQLAlchemy 导入
 # from sqlalchemy.sql.functions import now
 
-from ...core import cache
 from ...db.mysql import News
 from .crawler import Crawler
 
@@ -18,26 +15,28 @@ urllib3.disable_warnings()
 class FtPoJieCrawler(Crawler):
     """吾爱破解"""
 
+    parse_only = SoupStrainer('tbody', id=lambda x: x and x.startswith('normalthread_'))
+
     def fetch(self, date_str):
-        # 获取当前时间
-        current_time = datetime.datetime.now()
-        
         url = "https://www.52pojie.cn/forum.php?mod=guide&view=hot"
         
-        resp = requests.get(url=url, headers=self.header, verify=False, timeout=self.timeout)
+        resp = self.sync_get(url, headers=self.header, verify=False)
         if resp.status_code != 200:
             print(f"request failed, status: {resp.status_code}")
             return []
             
         resp.encoding = 'gbk'  # 52pojie使用GBK编码
-        html_text = resp.text
-        soup = BeautifulSoup(html_text, "html.parser")
+        return self.parse(resp.text)
+
+    def parse(self, html_text):
+        # 获取当前时间
+        current_time = datetime.datetime.now()
+        soup = self.parse_html(html_text)
         
         # 找到热门帖子列表
         hot_threads = soup.find_all('tbody', id=lambda x: x and x.startswith('normalthread_'))
         
         result = []
-        cache_list = []
         
         for thread in hot_threads:
             title_elem = thread.find('a', class_='xst')
@@ -60,9 +59,7 @@ class FtPoJieCrawler(Crawler):
             }
             
             result.append(news)
-            cache_list.append(news)
             
-        cache.hset(date_str, self.crawler_name(), json.dumps(cache_list, ensure_ascii=False))
         return result
 
     def crawler_name(self):
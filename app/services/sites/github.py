@@ -1,18 +1,11 @@
-import json
 import datetime
 
-import requests
-import urllib3
-
-from .crawler import Crawler
-from ...core import cache
+from .crawler import AsyncCrawler
 from ...db.mysql import News
 
-urllib3.disable_warnings()
-
 
-class GithubCrawler(Crawler):
-    def fetch(self, date_str):
+class GithubCrawler(AsyncCrawler):
+    async def fetch(self, date_str):
         current_time = datetime.datetime.now()
 
         url = "https://api.github.com/search/repositories?q=stars:%3E1&sort=stars"
@@ -26,14 +19,13 @@ class GithubCrawler(Crawler):
             "Referer": "https://github.com/",
         }
 
-        resp = requests.get(url=url, headers=headers, verify=False, timeout=self.timeout)
+        resp = await self.get(url=url, headers=headers)
         if resp.status_code != 200:
             print(f"request failed, status: {resp.status_code}")
             return []
 
         data = resp.json()
         result = []
-        cache_list = []
 
         for i, item in enumerate(data["items"]):
             title = item.get("full_name", "")
@@ -49,9 +41,7 @@ class GithubCrawler(Crawler):
             }
 
             result.append(news)
-            cache_list.append(news)
 
-        cache.hset(date_str, self.crawler_name(), json.dumps(cache_list, ensure_ascii=False))
         return result
 
     def crawler_name(self):
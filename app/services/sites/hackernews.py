@@ -1,17 +1,9 @@
-import json
 import datetime
 import time
-import requests
-from bs4 import BeautifulSoup
 import urllib3
-from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
 
-from ...core import cache
 from ...db.mysql import News
 from .crawler import Crawler
-from ..browser_manager import BrowserManager
 
 # 禁用SSL警告
 urllib3.disable_warnings()
@@ -19,31 +11,11 @@ urllib3.disable_warnings()
 class HackerNewsCrawler(Crawler):
     """hacker news"""
     def fetch(self, date_str):
-        current_time = datetime.datetime.now()
-        
-        try:
-            # 首先尝试直接请求方式获取内容
-            result = self._fetch_with_requests()
-            
-            if result and len(result) > 0:
-                # 缓存数据
-                cache.hset(date_str, self.crawler_name(), json.dumps(result, ensure_ascii=False))
-                return result
-                
-            # 如果请求方式失败，尝试使用浏览器模拟获取
-            browser_manager = BrowserManager()
-            result = self._fetch_with_browser(browser_manager)
-            if result and len(result) > 0:
-                # 缓存数据
-                cache.hset(date_str, self.crawler_name(), json.dumps(result, ensure_ascii=False))
-                return result
-                
-        except Exception as e:
-            # 如果遇到错误，返回空列表
-            return []
-            
-        # 所有方法都失败，返回空列表
-        return []
+        # 直接请求和浏览器模拟竞速：请求迟迟没有结果或失败时才启动浏览器，取先得到的非空结果
+        return self.race([
+            ("requests", self._fetch_with_requests),
+            ("browser", self._fetch_with_browser),
+        ])
     
     def _fetch_with_requests(self):
         """使用requests直接获取Hacker News内容"""
@@ -51,12 +23,19 @@ class HackerNewsCrawler(Crawler):
         
         try:
             # 发送HTTP请求
-            response = requests.get(url, headers=self.header, timeout=self.timeout)
+            response = self.sync_get(url, headers=self.header)
             if response.status_code != 200:
                 return []
                 
-            # 解析HTML内容
-            soup = BeautifulSoup(response.text, 'html.parser')
+            return self.parse(response.text)
+            
+        except Exception as e:
+            return []
+    
+    def parse(self, html_text):
+        """解析Hacker News首页，元数据在条目的下一行，需要保留完整的表格结构"""
+        try:
+            soup = self.parse_html(html_text)
             
             result = []
             current_time = datetime.datetime.now().strftime('%Y-%m-%d %H:%M:%S')
@@ -131,100 +110,61 @@ class HackerNewsCrawler(Crawler):
         except Exception as e:
             return []
     
-    def _fetch_with_browser(self, browser_manager):
+    def _fetch_with_browser(self):
         """使用浏览器模拟方式获取Hacker News内容"""
         url = "https://news.ycombinator.com/"
         
         try:
-            # 获取页面内容
-            page_source, driver = browser_manager.get_page_content(url, wait_time=5)
-            
-            # 等待页面元素加载
-            try:
-                WebDriverWait(driver, 10).until(
-                    EC.presence_of_element_located((By.CSS_SELECTOR, ".athing"))
-                )
-            except:
-                # 如果等待超时，仍然尝试获取内容
-                pass
+            # 等待新闻条目出现（超时仍然尝试获取内容），一次性抽取所有条目，
+            # 元数据（分数、用户、评论数）在条目的下一行
+            rows = self.render(url, wait_for="tr.athing", extract={
+                'rows': "tr.athing",
+                'fields': {
+                    'id': {'attr': 'id'},
+                    'title': ".titleline a",
+                    'url': {'selector': ".titleline a", 'attr': 'href'},
+                    'site': ".sitestr",
+                    'metadata': {'next': True},
+                    'score': {'selector': ".score", 'next': True},
+                    'user': {'selector': ".hnuser", 'next': True},
+                    'comments': {'selector': "a:last-of-type", 'next': True},
+                },
+            })['rows']
             
             result = []
             current_time = datetime.datetime.now().strftime('%Y-%m-%d %H:%M:%S')
             
-            # 获取所有新闻条目
-            items = driver.find_elements(By.CSS_SELECTOR, "tr.athing")
-            
-            for item in items:
-                try:
-                    # 获取ID用于关联评论和元数据
-                    item_id = item.get_attribute("id")
-                    if not item_id:
-                        continue
-                    
-                    # 获取标题和链接
-                    title_element = item.find_element(By.CSS_SELECTOR, ".titleline a")
-                    title = title_element.text.strip()
-                    url = title_element.get_attribute("href")
-                    
-                    # 获取来源网站
-                    site = ""
-                    try:
-                        site_element = item.find_element(By.CSS_SELECTOR, ".sitestr")
-                        site = site_element.text.strip()
-                    except:
-                        pass
-                    
-                    # 查找下一个tr获取元数据（分数、用户、时间等）
-                    try:
-                        metadata = driver.find_element(By.XPATH, f"//tr[@id='{item_id}']/following-sibling::tr[1]")
-                        
-                        # 获取分数
-                        score = "0 points"
-                        try:
-                            score_element = metadata.find_element(By.CSS_SELECTOR, ".score")
-                            score = score_element.text.strip()
-                        except:
-                            pass
-                        
-                        # 获取作者
-                        user = "unknown"
-                        try:
-                            user_element = metadata.find_element(By.CSS_SELECTOR, ".hnuser")
-                            user = user_element.text.strip()
-                        except:
-                            pass
-                        
-                        # 获取评论数
+            for row in rows:
+                # 没有ID或标题的不是新闻条目
+                if not row['id'] or row['title'] is None:
+                    continue
+                
+                site = row['site'] or ""
+                if row['metadata'] is not None:
+                    score = row['score'] or "0 points"
+                    user = row['user'] or "unknown"
+                    comments = row['comments'] or "0 comments"
+                    if "discuss" in comments:
                         comments = "0 comments"
-                        try:
-                            comments_element = metadata.find_element(By.XPATH, ".//a[last()]")
-                            comments = comments_element.text.strip()
-                            if "discuss" in comments:
-                                comments = "0 comments"
-                        except:
-                            pass
-                        
-                        # 构建内容摘要
-                        content = f"来源: {site} | 得分: {score} | 作者: {user} | 评论: {comments}"
-                    except:
-                        content = f"来源: {site}"
-                    
-                    news = {
-                        'title': title,
-                        'url': url,
-                        'content': content,
-                        'source': 'hackernews',
-                        'publish_time': current_time
-                    }
-                    
-                    result.append(news)
                     
-                    # 限制获取前30条
-                    if len(result) >= 30:
-                        break
-                        
-                except Exception as e:
-                    continue
+                    # 构建内容摘要
+                    content = f"来源: {site} | 得分: {score} | 作者: {user} | 评论: {comments}"
+                else:
+                    content = f"来源: {site}"
+                
+                news = {
+                    'title': row['title'],
+                    'url': row['url'],
+                    'content': content,
+                    'source': 'hackernews',
+                    'publish_time': current_time
+                }
+                
+                result.append(news)
+                
+                # 限制获取前30条
+                if len(result) >= 30:
+                    break
                     
             return result
             
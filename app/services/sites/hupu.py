@@ -1,14 +1,11 @@
-import json
 import datetime  # 添加datetime导入
 import re
 
-import requests
 import urllib3
-from bs4 import BeautifulSoup
+from bs4 import SoupStrainer
 # 移除 SQLAlchemy 导入
 # from sqlalchemy.sql.functions import now
 
-from ...core import cache
 from ...db.mysql import News
 from .crawler import Crawler
 
@@ -18,25 +15,27 @@ urllib3.disable_warnings()
 class HuPuCrawler(Crawler):
     """虎扑"""
 
+    parse_only = SoupStrainer('div', class_='t-info')
+
     def fetch(self, date_str):
-        # 获取当前时间
-        current_time = datetime.datetime.now()
-        
         url = "https://bbs.hupu.com/all-gambia"
         
-        resp = requests.get(url=url, headers=self.header, verify=False, timeout=self.timeout)
+        resp = self.sync_get(url, headers=self.header, verify=False)
         if resp.status_code != 200:
             print(f"request failed, status: {resp.status_code}")
             return []
             
-        html_text = resp.text
-        soup = BeautifulSoup(html_text, "html.parser")
+        return self.parse(resp.text)
+
+    def parse(self, html_text):
+        # 获取当前时间
+        current_time = datetime.datetime.now()
+        soup = self.parse_html(html_text)
         
         # 找到热门帖子列表
         post_list = soup.find_all('div', class_='t-info')
         
         result = []
-        cache_list = []
         
         for post in post_list:
             title_elem = post.find('span', class_='t-title')
@@ -63,9 +62,7 @@ class HuPuCrawler(Crawler):
             }
             
             result.append(news)
-            cache_list.append(news)
             
-        cache.hset(date_str, self.crawler_name(), json.dumps(cache_list, ensure_ascii=False))
         return result
 
     def crawler_name(self):
@@ -1,30 +1,24 @@
 # -- coding: utf-8 --
 
-import json
 import datetime  # 添加datetime导入
 
-import requests
-import urllib3
 from bs4 import BeautifulSoup
 # 移除 SQLAlchemy 导入
 # from sqlalchemy.sql.functions import now
 
-from ...core import cache
-from .crawler import Crawler
+from .crawler import AsyncCrawler
 
-urllib3.disable_warnings()
 
-
-class JinRiTouTiaoCrawler(Crawler):
+class JinRiTouTiaoCrawler(AsyncCrawler):
     """ 今日头条 """
 
-    def fetch(self, date_str):
+    async def fetch(self, date_str):
         # 获取当前时间
         current_time = datetime.datetime.now()
         
         url = "https://www.toutiao.com/hot-event/hot-board/?origin=toutiao_pc"
         
-        resp = requests.get(url=url, headers=self.header, verify=False, timeout=self.timeout)
+        resp = await self.get(url=url, headers=self.header)
         if resp.status_code != 200:
             print(f"request failed, status: {resp.status_code}")
             return []
@@ -34,7 +28,6 @@ class JinRiTouTiaoCrawler(Crawler):
             data = json_data.get('data', [])
             
             result = []
-            cache_list = []
             
             for item in data:
                 title = item.get('Title', '')
@@ -50,9 +43,7 @@ class JinRiTouTiaoCrawler(Crawler):
                 }
                 
                 result.append(news)
-                cache_list.append(news)
                 
-            cache.hset(date_str, self.crawler_name(), json.dumps(cache_list, ensure_ascii=False))
             return result
             
         except Exception as e:
@@ -1,29 +1,23 @@
-import json
 import datetime  # 添加datetime导入
 
-import requests
-import urllib3
 from bs4 import BeautifulSoup
 # 移除 SQLAlchemy 导入
 # from sqlalchemy.sql.functions import now
 
-from .crawler import Crawler
-from ...core import cache
+from .crawler import AsyncCrawler
 from ...db.mysql import News
 
-urllib3.disable_warnings()
 
-
-class JueJinCrawler(Crawler):
+class JueJinCrawler(AsyncCrawler):
     """掘金"""
 
-    def fetch(self, date_str):
+    async def fetch(self, date_str):
         # 获取当前时间
         current_time = datetime.datetime.now()
         
         url = "https://api.juejin.cn/content_api/v1/content/article_rank?category_id=1&type=hot"
         
-        resp = requests.get(url=url,  headers=self.header, verify=False, timeout=self.timeout)
+        resp = await self.get(url=url,  headers=self.header)
         if resp.status_code != 200:
             print(f"request failed, status: {resp.status_code}")
             return []
@@ -33,7 +27,6 @@ class JueJinCrawler(Crawler):
             data = json_data.get('data', [])
             
             result = []
-            cache_list = []
             
             for item in data:
                 article_info = item.get('content', {})
@@ -50,9 +43,7 @@ class JueJinCrawler(Crawler):
                 }
                 
                 result.append(news)
-                cache_list.append(news)
                 
-            cache.hset(date_str, self.crawler_name(), json.dumps(cache_list, ensure_ascii=False))
             return result
             
         except Exception as e:
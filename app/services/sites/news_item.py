@@ -0,0 +1,89 @@
+import re
+import hashlib
+from typing import List, Dict, Any, Optional, Union
+
+# 热度中的数字和单位，例如 "4955232"、"1.2万"、"123 points"
+_HEAT_PATTERN = re.compile(r'(\d[\d,]*(?:\.\d+)?)\s*([万亿kKmMwW]?)(?![A-Za-z])')
+# 热度写在 content 中的情况，例如 "热度: 1.2万"、"得分: 123 points"
+_CONTENT_HEAT_PATTERN = re.compile(r'(?:热度|得分|热力值)\s*[:：]\s*([^|，]+)')
+_HEAT_UNITS = {'万': 1e4, 'w': 1e4, 'W': 1e4, '亿': 1e8, 'k': 1e3, 'K': 1e3, 'm': 1e6, 'M': 1e6}
+
+# 爬虫输出中有固定含义的字段，其余字段原样保留在 extra 中
+_FIELDS = ('title', 'url', 'content', 'source', 'publish_time')
+_DERIVED = ('id', 'platform', 'rank', 'score')
+
+
+def parse_heat(value: Any) -> Optional[Union[int, float]]:
+    """把各平台的热度统一为数值，无法识别时返回 None"""
+    if isinstance(value, bool):
+        return None
+    if isinstance(value, (int, float)):
+        return value
+    if not isinstance(value, str):
+        return None
+
+    match = _HEAT_PATTERN.search(value)
+    if not match:
+        return None
+    heat = float(match.group(1).replace(',', '')) * _HEAT_UNITS.get(match.group(2), 1)
+    return int(heat) if heat.is_integer() else heat
+
+
+def item_id(url: Optional[str], title: Optional[str]) -> str:
+    """条目的稳定标识：优先使用链接（去掉锚点），没有链接时使用标题"""
+    identity = (url or '').split('#')[0].strip() or (title or '').strip()
+    return hashlib.sha1(identity.encode('utf-8')).hexdigest()[:12]
+
+
+class NewsItem:
+    """入库前统一格式的榜单条目
+
+    score 为归一化后的数值热度，平台没有提供热度时为 None（不按排名生成，避免与真实热度混在一起）。
+    """
+
+    __slots__ = ('id', 'platform', 'rank', 'score', 'title', 'url', 'content', 'source',
+                 'publish_time', 'extra')
+
+    def __init__(self, platform: str, rank: int, score: Optional[Union[int, float]], title: str, url: str,
+                 content: str = '', source: str = '', publish_time: str = '',
+                 extra: Optional[Dict[str, Any]] = None):
+        self.id = item_id(url, title)
+        self.platform = platform
+        self.rank = rank
+        self.score = score
+        self.title = title
+        self.url = url
+        self.content = content
+        self.source = source
+        self.publish_time = publish_time
+        self.extra = extra
+
+    @classmethod
+    def from_dict(cls, platform: str, news: Dict[str, Any], rank: int) -> "NewsItem":
+        score = parse_heat(news.get('score'))
+        if score is None:
+            match = _CONTENT_HEAT_PATTERN.search(news.get('content') or '')
+            score = parse_heat(match.group(1)) if match else None
+
+        extra = {k: v for k, v in news.items() if k not in _FIELDS and k not in _DERIVED}
+        return cls(platform, rank, score, news.get('title') or '', news.get('url') or '',
+                   news.get('content') or '', news.get('source') or platform,
+                   news.get('publish_time') or '', extra or None)
+
+    def to_dict(self) -> Dict[str, Any]:
+        news = {
+            'title': self.title,
+            'url': self.url,
+            'content': self.content,
+            'source': self.source,
+            'publish_time': self.publish_time,
+        }
+        if self.extra:
+            news.update(self.extra)
+        news.update(id=self.id, platform=self.platform, rank=self.rank, score=self.score)
+        return news
+
+
+def build_items(platform: str, news_list: List[Dict[str, Any]]) -> List[NewsItem]:
+    """把爬虫返回的榜单转换为 NewsItem，排名以榜单顺序为准"""
+    return [NewsItem.from_dict(platform, news, idx + 1) for idx, news in enumerate(news_list)]
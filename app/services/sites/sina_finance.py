@@ -1,16 +1,11 @@
 import json
 import datetime
-import requests
-import urllib3
-from ...core import cache
-from .crawler import Crawler
+from .crawler import AsyncCrawler, NotModified
 
-urllib3.disable_warnings()
 
-
-class SinaFinanceCrawler(Crawler):
+class SinaFinanceCrawler(AsyncCrawler):
     """新浪财经"""
-    def fetch(self, date_str):
+    async def fetch(self, date_str):
         current_time = datetime.datetime.now()
         
         try:
@@ -22,11 +17,9 @@ class SinaFinanceCrawler(Crawler):
                 'Origin': 'https://finance.sina.com.cn'
             }
             
-            response = requests.get(
+            response = await self.get(
                 "https://zhibo.sina.com.cn/api/zhibo/feed?page=1&page_size=20&zhibo_id=152&tag_id=0&dire=f&dpc=1&pagesize=20",
-                headers=headers,
-                timeout=self.timeout,
-                verify=False
+                headers=headers
             )
             response.raise_for_status()
             
@@ -36,7 +29,6 @@ class SinaFinanceCrawler(Crawler):
             
             feed_list = data.get('result', {}).get('data', {}).get('feed', {}).get('list', [])
             result = []
-            cache_list = []
             
             for item in feed_list:
                 try:
@@ -60,14 +52,13 @@ class SinaFinanceCrawler(Crawler):
                     }
                     
                     result.append(news)
-                    cache_list.append(news)
                     
                 except Exception:
                     continue
             
-            if cache_list:
-                cache.hset(date_str, self.crawler_name(), json.dumps(cache_list, ensure_ascii=False))
             return result
+        except NotModified:
+            raise
         except Exception as e:
             return []
     
@@ -1,26 +1,20 @@
-import json
 import datetime  # 添加datetime导入
 
-import requests
-import urllib3
 from bs4 import BeautifulSoup
 # 移除 SQLAlchemy 导入
 # from sqlalchemy.sql.functions import now
 
-from ...core import cache
-from .crawler import Crawler
+from .crawler import AsyncCrawler
 
-urllib3.disable_warnings()
 
-
-class ShaoShuPaiCrawler(Crawler):
+class ShaoShuPaiCrawler(AsyncCrawler):
     """少数派"""
-    def fetch(self, date_str):
+    async def fetch(self, date_str):
         current_time = datetime.datetime.now()
         
         url = "https://sspai.com/api/v1/article/index/page/get?limit=20&offset=0&created_at=0"
         
-        resp = requests.get(url=url, headers=self.header, verify=False, timeout=self.timeout)
+        resp = await self.get(url=url, headers=self.header)
         if resp.status_code != 200:
             print(f"request failed, status: {resp.status_code}")
             return []
@@ -30,7 +24,6 @@ class ShaoShuPaiCrawler(Crawler):
             data = json_data.get('data', [])
             
             result = []
-            cache_list = []
             
             for item in data:
                 title = item.get('title', '')
@@ -47,9 +40,7 @@ class ShaoShuPaiCrawler(Crawler):
                 }
                 
                 result.append(news)
-                cache_list.append(news)
                 
-            cache.hset(date_str, self.crawler_name(), json.dumps(cache_list, ensure_ascii=False))
             return result
             
         except Exception as e:
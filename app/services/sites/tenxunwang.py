@@ -1,20 +1,13 @@
-import json
 import datetime
 
-import requests
-import urllib3
-
-from .crawler import Crawler
-from ...core import cache
+from .crawler import AsyncCrawler
 from ...db.mysql import News
 
-urllib3.disable_warnings()
-
 
-class TenXunWangCrawler(Crawler):
+class TenXunWangCrawler(AsyncCrawler):
     """腾讯网"""
 
-    def fetch(self, date_str):
+    async def fetch(self, date_str):
         current_time = datetime.datetime.now()
 
         url = "https://i.news.qq.com/gw/event/pc_hot_ranking_list?ids_hash=&offset=0&page_size=51&appver=15.5_qqnews_7.1.60&rank_id=hot"
@@ -28,14 +21,13 @@ class TenXunWangCrawler(Crawler):
             "Referer": "https://news.qq.com/",
         }
 
-        resp = requests.get(url=url, headers=headers, verify=False, timeout=self.timeout)
+        resp = await self.get(url=url, headers=headers)
         if resp.status_code != 200:
             print(f"request failed, status: {resp.status_code}")
             return []
 
         data = resp.json()
         result = []
-        cache_list = []
 
 
         for i, item in enumerate(data["idlist"][0].get("newslist", [])):
@@ -56,9 +48,7 @@ class TenXunWangCrawler(Crawler):
             }
 
             result.append(news)
-            cache_list.append(news)
 
-        cache.hset(date_str, self.crawler_name(), json.dumps(cache_list, ensure_ascii=False))
         return result
 
     def crawler_name(self):
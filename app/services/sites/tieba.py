@@ -1,29 +1,23 @@
-import json
 import datetime  # 添加datetime导入
 
-import requests
-import urllib3
 from bs4 import BeautifulSoup
 # 移除 SQLAlchemy 导入
 # from sqlalchemy.sql.functions import now
 
-from .crawler import Crawler
-from ...core import cache
+from .crawler import AsyncCrawler
 from ...db.mysql import News
 
-urllib3.disable_warnings()
 
-
-class TieBaCrawler(Crawler):
+class TieBaCrawler(AsyncCrawler):
     """百度贴吧"""
 
-    def fetch(self, date_str):
+    async def fetch(self, date_str):
         # 获取当前时间
         current_time = datetime.datetime.now()
         
         url = "http://tieba.baidu.com/hottopic/browse/topicList"
         
-        resp = requests.get(url=url, headers=self.header, verify=False, timeout=self.timeout)
+        resp = await self.get(url=url, headers=self.header)
         if resp.status_code != 200:
             print(f"request failed, status: {resp.status_code}")
             return []
@@ -33,7 +27,6 @@ class TieBaCrawler(Crawler):
             data = json_data.get('data', {}).get('bang_topic', {}).get('topic_list', [])
             
             result = []
-            cache_list = []
             
             for item in data:
                 title = item.get('topic_name', '')
@@ -52,9 +45,7 @@ class TieBaCrawler(Crawler):
                 }
                 
                 result.append(news)
-                cache_list.append(news)
                 
-            cache.hset(date_str, self.crawler_name(), json.dumps(cache_list, ensure_ascii=False))
             return result
             
         except Exception as e:
@@ -1,20 +1,13 @@
-import json
 import datetime
 import time
 
-import requests
-import urllib3
+from .crawler import AsyncCrawler
 
-from .crawler import Crawler
-from ...core import cache
 
-urllib3.disable_warnings()
-
-
-class TsKrCrawler(Crawler):
+class TsKrCrawler(AsyncCrawler):
     """36氪"""
     
-    def fetch(self, date_str):
+    async def fetch(self, date_str):
         """
         获取36氪热榜数据
         """
@@ -35,12 +28,10 @@ class TsKrCrawler(Crawler):
         }
         
         try:
-            resp = requests.post(
+            resp = await self.post(
                 url=url,
                 headers=headers,
-                json=body,
-                verify=False,
-                timeout=self.timeout
+                json=body
             )
             
             if resp.status_code != 200:
@@ -52,7 +43,6 @@ class TsKrCrawler(Crawler):
             data_list = json_data.get("data", {}).get(data_key, [])
             
             result = []
-            cache_list = []
             
             for item in data_list:
                 template_material = item.get("templateMaterial", {})
@@ -70,9 +60,7 @@ class TsKrCrawler(Crawler):
                 }
 
                 result.append(news)
-                cache_list.append(news)
             
-            cache.hset(date_str, self.crawler_name(), json.dumps(cache_list, ensure_ascii=False))
             return result
             
         except Exception as e:
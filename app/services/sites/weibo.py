@@ -1,22 +1,16 @@
-import json
 import datetime  # 添加datetime导入
 
-import requests
-import urllib3
 from bs4 import BeautifulSoup
 # 移除 SQLAlchemy 导入
 # from sqlalchemy.sql.functions import now
 
-from ...core import cache
-from .crawler import Crawler
+from .crawler import AsyncCrawler
 
-urllib3.disable_warnings()
 
-
-class WeiboCrawler(Crawler):
+class WeiboCrawler(AsyncCrawler):
     """微博"""
 
-    def fetch(self, date_str):
+    async def fetch(self, date_str):
         # 获取当前时间
         current_time = datetime.datetime.now()
 
@@ -30,7 +24,7 @@ class WeiboCrawler(Crawler):
         
         url = "https://weibo.com/ajax/side/hotSearch"
         
-        resp = requests.get(url=url, headers=header, verify=False, timeout=self.timeout)
+        resp = await self.get(url=url, headers=header)
         if resp.status_code != 200:
             print(f"request failed, status: {resp.status_code}")
             return []
@@ -40,7 +34,6 @@ class WeiboCrawler(Crawler):
             data = json_data.get('data', {}).get('realtime', [])
             
             result = []
-            cache_list = []
             
             for item in data:
                 title = item.get('word', '')
@@ -51,13 +44,12 @@ class WeiboCrawler(Crawler):
                     'url': url,
                     'content': title,
                     'source': 'weibo',
-                    'publish_time': current_time.strftime('%Y-%m-%d %H:%M:%S')
+                    'publish_time': current_time.strftime('%Y-%m-%d %H:%M:%S'),
+                    'score': item.get('num')
                 }
                 
                 result.append(news)
-                cache_list.append(news)
                 
-            cache.hset(date_str, self.crawler_name(), json.dumps(cache_list, ensure_ascii=False))
             return result
             
         except Exception as e:
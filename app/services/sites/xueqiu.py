@@ -1,12 +1,9 @@
-import json
 import datetime
-import requests
 import urllib3
 import re
 from requests.sessions import Session
 
 from .crawler import Crawler
-from ...core import cache
 
 urllib3.disable_warnings()
 
@@ -16,9 +13,11 @@ class XueqiuCrawler(Crawler):
     def __init__(self):
         super().__init__()
         self.session = Session()
-        self._init_session()
+        # 会话在第一次抓取时才预热，创建爬虫不访问网络
+        self._session_ready = False
     
     def _init_session(self):
+        self._session_ready = True
         try:
             # 第一步：访问主页获取基础cookies
             main_url = "https://xueqiu.com"
@@ -35,7 +34,7 @@ class XueqiuCrawler(Crawler):
                 'Upgrade-Insecure-Requests': '1'
             }
             
-            resp = self.session.get(main_url, headers=headers, verify=False, timeout=self.timeout)
+            resp = self.sync_get(main_url, session=self.session, headers=headers, verify=False)
             if resp.status_code == 200:
                 html_content = resp.text
                 
@@ -58,7 +57,7 @@ class XueqiuCrawler(Crawler):
                     'Upgrade-Insecure-Requests': '1'
                 }
                 
-                hot_resp = self.session.get(hot_page_url, headers=hot_headers, verify=False, timeout=self.timeout)
+                hot_resp = self.sync_get(hot_page_url, session=self.session, headers=hot_headers, verify=False)
                 if hot_resp.status_code == 200:
                     print("雪球热门页面访问成功，已获取完整认证信息")
                 else:
@@ -89,12 +88,14 @@ class XueqiuCrawler(Crawler):
         }
         
         try:
-            resp = self.session.get(url=url, headers=headers, verify=False, timeout=self.timeout)
+            if not self._session_ready:
+                self._init_session()
+            resp = self.sync_get(url, session=self.session, headers=headers, verify=False)
             
             if resp.status_code != 200:
                 print(f"雪球请求失败, status: {resp.status_code}")
                 self._init_session()
-                resp = self.session.get(url=url, headers=headers, verify=False, timeout=self.timeout)
+                resp = self.sync_get(url, session=self.session, headers=headers, verify=False)
                 if resp.status_code != 200:
                     print(f"雪球重试后仍失败, status: {resp.status_code}")
                     return []
@@ -105,7 +106,6 @@ class XueqiuCrawler(Crawler):
                 return []
                 
             result = []
-            cache_list = []
             
             for idx, item in enumerate(json_data['list'][:10]):  # 取前10条
                 try:
@@ -138,13 +138,11 @@ class XueqiuCrawler(Crawler):
                         'rank': idx + 1
                     }
                     result.append(news)
-                    cache_list.append(news)
                     
                 except Exception as e:
                     print(f"解析雪球新闻项失败: {e}")
                     continue
 
-            cache.hset(date_str, self.crawler_name(), json.dumps(cache_list, ensure_ascii=False))
             return result
             
         except Exception as e:
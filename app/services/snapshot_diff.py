@@ -0,0 +1,104 @@
+from typing import List, Dict, Any, Optional, Tuple
+
+from app.core import cache
+from app.core.config import get_crawler_config
+from app.services.sites.news_item import item_id
+from app.utils import codec
+from app.utils.logger import log
+
+# 获取爬虫配置
+crawler_config = get_crawler_config()
+
+# 榜单变化事件流，所有平台共用，消费者按事件ID增量读取
+EVENTS_KEY = "crawler:events"
+
+
+def item_key(item: Dict[str, Any]) -> str:
+    """条目的稳定标识，早期快照的条目没有 id 时按同样的规则计算"""
+    return item.get('id') or item_id(item.get('url'), item.get('title'))
+
+
+def carry_publish_time(previous: Optional[List[Dict[str, Any]]], current: List[Dict[str, Any]]):
+    """仍在榜上的条目沿用上一个快照中的 publish_time（首次上榜时间）
+
+    爬虫把抓取时间写入 publish_time，沿用之后内容未变化的榜单序列化结果与上次相同，
+    可以直接按序列化后的字节计算摘要。
+    """
+    first_seen = {item_key(item): item.get('publish_time') for item in previous or []}
+    for item in current:
+        publish_time = first_seen.get(item_key(item))
+        if publish_time:
+            item['publish_time'] = publish_time
+
+
+def diff_items(previous: Optional[List[Dict[str, Any]]], current: List[Dict[str, Any]]) -> Dict[str, List[Dict[str, Any]]]:
+    """比较两个快照的条目（已带 rank 和 score），返回新上榜、下榜和排名/分数变化的条目"""
+    previous_map = {item_key(item): item for item in previous or []}
+    current_map = {item_key(item): item for item in current}
+
+    added = []
+    moved = []
+    for key, item in current_map.items():
+        old = previous_map.get(key)
+        if old is None:
+            added.append({"key": key, "title": item.get('title'), "url": item.get('url'),
+                          "rank": item['rank'], "score": item.get('score')})
+            continue
+
+        rank_delta = old['rank'] - item['rank']
+        # 没有热度的平台只比较排名
+        has_scores = isinstance(item.get('score'), (int, float)) and isinstance(old.get('score'), (int, float))
+        score_delta = item['score'] - old['score'] if has_scores else None
+        if rank_delta or score_delta:
+            moved.append({"key": key, "title": item.get('title'), "rank": item['rank'],
+                          "rank_delta": rank_delta, "score_delta": score_delta})
+
+    removed = [
+        {"key": key, "title": item.get('title'), "rank": item['rank']}
+        for key, item in previous_map.items() if key not in current_map
+    ]
+    return {"added": added, "removed": removed, "moved": moved}
+
+
+def change_ratio(diff: Dict[str, List[Dict[str, Any]]], total: int) -> float:
+    """本次榜单中新上榜条目所占的比例"""
+    return len(diff["added"]) / total if total else 0.0
+
+
+def append_event(pipe, platform: str, diff: Dict[str, List[Dict[str, Any]]], ts: int,
+                 previous_ts: Optional[int] = None):
+    """在 pipeline（事务）中写入一条变化事件，事件流按 events_max_len 近似截断"""
+    pipe.xadd(EVENTS_KEY, {
+        "platform": platform,
+        "ts": ts,
+        "previous_ts": previous_ts or 0,
+        "added": len(diff["added"]),
+        "removed": len(diff["removed"]),
+        "moved": len(diff["moved"]),
+        "diff": codec.dumps(diff),
+    }, maxlen=crawler_config.events_max_len, approximate=True)
+
+
+def _decode(value) -> str:
+    return value.decode('utf-8') if isinstance(value, bytes) else value
+
+
+def read_events(last_id: str = "0", count: int = 100) -> List[Tuple[str, Dict[str, Any]]]:
+    """读取 last_id 之后的变化事件，返回 (事件ID, 事件) 列表，下次读取时传入最后一个事件ID"""
+    try:
+        entries = cache.get_redis_client().xrange(EVENTS_KEY, min=f"({last_id}", count=count)
+    except Exception as e:
+        log.error(f"Error reading crawler events: {e}")
+        return []
+
+    events = []
+    for event_id, fields in entries:
+        fields = {_decode(k): _decode(v) for k, v in fields.items()}
+        event = {
+            "platform": fields["platform"],
+            "ts": int(fields["ts"]),
+            "previous_ts": int(fields["previous_ts"]) or None,
+            **codec.loads(fields["diff"]),
+        }
+        events.append((_decode(event_id), event))
+    return events
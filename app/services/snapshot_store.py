@@ -0,0 +1,110 @@
+import time
+from typing import List, Dict, Any, Optional, Tuple
+
+from app.core import cache
+from app.core.config import get_crawler_config
+from app.services.sites.news_item import NewsItem
+from app.utils import codec
+from app.utils.logger import log
+
+# 获取爬虫配置
+crawler_config = get_crawler_config()
+
+# 平台快照索引（ZSET，成员和分数都是抓取时间的毫秒时间戳）
+INDEX_KEY = "crawler:snap:{}:index"
+# 单个快照内容
+SNAPSHOT_KEY = "crawler:snap:{}:{}"
+# 平台最新快照的时间戳
+LATEST_KEY = "crawler:snap:{}:latest"
+
+
+def encode_items(news_items: List[NewsItem]) -> List[Dict[str, Any]]:
+    """把榜单条目转换为快照条目，每个条目附带 id、平台、排名和归一化分数"""
+    return [item.to_dict() for item in news_items]
+
+
+def _decode(value) -> Optional[Dict[str, Any]]:
+    if value is None:
+        return None
+    try:
+        return codec.loads(value)
+    except ValueError:
+        return None
+
+
+class SnapshotStore:
+    """平台榜单的日内快照历史
+
+    每次榜单更新追加一个快照，只追加不覆盖；超过保留时长或数量上限的快照自动清理。
+    latest 指针指向最新快照，读取当前榜单只需两次 O(1) 查询。
+    """
+
+    def __init__(self, retention: int = None, max_count: int = None):
+        self.retention = retention if retention is not None else crawler_config.snapshot_retention
+        self.max_count = max_count if max_count is not None else crawler_config.snapshot_max_count
+
+    def append(self, pipe, platform: str, payload: bytes, ts: Optional[int] = None) -> int:
+        """在 pipeline（事务）中追加一个快照，返回快照时间戳（毫秒）
+
+        payload 是 encode_items 生成的条目序列化后的字节串，直接拼接进快照，不再重复序列化。
+        """
+        ts = ts if ts is not None else int(time.time() * 1000)
+        index_key = INDEX_KEY.format(platform)
+
+        snapshot = b'{"ts":%d,"items":%s}' % (ts, payload)
+        pipe.set(SNAPSHOT_KEY.format(platform, ts), snapshot, ex=self.retention)
+        pipe.zadd(index_key, {ts: ts})
+        pipe.set(LATEST_KEY.format(platform), ts, ex=self.retention)
+        # 按保留时长和数量清理索引，快照内容随过期时间自动删除
+        pipe.zremrangebyscore(index_key, "-inf", ts - self.retention * 1000)
+        pipe.zremrangebyrank(index_key, 0, -(self.max_count + 1))
+        pipe.expire(index_key, self.retention)
+        return ts
+
+    def latest(self, platform: str) -> Optional[Dict[str, Any]]:
+        """获取平台最新快照"""
+        try:
+            client = cache.get_redis_client()
+            ts = client.get(LATEST_KEY.format(platform))
+            if ts is None:
+                return None
+            return _decode(client.get(SNAPSHOT_KEY.format(platform, int(ts))))
+        except Exception as e:
+            log.error(f"Error loading latest snapshot for {platform}: {e}")
+            return None
+
+    def history(self, platform: str, since: Optional[int] = None,
+                until: Optional[int] = None) -> List[Dict[str, Any]]:
+        """按时间顺序获取 [since, until] 毫秒时间戳范围内的快照"""
+        try:
+            client = cache.get_redis_client()
+            timestamps = client.zrangebyscore(
+                INDEX_KEY.format(platform),
+                since if since is not None else "-inf",
+                until if until is not None else "+inf"
+            )
+            if not timestamps:
+                return []
+            values = client.mget([SNAPSHOT_KEY.format(platform, int(ts)) for ts in timestamps])
+        except Exception as e:
+            log.error(f"Error loading snapshot history for {platform}: {e}")
+            return []
+
+        # 快照内容可能已先于索引过期
+        return [snapshot for snapshot in map(_decode, values) if snapshot is not None]
+
+    def first_and_latest(self, platform: str, since: int) -> Tuple[Optional[Dict[str, Any]], Optional[Dict[str, Any]]]:
+        """获取 since 之后最早的快照和最新快照，用于计算变化趋势"""
+        try:
+            client = cache.get_redis_client()
+            first = client.zrangebyscore(INDEX_KEY.format(platform), since, "+inf", start=0, num=1)
+            if not first:
+                return None, None
+            first_snapshot = _decode(client.get(SNAPSHOT_KEY.format(platform, int(first[0]))))
+        except Exception as e:
+            log.error(f"Error loading snapshots for {platform}: {e}")
+            return None, None
+        return first_snapshot, self.latest(platform)
+
+
+snapshot_store = SnapshotStore()
@@ -0,0 +1,48 @@
+from typing import Dict, Optional
+
+from app.core import cache
+from app.utils.logger import log
+
+# 多策略抓取中各策略的统计，字段为 "{平台}:{策略}:{runs|wins|latency}"
+STRATEGY_STATS_KEY = "crawler:strategy_stats"
+
+# 耗时的滑动平均系数
+LATENCY_ALPHA = 0.3
+
+
+def record_attempt(platform: str, strategy: str, won: bool, latency: Optional[float]):
+    """记录一次策略执行：是否胜出，以及完成耗时（被放弃时为 None）"""
+    prefix = f"{platform}:{strategy}"
+    try:
+        client = cache.get_redis_client()
+        if latency is not None:
+            previous = client.hget(STRATEGY_STATS_KEY, f"{prefix}:latency")
+            if previous is not None:
+                latency = LATENCY_ALPHA * latency + (1 - LATENCY_ALPHA) * float(previous)
+        pipe = client.pipeline(transaction=False)
+        pipe.hincrby(STRATEGY_STATS_KEY, f"{prefix}:runs", 1)
+        if won:
+            pipe.hincrby(STRATEGY_STATS_KEY, f"{prefix}:wins", 1)
+        if latency is not None:
+            pipe.hset(STRATEGY_STATS_KEY, f"{prefix}:latency", f"{latency:.3f}")
+        pipe.execute()
+    except Exception as e:
+        log.error(f"Error recording strategy stats for {prefix}: {e}")
+
+
+def get_strategy_stats(platform: str) -> Dict[str, Dict[str, float]]:
+    """获取平台各策略的执行次数、胜出次数、胜率和平均耗时（秒）"""
+    stats: Dict[str, Dict[str, float]] = {}
+    for field, value in cache.hgetall(STRATEGY_STATS_KEY).items():
+        if isinstance(field, bytes):
+            field = field.decode("utf-8")
+        name, _, metric = field.rpartition(":")
+        field_platform, _, strategy = name.partition(":")
+        if field_platform != platform:
+            continue
+        stats.setdefault(strategy, {"runs": 0, "wins": 0, "latency": None})[metric] = float(value)
+
+    for strategy_stats in stats.values():
+        runs = strategy_stats["runs"]
+        strategy_stats["win_rate"] = strategy_stats["wins"] / runs if runs else 0.0
+    return stats
@@ -0,0 +1,201 @@
+import os
+import time
+import signal
+import threading
+import traceback
+import multiprocessing
+from typing import List, Dict, Any, Optional
+
+from app.core.config import get_crawler_config, get_scheduler_config
+from app.utils.logger import log
+
+# 获取配置
+crawler_config = get_crawler_config()
+scheduler_config = get_scheduler_config()
+
+# 工作进程返回的结果类型
+RESULT_OK = "ok"
+RESULT_NOT_MODIFIED = "not_modified"
+RESULT_ERROR = "error"
+
+
+class WorkerTimeoutError(Exception):
+    """爬虫在工作进程中执行超时，工作进程已被终止"""
+    pass
+
+
+class WorkerCrashError(Exception):
+    """工作进程意外退出"""
+    pass
+
+
+def _worker_main(conn, max_jobs: int):
+    """工作进程主循环：接收爬虫任务，执行后把结果发回主进程"""
+    # 独立进程组，超时时连同 chromedriver/Chrome 子进程一起终止
+    if hasattr(os, "setsid"):
+        os.setsid()
+
+    from app.services import crawler_factory
+    from app.services.sites.crawler import AsyncCrawler, NotModified
+
+    try:
+        for _ in range(max_jobs):
+            job = conn.recv()
+            if job is None:
+                break
+
+            crawler_name, date_str = job
+            try:
+                crawler = crawler_factory[crawler_name]
+                if isinstance(crawler, AsyncCrawler):
+                    news_list = crawler.fetch_sync(date_str)
+                else:
+                    news_list = crawler.fetch(date_str)
+                conn.send((RESULT_OK, news_list))
+            except NotModified:
+                conn.send((RESULT_NOT_MODIFIED, None))
+            except Exception as e:
+                conn.send((RESULT_ERROR, f"{e}\n{traceback.format_exc()}"))
+    except (EOFError, KeyboardInterrupt):
+        pass
+    finally:
+        # 进程退出前释放浏览器
+        from app.services.browser_manager import BrowserManager
+        if BrowserManager._instance is not None:
+            BrowserManager().shutdown()
+
+
+class WorkerProcess:
+    """单个工作进程及其通信管道"""
+
+    def __init__(self, context, max_jobs: int):
+        self.conn, child_conn = context.Pipe()
+        self.process = context.Process(target=_worker_main, args=(child_conn, max_jobs), daemon=True)
+        self.process.start()
+        child_conn.close()
+        self.max_jobs = max_jobs
+        self.jobs_done = 0
+
+    @property
+    def exhausted(self) -> bool:
+        return self.jobs_done >= self.max_jobs or not self.process.is_alive()
+
+    def kill(self):
+        """强制终止工作进程及其进程组"""
+        try:
+            if hasattr(os, "killpg"):
+                os.killpg(self.process.pid, signal.SIGKILL)
+            else:
+                self.process.kill()
+        except (ProcessLookupError, PermissionError):
+            self.process.kill()
+        self.process.join(timeout=5)
+        self.conn.close()
+
+    def stop(self):
+        """通知工作进程正常退出"""
+        try:
+            self.conn.send(None)
+            self.process.join(timeout=5)
+        except (OSError, BrokenPipeError):
+            pass
+        if self.process.is_alive():
+            self.kill()
+        else:
+            self.conn.close()
+
+
+class CrawlerWorkerPool:
+    """受监管的爬虫进程池
+
+    每个任务独占一个工作进程，超过截止时间时直接终止该进程（包括其启动的浏览器），
+    真正释放套接字和内存；工作进程执行固定数量的任务后自动回收，限制内存增长。
+    """
+
+    def __init__(self, size: int, max_jobs_per_worker: int):
+        self.size = size
+        self.max_jobs_per_worker = max_jobs_per_worker
+        self._context = multiprocessing.get_context("spawn")
+        self._slots = threading.BoundedSemaphore(size)
+        self._lock = threading.Lock()
+        self._idle: List[WorkerProcess] = []
+
+    def _checkout(self) -> WorkerProcess:
+        with self._lock:
+            while self._idle:
+                worker = self._idle.pop()
+                if not worker.exhausted:
+                    return worker
+                worker.stop()
+        return WorkerProcess(self._context, self.max_jobs_per_worker)
+
+    def _checkin(self, worker: WorkerProcess):
+        if worker.exhausted:
+            log.info(f"Recycling crawler worker {worker.process.pid} after {worker.jobs_done} jobs")
+            worker.stop()
+            return
+        with self._lock:
+            self._idle.append(worker)
+
+    def run(self, crawler_name: str, date_str: str, timeout: float) -> Optional[List[Dict[str, Any]]]:
+        """在工作进程中执行爬虫，阻塞直到完成或超时
+
+        返回 None 表示上游内容未变化。timeout 包含等待空闲工作进程的时间。
+        """
+        deadline = time.monotonic() + timeout
+        if not self._slots.acquire(timeout=max(timeout, 0)):
+            raise WorkerTimeoutError(f"crawler {crawler_name} timed out after {timeout:.0f} seconds "
+                                     f"waiting for a worker")
+        try:
+            worker = self._checkout()
+            try:
+                worker.conn.send((crawler_name, date_str))
+                if not worker.conn.poll(max(deadline - time.monotonic(), 0)):
+                    log.error(f"Crawler {crawler_name} exceeded {timeout:.0f}s, "
+                              f"killing worker {worker.process.pid}")
+                    worker.kill()
+                    raise WorkerTimeoutError(f"crawler {crawler_name} timed out after {timeout:.0f} seconds")
+                status, payload = worker.conn.recv()
+            except (EOFError, OSError, BrokenPipeError) as e:
+                worker.kill()
+                raise WorkerCrashError(f"worker for crawler {crawler_name} exited unexpectedly: {e}")
+
+            worker.jobs_done += 1
+            self._checkin(worker)
+        finally:
+            self._slots.release()
+
+        if status == RESULT_NOT_MODIFIED:
+            return None
+        if status == RESULT_ERROR:
+            raise RuntimeError(payload)
+        return payload
+
+    def shutdown(self):
+        """停止所有空闲的工作进程"""
+        with self._lock:
+            idle, self._idle = self._idle, []
+        for worker in idle:
+            worker.stop()
+
+
+_worker_pool: Optional[CrawlerWorkerPool] = None
+_pool_lock = threading.Lock()
+
+
+def get_worker_pool() -> CrawlerWorkerPool:
+    """获取全局爬虫进程池"""
+    global _worker_pool
+    if _worker_pool is None:
+        with _pool_lock:
+            if _worker_pool is None:
+                _worker_pool = CrawlerWorkerPool(
+                    size=scheduler_config.process_pool_size,
+                    max_jobs_per_worker=crawler_config.worker_max_jobs
+                )
+    return _worker_pool
+
+
+def shutdown_worker_pool():
+    if _worker_pool is not None:
+        _worker_pool.shutdown()
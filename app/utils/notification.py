@@ -167,7 +167,8 @@ class DingTalkNotifier:
     
     def send_crawler_summary(self, success_count: int, total_count: int, 
                            failed_crawlers: List[str], duration: float, 
-                           date_str: str) -> bool:
+                           date_str: str, timings: Optional[Dict[str, float]] = None,
+                           skipped_count: int = 0) -> bool:
         """发送爬虫执行摘要通知"""
         # 全部成功且未启用正常通知时，不发送
         if success_count == total_count and not self.notify_success:
@@ -178,6 +179,18 @@ class DingTalkNotifier:
         # 构建失败爬虫列表
         failed_list = "\n".join([f"- {name}" for name in failed_crawlers]) if failed_crawlers else ""
         
+        # 构建各爬虫耗时列表（按耗时从高到低）
+        timing_text = ""
+        if timings:
+            timing_list = "\n".join([
+                f"- {name}: {elapsed:.2f}秒"
+                for name, elapsed in sorted(timings.items(), key=lambda x: x[1], reverse=True)
+            ])
+            timing_text = f"\n\n**各爬虫耗时**:\n{timing_list}"
+        
+        # 未变化而跳过写入的比例
+        skip_rate = skipped_count / total_count * 100 if total_count else 0
+        
         if failed_crawlers:
             title = f"🚨 爬虫执行摘要 - {date_str}"
         else:
@@ -192,10 +205,11 @@ class DingTalkNotifier:
 **日期**: {date_str}\n
 **执行时长**: {duration:.2f}秒\n
 **成功**: {success_count}/{total_count}\n
+**未变化跳过**: {skipped_count}/{total_count} ({skip_rate:.0f}%)\n
 **失败**: {len(failed_crawlers)}
 
 **失败的爬虫**:
-{failed_list}
+{failed_list}{timing_text}
 
 请关注失败的爬虫状态！
             """.strip()
@@ -207,7 +221,8 @@ class DingTalkNotifier:
 **日期**: {date_str}\n
 **执行时长**: {duration:.2f}秒\n
 **成功**: {success_count}/{total_count}\n
-**失败**: {len(failed_crawlers)}
+**未变化跳过**: {skipped_count}/{total_count} ({skip_rate:.0f}%)\n
+**失败**: {len(failed_crawlers)}{timing_text}
 
 所有爬虫执行成功！
             """.strip()
@@ -272,10 +287,12 @@ class NotificationManager:
     
     def notify_crawler_summary(self, success_count: int, total_count: int, 
                              failed_crawlers: List[str], duration: float, 
-                             date_str: str):
+                             date_str: str, timings: Optional[Dict[str, float]] = None,
+                             skipped_count: int = 0):
         """通知爬虫执行摘要"""
         self.dingtalk.send_crawler_summary(success_count, total_count, 
-                                         failed_crawlers, duration, date_str)
+                                         failed_crawlers, duration, date_str, timings,
+                                         skipped_count)
     
     def notify_analysis_error(self, error_msg: str, date_str: str):
         """通知数据分析错误"""
@@ -0,0 +1,89 @@
+import signal
+import threading
+
+from app.core import db, cache
+from app.core.config import get_crawler_config
+from app.utils.logger import log
+
+# 获取爬虫配置
+crawler_config = get_crawler_config()
+
+
+def shutdown_crawling():
+    """停止调度器、爬虫事件循环、爬虫工作进程和浏览器"""
+    from app.services import http_client
+    from app.services.crawler import shutdown_scheduler
+    from app.services.worker_pool import shutdown_worker_pool
+    from app.services.browser_manager import BrowserManager
+
+    try:
+        shutdown_scheduler()
+    except Exception as e:
+        log.error(f"Error shutting down scheduler: {e}")
+
+    # 关闭共享HTTP客户端并停止爬虫事件循环
+    try:
+        http_client.shutdown()
+    except Exception as e:
+        log.error(f"Error shutting down crawl loop: {e}")
+
+    # 停止爬虫工作进程
+    try:
+        shutdown_worker_pool()
+        log.info("Crawler worker pool shutdown")
+    except Exception as e:
+        log.error(f"Error shutting down crawler worker pool: {e}")
+
+    # 关闭浏览器管理器（未使用过浏览器时无需创建）
+    try:
+        if BrowserManager._instance is not None:
+            BrowserManager().shutdown()
+            log.info("Browser manager shutdown")
+    except Exception as e:
+        log.error(f"Error shutting down browser manager: {e}")
+
+
+def run_worker(consumer_only: bool = False):
+    """爬虫 worker 主流程，收到 SIGINT/SIGTERM 后退出
+
+    默认负责调度、抓取和数据分析；consumer_only 时只从任务队列领取抓取任务执行，
+    用于在多台机器上扩展抓取能力（crawler.dispatch 为 queue 时）。
+    """
+    log.info(f"Crawler worker startup, consumer only: {consumer_only}")
+
+    db.init_db()
+    cache.init_cache()
+
+    import app.services.crawler as crawler
+    if not consumer_only:
+        crawler.start_scheduler()
+
+    stop_event = threading.Event()
+
+    def handle_signal(signum, frame):
+        log.info(f"Received signal {signum}, stopping crawler worker")
+        stop_event.set()
+
+    signal.signal(signal.SIGINT, handle_signal)
+    signal.signal(signal.SIGTERM, handle_signal)
+
+    consumer = None
+    if consumer_only or crawler_config.dispatch == "queue":
+        consumer = threading.Thread(target=crawler.consume_crawl_jobs, args=(stop_event,),
+                                    name="crawl-consumer", daemon=True)
+        consumer.start()
+
+    if not consumer_only:
+        # 启动后立即完整抓取一次，之后由各平台的定时任务接管
+        threading.Thread(target=crawler.crawlers_logic, daemon=True).start()
+
+    while not stop_event.wait(1):
+        pass
+
+    log.info("Crawler worker shutdown")
+    if consumer is not None:
+        # 执行中的任务未确认时，超过可见性超时后会被其他 worker 重新领取
+        consumer.join(timeout=crawler_config.queue_poll_interval + 5)
+    shutdown_crawling()
+    db.close_db()
+    cache.close_cache()
@@ -0,0 +1,18 @@
+# render.py
+import os
+import sys
+import argparse
+
+sys.path.insert(0, os.path.abspath(os.path.dirname(__file__)))
+
+from app.core.config import load_config
+load_config()
+
+from app.services.render_service import run_render_server
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Page render service")
+    parser.add_argument("--host", default=None, help="监听地址，默认取 crawler.render_url")
+    parser.add_argument("--port", type=int, default=None, help="监听端口，默认取 crawler.render_url")
+    args = parser.parse_args()
+    run_render_server(args.host, args.port)
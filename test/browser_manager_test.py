@@ -0,0 +1,198 @@
+import os
+import sys
+import json
+import threading
+
+import pytest
+
+# 添加项目根目录到系统路径
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+pytest.importorskip("selenium")
+
+from app.services import browser_manager
+from app.services.browser_manager import BrowserManager, BrowserPoolTimeout, BLOCKABLE_RESOURCES
+
+
+class FakeProcess:
+    pid = 0
+
+    def __init__(self):
+        self.exited = False
+
+    def poll(self):
+        return 1 if self.exited else None
+
+
+class FakeService:
+    def __init__(self):
+        self.process = FakeProcess()
+
+
+class FakeDriver:
+    def __init__(self):
+        self.service = FakeService()
+        self.quit_called = False
+        self.url = None
+        self.blocked = None
+        self.log = []
+        self.elements = set()
+        self.page_source = "<html></html>"
+
+    def get(self, url):
+        self.url = url
+        self.log = [
+            {"message": json.dumps({"message": {"method": method, "params": params}})}
+            for method, params in [
+                ("Network.requestWillBeSent", {}),
+                ("Network.loadingFinished", {"encodedDataLength": 2048}),
+                ("Network.requestWillBeSent", {}),
+                ("Network.loadingFailed", {"blockedReason": "inspector"}),
+            ]
+        ]
+
+    def execute_cdp_cmd(self, cmd, params):
+        if cmd == "Network.setBlockedURLs":
+            self.blocked = params["urls"]
+
+    def get_log(self, log_type):
+        entries, self.log = self.log, []
+        return entries
+
+    def execute_script(self, script, *args):
+        if self.service.process.exited:
+            raise RuntimeError("chromedriver exited")
+        if script == browser_manager._EXTRACT_SCRIPT:
+            self.extracted = args
+            return [{"title": "a"}]
+        if "querySelector" in script:
+            return args[0] in self.elements
+        return 1
+
+    def find_elements(self, by, value):
+        return []
+
+    def quit(self):
+        self.quit_called = True
+
+
+@pytest.fixture
+def manager(monkeypatch):
+    """不安装 ChromeDriver、不启动监控线程的浏览器池"""
+    monkeypatch.setattr(browser_manager.crawler_config, "browser_pool_size", 2)
+    monkeypatch.setattr(browser_manager.crawler_config, "browser_max_pages", 3)
+    monkeypatch.setattr(browser_manager.crawler_config, "browser_prewarm", 2)
+    instance = object.__new__(BrowserManager)
+    instance._init_pool()
+    created = []
+
+    def create_driver(slot):
+        driver = FakeDriver()
+        created.append(driver)
+        return driver
+
+    monkeypatch.setattr(instance, "_create_driver", create_driver)
+    instance.created = created
+    return instance
+
+
+def test_pool_is_bounded_and_reuses_drivers(manager):
+    first = manager.checkout()
+    second = manager.checkout()
+    with pytest.raises(BrowserPoolTimeout):
+        manager.checkout(timeout=0.05)
+
+    manager.checkin(first)
+    assert manager.checkout(timeout=0.05) is first
+    assert len(manager.created) == 2
+    manager.checkin(first)
+    manager.checkin(second)
+
+
+def test_checkout_waits_for_checkin(manager):
+    leases = [manager.checkout(), manager.checkout()]
+    threading.Timer(0.05, manager.checkin, args=(leases[0],)).start()
+    assert manager.checkout(timeout=2) is leases[0]
+
+
+def test_driver_is_recycled_after_max_pages(manager):
+    for _ in range(3):
+        with manager.page("https://example.com"):
+            pass
+    assert manager.created[0].quit_called
+    with manager.page("https://example.com") as driver:
+        assert driver is manager.created[1]
+
+
+def test_unhealthy_driver_is_replaced(manager):
+    pooled = manager.checkout()
+    manager.checkin(pooled)
+    pooled.driver.service.process.exited = True
+
+    replacement = manager.checkout()
+    assert replacement is not pooled
+    assert pooled.driver.quit_called
+    assert manager._total == 1
+
+
+def test_prewarm_and_shutdown(manager):
+    assert manager.prewarm() == 2
+    assert manager.prewarm() == 0
+    assert len(manager._idle) == 2
+
+    manager.shutdown()
+    assert all(driver.quit_called for driver in manager.created)
+    with pytest.raises(BrowserPoolTimeout):
+        manager.checkout(timeout=0)
+
+
+def test_page_blocks_resources_except_allowed(manager):
+    with manager.page("https://example.com", allow=("font",)) as driver:
+        assert "*.png*" in driver.blocked
+        assert not set(BLOCKABLE_RESOURCES["font"]) & set(driver.blocked)
+
+
+def test_network_summary(manager):
+    driver = FakeDriver()
+    driver.get("https://example.com")
+    summary = manager.network_summary(manager._network_events(driver))
+    assert summary == {"requests": 2, "bytes": 2048, "blocked": 1, "cached": 0}
+
+
+def test_wait_ready_on_selector(manager):
+    driver = FakeDriver()
+    assert not manager.wait_ready(driver, selector=".item", max_wait=0.2)
+    driver.elements.add(".item")
+    assert manager.wait_ready(driver, selector=".item", max_wait=0.2)
+
+
+def test_wait_ready_on_network_idle(manager, monkeypatch):
+    monkeypatch.setattr(browser_manager.crawler_config, "browser_network_idle", 0.1)
+    driver = FakeDriver()
+    driver.log = [{"message": json.dumps({"message": {"method": "Network.requestWillBeSent",
+                                                      "params": {"requestId": "1"}}})}]
+    # 请求一直未完成，直到超时
+    assert not manager.wait_ready(driver, network_idle=True, max_wait=0.3)
+
+    driver.log = [{"message": json.dumps({"message": {"method": "Network.requestWillBeSent",
+                                                      "params": {"requestId": "2"}}})},
+                  {"message": json.dumps({"message": {"method": "Network.loadingFinished",
+                                                      "params": {"requestId": "2"}}})}]
+    events = []
+    assert manager.wait_ready(driver, network_idle=True, max_wait=1, events=events)
+    assert len(events) == 2
+
+
+def test_extract_runs_one_script_with_normalized_fields(manager):
+    driver = FakeDriver()
+    rows = manager.extract(driver, "tr.athing", {"title": ".titleline a", "score": {"selector": ".score", "next": True}})
+    assert rows == [{"title": "a"}]
+    assert driver.extracted == ("tr.athing", {"title": {"selector": ".titleline a"},
+                                              "score": {"selector": ".score", "next": True}})
+
+
+def test_render_job(manager):
+    assert manager.render("https://example.com") == {"url": "https://example.com", "html": "<html></html>"}
+    result = manager.render("https://example.com", click="//a", extract={"rows": [".a", ".b"], "fields": {"title": "h3"}})
+    assert result == {"url": "https://example.com", "rows": [{"title": "a"}]}
+    assert manager.created[0].extracted == (".a", {"title": {"selector": "h3"}})
@@ -0,0 +1,115 @@
+import os
+import sys
+import asyncio
+
+import pytest
+
+# 添加项目根目录到系统路径
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.services import circuit_breaker
+from app.services.circuit_breaker import CircuitBreaker, STATE_OPEN, STATE_HALF_OPEN, STATE_CLOSED
+
+pytestmark = pytest.mark.usefixtures("fake_redis")
+
+
+def test_opens_after_consecutive_failures():
+    breaker = CircuitBreaker("test")
+    for _ in range(breaker.failure_threshold - 1):
+        breaker.record_failure()
+        assert breaker.allow_request()
+
+    breaker.record_failure()
+    assert breaker._load()["state"] == STATE_OPEN
+    assert not breaker.allow_request()
+
+
+def test_state_survives_new_instance():
+    breaker = CircuitBreaker("test")
+    for _ in range(breaker.failure_threshold):
+        breaker.record_failure()
+
+    assert not CircuitBreaker("test").allow_request()
+
+
+def test_half_open_probe(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(circuit_breaker.time, "time", lambda: now[0])
+
+    breaker = CircuitBreaker("test")
+    for _ in range(breaker.failure_threshold):
+        breaker.record_failure()
+
+    # 等待期结束后放行一次探测，探测失败则等待期加倍
+    now[0] += breaker.reset_timeout
+    assert breaker.allow_request()
+    assert breaker._load()["state"] == STATE_HALF_OPEN
+    breaker.record_failure()
+    state = breaker._load()
+    assert state["state"] == STATE_OPEN
+    assert state["reset_timeout"] == min(breaker.reset_timeout * 2, breaker.max_reset_timeout)
+
+    # 探测成功后恢复
+    now[0] += state["reset_timeout"]
+    assert breaker.allow_request()
+    breaker.record_success()
+    assert breaker._load()["state"] == STATE_CLOSED
+
+
+def test_only_one_probe_while_half_open(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(circuit_breaker.time, "time", lambda: now[0])
+
+    breaker = CircuitBreaker("test")
+    for _ in range(breaker.failure_threshold):
+        breaker.record_failure()
+
+    # 多个进程同时到期，只有抢到探测名额的一个放行
+    now[0] += breaker.reset_timeout
+    assert [CircuitBreaker("test").allow_request() for _ in range(3)] == [True, False, False]
+    assert not CircuitBreaker("test").allow_request()
+
+    breaker.record_success()
+    assert all(CircuitBreaker("test").allow_request() for _ in range(3))
+
+
+def test_probe_released_after_failed_probe(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(circuit_breaker.time, "time", lambda: now[0])
+
+    breaker = CircuitBreaker("test")
+    for _ in range(breaker.failure_threshold):
+        breaker.record_failure()
+    now[0] += breaker.reset_timeout
+    assert breaker.allow_request()
+    breaker.record_failure()
+
+    now[0] += breaker._load()["reset_timeout"]
+    assert CircuitBreaker("test").allow_request()
+
+
+def test_probe_released_when_result_is_discarded(monkeypatch):
+    from app.services import crawler as crawler_service
+    from app.services.publisher import Publication
+    from app.services.sites.crawler import AsyncCrawler
+
+    class ProbeCrawler(AsyncCrawler):
+        async def fetch(self, date_str):
+            return [{"title": "a"}]
+
+        def crawler_name(self):
+            return "test"
+
+    now = [1000.0]
+    monkeypatch.setattr(circuit_breaker.time, "time", lambda: now[0])
+    breaker = CircuitBreaker("test")
+    for _ in range(breaker.failure_threshold):
+        breaker.record_failure()
+    now[0] += breaker.reset_timeout
+
+    # 探测请求抓取成功，但已不再是 leader，结果被丢弃
+    rejected = Publication("2024-01-01", lambda writes, watch=(): False)
+    status = asyncio.run(crawler_service.safe_fetch("test", ProbeCrawler(), "2024-01-01", None, rejected))
+    assert status == crawler_service.FETCH_NOT_LEADER
+    assert breaker._load()["state"] == STATE_CLOSED
+    assert CircuitBreaker("test").allow_request()
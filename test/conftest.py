@@ -0,0 +1,21 @@
+import os
+import sys
+
+import pytest
+
+# 添加项目根目录到系统路径
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.core import cache
+
+
+@pytest.fixture
+def fake_redis(monkeypatch):
+    """用 fakeredis 替换 Redis 连接，未安装 fakeredis 时跳过测试
+
+    需要 Redis 的测试模块通过 pytestmark = pytest.mark.usefixtures("fake_redis") 启用。
+    """
+    fakeredis = pytest.importorskip("fakeredis")
+    client = fakeredis.FakeRedis()
+    monkeypatch.setattr(cache, "get_redis_client", lambda: client)
+    return client
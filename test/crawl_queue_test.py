@@ -0,0 +1,66 @@
+import os
+import sys
+
+import pytest
+
+# 添加项目根目录到系统路径
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.services import crawl_queue
+from app.services.crawl_queue import CrawlQueue
+
+pytestmark = pytest.mark.usefixtures("fake_redis")
+
+
+def test_one_job_per_platform():
+    queue = CrawlQueue(visibility_timeout=60, max_deliveries=3)
+    assert queue.enqueue("baidu", "2024-01-01")
+    assert not queue.enqueue("baidu", "2024-01-01")
+
+    job = queue.claim()
+    assert job["platform"] == "baidu" and job["attempts"] == 1
+    # 执行中的任务不可见，也不会被重复加入
+    assert queue.claim() is None
+    assert not queue.enqueue("baidu", "2024-01-01")
+
+    assert queue.ack(job, "updated", 1.5)
+    assert queue.size() == 0
+    assert queue.drain_results() == [
+        {"platform": "baidu", "date": "2024-01-01", "status": "updated", "elapsed": 1.5, "attempts": 1}
+    ]
+    assert queue.drain_results() == []
+
+
+def test_redelivered_after_visibility_timeout(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(crawl_queue.time, "time", lambda: now[0])
+    queue = CrawlQueue(visibility_timeout=60, max_deliveries=2)
+    queue.enqueue("weibo", "2024-01-01")
+
+    stale = queue.claim()
+    # 领取者崩溃，超时后任务重新可见
+    now[0] += 61
+    job = queue.claim()
+    assert job["attempts"] == 2
+
+    # 过期回执不能写入和确认
+    assert not queue.fenced_write(stale, lambda pipe: pipe.set("data", "stale"))
+    assert not queue.ack(stale, "updated")
+    assert queue.fenced_write(job, lambda pipe: pipe.set("data", "fresh"))
+    assert queue.ack(job, "updated")
+
+
+def test_dropped_after_max_deliveries(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(crawl_queue.time, "time", lambda: now[0])
+    queue = CrawlQueue(visibility_timeout=60, max_deliveries=1)
+    queue.enqueue("douyin", "2024-01-01")
+
+    assert queue.claim() is not None
+    now[0] += 61
+    assert queue.claim() is None
+    assert queue.size() == 0
+    # 放弃的任务写入失败结果，leader 仍能据此更新熔断器和抓取间隔
+    [result] = queue.drain_results()
+    assert result["platform"] == "douyin" and result["status"] == "failed"
+    assert result["reason"] == "max_deliveries" and result["attempts"] == 1
@@ -0,0 +1,31 @@
+import os
+import sys
+
+import pytest
+
+# 添加项目根目录到系统路径
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.services import crawl_schedule
+
+pytestmark = pytest.mark.usefixtures("fake_redis")
+
+
+@pytest.fixture(autouse=True)
+def schedule_config(monkeypatch):
+    monkeypatch.setattr(crawl_schedule.crawler_config, "interval", 600)
+
+
+def test_change_ratio_is_normalized_by_elapsed_time():
+    # 每分钟抓取变化 30% 的平台，比每半小时抓取变化 60% 的平台变化快得多
+    fast = crawl_schedule.record_change("fast", 0.3, elapsed=60)
+    slow = crawl_schedule.record_change("slow", 0.6, elapsed=1800)
+    assert fast == pytest.approx(3.0)
+    assert slow == pytest.approx(0.2)
+
+    intervals = crawl_schedule.compute_intervals(["fast", "slow"])
+    assert intervals["fast"] < intervals["slow"]
+
+
+def test_ratio_without_previous_snapshot_uses_base_interval():
+    assert crawl_schedule.record_change("new", 0.4) == pytest.approx(0.4)
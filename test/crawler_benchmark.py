@@ -0,0 +1,120 @@
+"""爬虫离线基准：回放 fixture 中的响应，统计每个爬虫的解析耗时和吞吐
+
+    python test/crawler_benchmark.py [--repeat N] [--only weibo,douban]
+    python test/crawler_benchmark.py --record [--only weibo]   # 访问线上站点，重新录制 fixture
+
+ms/parse 为一次 fetch 的耗时（请求由回放传输直接返回，主要是响应解码和解析），
+items/s 为每秒解析出的条目数。
+"""
+import os
+import sys
+import time
+import glob
+import asyncio
+import argparse
+
+import fakeredis
+
+# 添加项目根目录到系统路径
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.core import cache
+from app.core.config import get_crawler_config
+from app.services import http_client
+from app.services.replay import Cassette, replay, record
+from app.services.sites.crawler import AsyncCrawler
+from app.services.sites.factory import CrawlerRegistry
+
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures", "crawlers")
+
+
+def fixture_path(name: str) -> str:
+    return os.path.join(FIXTURES_DIR, f"{name}.json")
+
+
+def load_cassette() -> Cassette:
+    return Cassette.load(*sorted(glob.glob(os.path.join(FIXTURES_DIR, "*.json"))))
+
+
+def load_crawlers() -> CrawlerRegistry:
+    """内置爬虫，在第一次取用时创建，不包含第三方爬虫"""
+    return CrawlerRegistry(plugins=False)
+
+
+def fetch(crawler, repeat: int = 1):
+    """执行 repeat 次抓取，返回最后一次的结果和每次的耗时"""
+    timings = []
+    if isinstance(crawler, AsyncCrawler):
+        async def run():
+            try:
+                result = None
+                for _ in range(repeat):
+                    start = time.perf_counter()
+                    result = await crawler.fetch("")
+                    timings.append(time.perf_counter() - start)
+                return result
+            finally:
+                await http_client.close_client()
+        return asyncio.run(run()), timings
+
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = crawler.fetch("")
+        timings.append(time.perf_counter() - start)
+    return result, timings
+
+
+def isolate():
+    """回放不访问网络，关闭按主机限速和对冲请求，避免把等待计入解析耗时；
+    校验信息、耗时样本和策略统计写入进程内的 fakeredis，不连接也不污染线上 Redis"""
+    crawler_config = get_crawler_config()
+    crawler_config.rate_limit_rate = 0
+    crawler_config.rate_limit_hosts = {}
+    crawler_config.hedge_requests = False
+    client = fakeredis.FakeRedis()
+    cache.get_redis_client = lambda: client
+
+
+def run(names, repeat: int):
+    isolate()
+    cassette = load_cassette()
+    crawlers = load_crawlers()
+    print(f"{len(cassette.exchanges)} recorded responses, best of {repeat}")
+    print(f"{'platform':<14}{'items':>6}{'ms/parse':>11}{'items/s':>11}")
+
+    total_items = 0
+    total_time = 0.0
+    with replay(cassette):
+        for name in names or crawlers:
+            result, timings = fetch(crawlers[name], repeat)
+            best = min(timings)
+            total_items += len(result)
+            total_time += best
+            rate = len(result) / best if best else 0
+            print(f"{name:<14}{len(result):>6}{best * 1000:>11.3f}{rate:>11.0f}")
+
+    print(f"{'total':<14}{total_items:>6}{total_time * 1000:>11.3f}{total_items / total_time:>11.0f}")
+
+
+def record_fixtures(names):
+    crawlers = load_crawlers()
+    for name in names or crawlers:
+        path = fixture_path(name)
+        with record(path, platform=name, note="线上录制"):
+            result, _ = fetch(crawlers[name])
+        print(f"{name:<14}{len(result):>6} items -> {path}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Offline crawler benchmark")
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--only", default="", help="comma-separated platforms")
+    parser.add_argument("--record", action="store_true", help="record fixtures from live sites")
+    args = parser.parse_args()
+
+    platforms = [p.strip() for p in args.only.split(",") if p.strip()]
+    if args.record:
+        record_fixtures(platforms)
+    else:
+        run(platforms, args.repeat)
@@ -0,0 +1,75 @@
+import os
+import sys
+import time
+
+import pytest
+
+# 添加项目根目录到系统路径
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.services.sites.crawler import Crawler
+from app.services.strategy_stats import get_strategy_stats
+
+pytestmark = pytest.mark.usefixtures("fake_redis")
+
+
+class RaceCrawler(Crawler):
+    def fetch(self, date_str):
+        return []
+
+    def crawler_name(self):
+        return "race"
+
+
+def strategy(result, delay=0.0, calls=None, name=None):
+    def run():
+        if calls is not None:
+            calls.append(name)
+        time.sleep(delay)
+        if isinstance(result, Exception):
+            raise result
+        return result
+    return run
+
+
+def test_first_good_result_skips_remaining_strategies():
+    calls = []
+    result = RaceCrawler().race([
+        ("fast", strategy([{"title": "a"}], calls=calls, name="fast")),
+        ("slow", strategy([{"title": "b"}], calls=calls, name="slow")),
+    ], hedge_delay=1)
+    assert result == [{"title": "a"}]
+    assert calls == ["fast"]
+    stats = get_strategy_stats("race")
+    assert stats["fast"]["wins"] == 1 and stats["fast"]["win_rate"] == 1.0
+    assert "slow" not in stats
+
+
+def test_failed_or_empty_strategy_starts_next_immediately():
+    start = time.monotonic()
+    result = RaceCrawler().race([
+        ("broken", strategy(RuntimeError("boom"))),
+        ("empty", strategy([])),
+        ("good", strategy([{"title": "c"}])),
+    ], hedge_delay=5)
+    assert result == [{"title": "c"}]
+    assert time.monotonic() - start < 1
+    stats = get_strategy_stats("race")
+    assert stats["broken"]["runs"] == 1 and stats["broken"]["wins"] == 0
+    assert stats["good"]["wins"] == 1
+
+
+def test_slow_strategy_is_hedged():
+    result = RaceCrawler().race([
+        ("slow", strategy([{"title": "late"}], delay=0.5)),
+        ("hedge", strategy([{"title": "hedge"}])),
+    ], hedge_delay=0.05)
+    assert result == [{"title": "hedge"}]
+    stats = get_strategy_stats("race")
+    # 被放弃的策略只记录执行次数
+    assert stats["slow"]["runs"] == 1 and stats["slow"]["latency"] is None
+    assert stats["hedge"]["latency"] is not None
+
+
+def test_all_strategies_empty():
+    assert RaceCrawler().race([("a", strategy([])), ("b", strategy(None))], hedge_delay=0) == []
@@ -0,0 +1,78 @@
+import os
+import sys
+import subprocess
+
+import pytest
+
+# 添加项目根目录到系统路径
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.services.sites import factory
+from app.services.sites.factory import CrawlerRegistry, BUILTIN_CRAWLERS
+from app.services.sites.crawler import Crawler
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+class PluginCrawler(Crawler):
+    created = 0
+
+    def __init__(self):
+        super().__init__()
+        PluginCrawler.created += 1
+
+    def fetch(self, date_str):
+        return []
+
+    def crawler_name(self):
+        return "plugin"
+
+
+def test_importing_services_constructs_nothing():
+    # 新进程中导入 app.services，检查没有导入任何爬虫模块和 selenium
+    modules = {spec.partition(":")[0] for spec in BUILTIN_CRAWLERS.values()}
+    script = (
+        "import sys; import app.services as s; "
+        "assert len(s.crawler_factory) == %d; assert 'xueqiu' in s.crawler_factory; "
+        "print('loaded:' + ','.join(m for m in %r + ['selenium'] if m in sys.modules))"
+    ) % (len(BUILTIN_CRAWLERS), sorted(modules))
+    output = subprocess.run([sys.executable, "-c", script], cwd=ROOT_DIR, capture_output=True,
+                            text=True, check=True).stdout
+    assert output.strip().splitlines()[-1] == "loaded:"
+
+
+def test_crawler_is_created_once_on_first_use():
+    PluginCrawler.created = 0
+    registry = CrawlerRegistry({"plugin": f"{__name__}:PluginCrawler"}, plugins=False)
+    assert list(registry.keys()) == ["plugin"]
+    assert PluginCrawler.created == 0
+    assert registry["plugin"] is registry.get("plugin")
+    assert PluginCrawler.created == 1
+    assert registry.get("missing") is None
+
+
+def test_plugins_are_discovered(monkeypatch):
+    monkeypatch.setattr(factory, "discover_plugins", lambda: {
+        "plugin": f"{__name__}:PluginCrawler",
+        "baidu": f"{__name__}:PluginCrawler",
+    })
+    registry = CrawlerRegistry()
+    assert "plugin" in registry
+    assert isinstance(registry["plugin"], PluginCrawler)
+    # 与内置爬虫重名的第三方爬虫被忽略
+    assert registry.specs["baidu"] == BUILTIN_CRAWLERS["baidu"]
+
+
+def test_broken_crawler_is_skipped():
+    registry = CrawlerRegistry({
+        "plugin": f"{__name__}:PluginCrawler",
+        "broken": "app.services.sites.missing_module:Missing",
+        "not_crawler": "os:path",
+    }, plugins=False)
+    assert [name for name, _ in registry.items()] == ["plugin"]
+    # 取用失败与平台不存在一样返回 None，队列消费者把任务记为失败
+    assert registry.get("broken") is None
+    with pytest.raises(ImportError):
+        registry["broken"]
+    with pytest.raises(TypeError):
+        registry["not_crawler"]
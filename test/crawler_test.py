@@ -1,11 +1,18 @@
+import os
+import sys
 from datetime import datetime
 
 import pytz
 
+# 添加项目根目录到系统路径
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
 timezone = pytz.timezone('Asia/Shanghai')
 now_time = datetime.now(timezone)
 date_str = now_time.strftime("%Y-%m-%d")
 
+FIXTURE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures", "crawlers", "bilibili.json")
+
 
 class TestCrawler:
 
@@ -13,10 +20,13 @@ class TestCrawler:
         pass
 
     def test_crawler(self):
-        from app.service.sites import BilibiliCrawler
+        from app.services.replay import replay
+        from app.services.sites.bilibili import BilibiliCrawler
 
         crawler = BilibiliCrawler()
-        crawler.fetch(date_str)
+        with replay(FIXTURE):
+            result = crawler.fetch_sync(date_str)
+        assert result
 
 
 if __name__ == '__main__':
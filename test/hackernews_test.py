@@ -26,11 +26,8 @@ def test_hackernews_crawler():
         print("  - 使用requests方式获取失败")
     
     print("\n2. 使用浏览器方式测试:")
-    from app.services.browser_manager import BrowserManager
-    browser_manager = BrowserManager()
-    
     try:
-        result = crawler._fetch_with_browser(browser_manager)
+        result = crawler._fetch_with_browser()
         if result and len(result) > 0:
             print(f"  - 成功获取到 {len(result)} 条新闻")
             print("  - 第一条新闻示例:")
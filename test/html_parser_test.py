@@ -0,0 +1,21 @@
+import os
+import sys
+
+import pytest
+
+# 添加项目根目录到系统路径
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from parse_benchmark import HTML_CRAWLERS, PAGES_DIR, parse_baseline, strip_time
+
+
+@pytest.mark.parametrize("name", sorted(HTML_CRAWLERS))
+def test_fast_parser_matches_full_page_parse(name):
+    with open(os.path.join(PAGES_DIR, f"{name}.html"), encoding="utf-8") as f:
+        html = f.read()
+
+    crawler = HTML_CRAWLERS[name]()
+    result = crawler.parse(html)
+    assert result
+    assert all(news['title'] and news['url'] for news in result)
+    assert strip_time(result) == strip_time(parse_baseline(crawler, html))
@@ -0,0 +1,52 @@
+import os
+import sys
+
+import httpx
+import pytest
+
+# 添加项目根目录到系统路径
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.services import http_client
+from app.services.sites.crawler import AsyncCrawler, NotModified, conditional_fetch, fetched_validators
+
+
+def test_client_outlives_each_run():
+    async def current_client():
+        return http_client.get_client()
+
+    try:
+        first = http_client.run(current_client())
+        # 每个平台任务单独调用 run，连接池在多次调用之间保持
+        assert http_client.run(current_client()) is first
+        assert not first.is_closed
+    finally:
+        http_client.shutdown()
+    assert first.is_closed
+
+
+class ConditionalCrawler(AsyncCrawler):
+    async def fetch(self, date_str):
+        conditional_fetch.set(True)
+        fetched_validators.set({"https://example.com/hot": {"etag": '"v1"', "last_modified": None}})
+        return await self.get("https://example.com/hot")
+
+    def crawler_name(self):
+        return "conditional"
+
+
+@pytest.mark.usefixtures("fake_redis")
+def test_conditional_request_uses_loaded_validators():
+    seen = []
+
+    def handler(request):
+        seen.append(request.headers.get("If-None-Match"))
+        return httpx.Response(304, request=request)
+
+    http_client.set_transport(httpx.MockTransport(handler))
+    try:
+        with pytest.raises(NotModified):
+            ConditionalCrawler().fetch_sync("")
+    finally:
+        http_client.set_transport(None)
+    assert seen == ['"v1"']
@@ -0,0 +1,88 @@
+import os
+import sys
+import time
+import asyncio
+
+import httpx
+import pytest
+
+# 添加项目根目录到系统路径
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.services import http_client, latency_stats
+from app.services.latency_stats import LatencyProfile
+from app.services.sites.crawler import AsyncCrawler
+
+pytestmark = pytest.mark.usefixtures("fake_redis")
+
+
+@pytest.fixture(autouse=True)
+def clear_profiles():
+    latency_stats._profiles.clear()
+
+
+class SlowFirstTransport(httpx.AsyncBaseTransport):
+    """第一个请求很慢，之后的请求立即返回"""
+
+    def __init__(self, delay):
+        self.delay = delay
+        self.requests = 0
+        self.cancelled = False
+
+    async def handle_async_request(self, request):
+        self.requests += 1
+        if self.requests == 1:
+            try:
+                await asyncio.sleep(self.delay)
+            except asyncio.CancelledError:
+                self.cancelled = True
+                raise
+            return httpx.Response(200, text="slow", request=request)
+        return httpx.Response(200, text="hedge", request=request)
+
+
+class LatencyCrawler(AsyncCrawler):
+    async def fetch(self, date_str):
+        return (await self.get("https://example.com/hot")).text
+
+    def crawler_name(self):
+        return "latency"
+
+
+def test_profile_percentiles_and_timeout():
+    profile = LatencyProfile([0.1] * 18 + [0.5, 2.0])
+    assert profile.ready
+    assert profile.p50 == 0.1
+    assert profile.p95 == 0.5
+    # p95 * 3 低于下限时取下限，且不超过爬虫原本的超时
+    assert profile.timeout(10) == 2.0
+    assert LatencyProfile([4.0] * 20).timeout(10) == 10
+    # 对冲等待不低于下限，响应很快的平台不会几乎每个请求都发两次
+    assert profile.hedge_delay() == latency_stats.crawler_config.latency_min_hedge
+    assert LatencyProfile([3.0] * 20).hedge_delay() == 3.0
+
+    not_ready = LatencyProfile([0.1] * 5)
+    assert not_ready.timeout(10) == 10
+    assert not_ready.hedge_delay() is None
+
+
+def test_record_latency_keeps_recent_samples(monkeypatch):
+    monkeypatch.setattr(latency_stats.crawler_config, "latency_samples", 3)
+    for seconds in (1, 2, 3, 4):
+        latency_stats.record_latency("latency", seconds)
+    assert latency_stats.get_profile("latency").count == 3
+
+
+def test_slow_request_is_hedged(monkeypatch):
+    transport = SlowFirstTransport(delay=2)
+    http_client.set_transport(transport)
+    monkeypatch.setattr(latency_stats, "get_profile", lambda platform: LatencyProfile([0.05] * 20))
+    monkeypatch.setattr(latency_stats.crawler_config, "latency_min_hedge", 0.05)
+    try:
+        start = time.monotonic()
+        assert LatencyCrawler().fetch_sync("") == "hedge"
+        assert time.monotonic() - start < 1
+    finally:
+        http_client.set_transport(None)
+    assert transport.requests == 2
+    assert transport.cancelled
@@ -0,0 +1,77 @@
+import os
+import sys
+
+import pytest
+
+# 添加项目根目录到系统路径
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.services.leader import LeaderLock, LEADER_KEY
+
+pytestmark = pytest.mark.usefixtures("fake_redis")
+
+
+def make_lock():
+    return LeaderLock(ttl=30, renew_interval=10, enabled=True)
+
+
+def test_only_one_leader():
+    first, second = make_lock(), make_lock()
+
+    assert first.try_acquire()
+    assert not second.try_acquire()
+    assert first.is_leader and not second.is_leader
+
+    # 已是 leader 时再次尝试即续约
+    assert first.try_acquire()
+
+
+def test_failover_after_lease_expires(fake_redis):
+    first, second = make_lock(), make_lock()
+    assert first.try_acquire()
+
+    # 模拟 leader 宕机后租约过期
+    fake_redis.delete(LEADER_KEY)
+    assert second.try_acquire()
+    assert second.token > first.token
+
+    # 旧 leader 续约失败，失去 leader 身份
+    assert not first.renew()
+    assert not first.is_leader
+
+
+def test_fenced_write_rejects_stale_leader(fake_redis):
+    first, second = make_lock(), make_lock()
+    assert first.try_acquire()
+    assert first.fenced_write(lambda pipe: pipe.set("data", "first"))
+
+    fake_redis.delete(LEADER_KEY)
+    assert second.try_acquire()
+
+    # 过期 leader 的迟到写入被拒绝
+    assert not first.fenced_write(lambda pipe: pipe.set("data", "stale"))
+    assert second.fenced_write(lambda pipe: pipe.set("data", "second"))
+    assert fake_redis.get("data") == b"second"
+
+
+def test_release_allows_immediate_takeover():
+    first, second = make_lock(), make_lock()
+    assert first.try_acquire()
+    first.release()
+    assert second.try_acquire()
+
+
+def test_fenced_write_survives_own_renewal(fake_redis):
+    leader = make_lock()
+    assert leader.try_acquire()
+    renewed = []
+
+    def writes(pipe):
+        # 监视租约键之后、提交之前续约一次
+        if not renewed:
+            renewed.append(leader.renew())
+        pipe.set("data", "leader")
+
+    assert leader.fenced_write(writes)
+    assert renewed == [True]
+    assert fake_redis.get("data") == b"leader"
@@ -0,0 +1,43 @@
+import os
+import sys
+
+import pytest
+
+# 添加项目根目录到系统路径
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.services.sites.news_item import NewsItem, build_items, parse_heat
+
+
+@pytest.mark.parametrize("value, expected", [
+    (4955232, 4955232),
+    ("4955232", 4955232),
+    ("1.2万", 12000),
+    ("3亿", 300000000),
+    ("1,234", 1234),
+    ("123 points", 123),
+    ("2.5k", 2500),
+    ("暂无", None),
+    (None, None),
+    (True, None),
+])
+def test_parse_heat(value, expected):
+    assert parse_heat(value) == expected
+
+
+def test_build_items_normalizes_score_and_rank():
+    items = build_items("douyin", [
+        {"title": "a", "url": "https://x.com/a#top", "content": "热度: 1.2万"},
+        {"title": "b", "url": "https://x.com/b", "score": "350"},
+        {"title": "c", "url": "https://x.com/c", "content": "来源: x | 得分: 88 points | 作者: y"},
+        {"title": "d", "url": "https://x.com/d", "rank": 9, "author": "z"},
+    ])
+
+    assert [(item.rank, item.score) for item in items] == [(1, 12000), (2, 350), (3, 88), (4, None)]
+    assert all(item.platform == "douyin" for item in items)
+    # 链接去掉锚点后作为标识
+    assert items[0].id == NewsItem("douyin", 1, 0, "other", "https://x.com/a").id
+
+    news = items[3].to_dict()
+    assert news["rank"] == 4 and news["author"] == "z" and news["source"] == "douyin"
+    assert not hasattr(items[3], "__dict__")
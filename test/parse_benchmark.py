@@ -0,0 +1,90 @@
+"""HTML 爬虫解析耗时基准
+
+对 test/fixtures/pages 下的页面（或 --pages 指定的目录，文件名为 {平台}.html）分别用
+html.parser 解析整页和当前配置的解析器（lxml + parse_only 子树）解析，输出每个平台的耗时
+和加速比，并校验两种方式解析出的条目一致。
+
+    python test/parse_benchmark.py [--pages DIR] [--repeat N]
+"""
+import os
+import sys
+import time
+import argparse
+from unittest import mock
+
+# 添加项目根目录到系统路径
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.services.sites import crawler as crawler_module
+from app.services.sites.douban import DouBanCrawler
+from app.services.sites.ftpojie import FtPoJieCrawler
+from app.services.sites.hackernews import HackerNewsCrawler
+from app.services.sites.hupu import HuPuCrawler
+from app.services.sites.vtex import VtexCrawler
+
+PAGES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures", "pages")
+
+HTML_CRAWLERS = {
+    "douban": DouBanCrawler,
+    "52pojie": FtPoJieCrawler,
+    "hupu": HuPuCrawler,
+    "v2ex": VtexCrawler,
+    "hackernews": HackerNewsCrawler,
+}
+
+
+def strip_time(news_list):
+    return [{k: v for k, v in news.items() if k != 'publish_time'} for news in news_list]
+
+
+def parse_baseline(crawler, html):
+    """改造前的解析方式：html.parser 构建整页"""
+    with mock.patch.object(crawler_module, "HTML_PARSER", "html.parser"), \
+            mock.patch.object(crawler, "parse_only", None):
+        return crawler.parse(html)
+
+
+def measure(func, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def run(pages_dir: str, repeat: int):
+    print(f"parser: {crawler_module.HTML_PARSER}, pages: {pages_dir}, best of {repeat}")
+    print(f"{'platform':<12}{'size':>9}{'items':>7}{'html.parser':>14}{'fast':>11}{'speedup':>9}")
+
+    total_base = total_fast = 0.0
+    for name, crawler_cls in HTML_CRAWLERS.items():
+        path = os.path.join(pages_dir, f"{name}.html")
+        if not os.path.exists(path):
+            print(f"{name:<12}  (no page)")
+            continue
+        with open(path, encoding="utf-8") as f:
+            html = f.read()
+
+        crawler = crawler_cls()
+        base_time, base_result = measure(lambda: parse_baseline(crawler, html), repeat)
+        fast_time, fast_result = measure(lambda: crawler.parse(html), repeat)
+        if strip_time(base_result) != strip_time(fast_result):
+            raise SystemExit(f"{name}: parsed items differ between parsers")
+
+        total_base += base_time
+        total_fast += fast_time
+        print(f"{name:<12}{len(html) // 1024:>7}KB{len(fast_result):>7}"
+              f"{base_time * 1000:>12.2f}ms{fast_time * 1000:>9.2f}ms{base_time / fast_time:>8.1f}x")
+
+    if total_fast:
+        print(f"{'total':<28}{total_base * 1000:>12.2f}ms{total_fast * 1000:>9.2f}ms"
+              f"{total_base / total_fast:>8.1f}x")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="HTML crawler parse benchmark")
+    parser.add_argument("--pages", default=PAGES_DIR, help="directory of {platform}.html pages")
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+    run(args.pages, args.repeat)
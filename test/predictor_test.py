@@ -0,0 +1,45 @@
+import os
+import sys
+import time
+from datetime import datetime
+
+import pytest
+
+# 添加项目根目录到系统路径
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.analysis.predictor import TrendPredictor
+from app.services.sites.news_item import build_items
+from app.services.snapshot_store import snapshot_store, encode_items
+from app.utils import codec
+
+pytestmark = pytest.mark.usefixtures("fake_redis")
+
+
+def append(client, platform, news_list, hours_ago):
+    pipe = client.pipeline()
+    snapshot_store.append(pipe, platform, codec.dumps(encode_items(build_items(platform, news_list))),
+                          ts=int((time.time() - hours_ago * 3600) * 1000))
+    pipe.execute()
+
+
+def test_peak_and_duration_come_from_snapshots(fake_redis):
+    for hours_ago, heat in ((5, 100), (3, 300), (1, 200)):
+        append(fake_redis, "weibo", [{"title": "话题", "score": heat}, {"title": "新话题", "score": 50 * (6 - hours_ago)}],
+               hours_ago)
+
+    predictor = TrendPredictor()
+    snapshots = {"weibo": snapshot_store.history("weibo")}
+
+    peak_time, duration = predictor._peak_and_duration(predictor._topic_points(snapshots, ["weibo"], "话题"))
+    assert duration == "4.0小时"
+    peak_ts = snapshots["weibo"][1]["ts"]
+    assert peak_time == datetime.fromtimestamp(peak_ts / 1000, predictor.shanghai_tz).strftime("%Y-%m-%d %H:%M")
+
+    # 最新快照热度最高，峰值尚未出现
+    peak_time, _ = predictor._peak_and_duration(predictor._topic_points(snapshots, ["weibo"], "新话题"))
+    assert peak_time == "尚未达到峰值"
+
+    assert predictor._peak_and_duration(predictor._topic_points(snapshots, ["weibo"], "不存在")) == (None, None)
+    assert predictor._peak_and_duration(predictor._keyword_points(snapshots, "话题"))[1] is not None
+
@@ -0,0 +1,116 @@
+import os
+import sys
+
+import pytest
+
+# 添加项目根目录到系统路径
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.services import publisher
+from app.services.leader import LeaderLock
+from app.services.sites.crawler import VALIDATORS_KEY
+from app.services.sites.news_item import build_items
+from app.services.snapshot_store import encode_items
+from app.utils import codec
+
+DATE = "2024-01-01"
+EMPTY_DIFF = {"added": [], "removed": [], "moved": []}
+
+pytestmark = pytest.mark.usefixtures("fake_redis")
+
+
+@pytest.fixture(autouse=True)
+def clear_list_cache():
+    publisher._list_cache.clear()
+
+
+def publish(publication, platform, titles):
+    payload = codec.dumps(encode_items(build_items(platform, [{"title": title} for title in titles])))
+    return publication.publish(platform, payload, publisher.content_digest(payload), EMPTY_DIFF, None)
+
+
+def fence():
+    return LeaderLock(enabled=False).fenced_write
+
+
+def test_lists_are_visible_only_after_commit():
+    publication = publisher.Publication(DATE, fence())
+    assert publish(publication, "weibo", ["a"])
+    assert publish(publication, "zhihu", ["b"])
+    assert publisher.read_news(DATE, ["weibo", "zhihu"]) == (0, {})
+
+    version = publication.commit()
+    read_version, news = publisher.read_news(DATE, ["weibo", "zhihu"])
+    assert read_version == version
+    assert [item["title"] for item in news["weibo"]] == ["a"]
+    assert [item["title"] for item in news["zhihu"]] == ["b"]
+
+
+def test_commit_keeps_other_platforms_and_bumps_version():
+    first = publisher.Publication(DATE, fence())
+    publish(first, "weibo", ["a"])
+    publish(first, "zhihu", ["b"])
+    v1 = first.commit()
+
+    second = publisher.Publication(DATE, fence())
+    publish(second, "weibo", ["c"])
+    v2 = second.commit()
+
+    assert v2 > v1
+    version, news = publisher.read_news(DATE, ["weibo", "zhihu"])
+    assert version == v2
+    assert [item["title"] for item in news["weibo"]] == ["c"]
+    assert [item["title"] for item in news["zhihu"]] == ["b"]
+
+
+def test_stale_publication_does_not_overwrite_newer_list():
+    slow = publisher.Publication(DATE, fence())
+    publish(slow, "weibo", ["old"])
+    fast = publisher.Publication(DATE, fence())
+    publish(fast, "weibo", ["new"])
+    fast.commit()
+
+    slow.commit()
+    _, news = publisher.read_news(DATE, ["weibo"])
+    assert [item["title"] for item in news["weibo"]] == ["new"]
+
+
+def test_rejected_fence_publishes_nothing(fake_redis):
+    publication = publisher.Publication(DATE, LeaderLock(enabled=True).fenced_write)
+    assert not publish(publication, "weibo", ["a"])
+    assert publication.commit() is None
+    assert fake_redis.get(publisher.MANIFEST_POINTER_KEY.format(DATE)) is None
+
+
+def test_legacy_keys_are_read_without_manifest(fake_redis):
+    fake_redis.set(publisher.NEWS_KEY.format("weibo", DATE), codec.dumps([{"title": "a"}]))
+    assert publisher.read_news(DATE, ["weibo", "zhihu"]) == (0, {"weibo": [{"title": "a"}]})
+
+
+def test_legacy_keys_are_read_for_platforms_missing_from_manifest(fake_redis):
+    fake_redis.set(publisher.NEWS_KEY.format("weibo", DATE), codec.dumps([{"title": "old"}]))
+    publication = publisher.Publication(DATE, fence())
+    publish(publication, "zhihu", ["b"])
+    version = publication.commit()
+
+    # 迁移当天只有部分平台重新发布，其余平台仍返回旧键中的数据
+    read_version, news = publisher.read_news(DATE, ["weibo", "zhihu"])
+    assert read_version == version
+    assert news["weibo"] == [{"title": "old"}]
+    assert [item["title"] for item in news["zhihu"]] == ["b"]
+
+
+def test_validators_are_saved_with_commit(fake_redis):
+    validators = {"https://example.com/hot": {"etag": '"v1"', "last_modified": None}}
+    payload = codec.dumps(encode_items(build_items("weibo", [{"title": "a"}])))
+    rejected = publisher.Publication(DATE, lambda writes, watch=(): False)
+    assert not rejected.publish("weibo", payload, publisher.content_digest(payload), EMPTY_DIFF, None, validators)
+    assert fake_redis.hgetall(VALIDATORS_KEY.format("weibo")) == {}
+
+    publication = publisher.Publication(DATE, fence())
+    publication.publish("weibo", payload, publisher.content_digest(payload), EMPTY_DIFF, None, validators)
+    # 提交之前不保存，失败的发布不会让下一轮收到304
+    assert fake_redis.hgetall(VALIDATORS_KEY.format("weibo")) == {}
+    publication.commit()
+    assert fake_redis.hget(VALIDATORS_KEY.format("weibo"), "https://example.com/hot") == b'{"etag": "\\"v1\\"", "last_modified": null}'
+    assert publisher.load_validators("weibo") == validators
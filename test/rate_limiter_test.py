@@ -0,0 +1,153 @@
+import os
+import sys
+import time
+import asyncio
+import threading
+
+import pytest
+
+# 添加项目根目录到系统路径
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.core import cache
+from app.services import rate_limiter as rate_limiter_module
+from app.services.rate_limiter import RateLimiter, RATE_LIMIT_KEY
+
+pytestmark = pytest.mark.usefixtures("fake_redis")
+
+
+@pytest.fixture(autouse=True)
+def rate_limit_config(monkeypatch):
+    config = rate_limiter_module.crawler_config
+    monkeypatch.setattr(config, "rate_limit_rate", 10.0)
+    monkeypatch.setattr(config, "rate_limit_burst", 2)
+    monkeypatch.setattr(config, "rate_limit_hosts", {"xueqiu.com": 5.0})
+    monkeypatch.setattr(config, "host_concurrency", 2)
+
+
+def test_bucket_groups_subdomains():
+    assert RateLimiter.bucket("https://stock.xueqiu.com/v5/a") == ("xueqiu.com", 5.0, 2)
+    assert RateLimiter.bucket("https://xueqiu.com/hot_event") == ("xueqiu.com", 5.0, 2)
+    assert RateLimiter.bucket("https://www.baidu.com/s") == ("www.baidu.com", 10.0, 2)
+
+
+@pytest.mark.parametrize("backend", ["local", "redis"])
+def test_burst_then_rate(backend):
+    limiter = RateLimiter(backend)
+    delays = [limiter.reserve("https://www.baidu.com/s") for _ in range(4)]
+    # 前 burst 个请求立即发送，之后每 0.1 秒一个
+    assert delays[:2] == [0.0, 0.0]
+    assert delays[2] == pytest.approx(0.1, abs=0.01)
+    assert delays[3] == pytest.approx(0.2, abs=0.01)
+    # 其他主机不受影响
+    assert limiter.reserve("https://news.ycombinator.com/") == 0.0
+
+
+def test_redis_bucket_is_shared(fake_redis):
+    first, second = RateLimiter("redis"), RateLimiter("redis")
+    first.reserve("https://xueqiu.com/")
+    first.reserve("https://xueqiu.com/")
+    assert second.reserve("https://xueqiu.com/hot_event") == pytest.approx(0.2, abs=0.01)
+    assert fake_redis.pttl(RATE_LIMIT_KEY.format("xueqiu.com")) > 0
+
+
+def test_redis_unavailable_falls_back_to_local(monkeypatch):
+    def broken():
+        raise ConnectionError("redis down")
+    monkeypatch.setattr(cache, "get_redis_client", broken)
+    limiter = RateLimiter("redis")
+    assert [limiter.reserve("https://xueqiu.com/") for _ in range(3)][2] == pytest.approx(0.2, abs=0.01)
+
+
+def test_redis_failure_is_remembered(monkeypatch):
+    calls = []
+
+    def broken():
+        calls.append(1)
+        raise ConnectionError("redis down")
+    monkeypatch.setattr(cache, "get_redis_client", broken)
+    limiter = RateLimiter("redis")
+    for _ in range(3):
+        asyncio.run(limiter.acquire("https://www.baidu.com/"))
+    # 出错后一段时间内直接使用进程内令牌桶，不再每个请求都连接 Redis
+    assert len(calls) == 1
+
+
+def test_zero_rate_is_unlimited(monkeypatch):
+    monkeypatch.setattr(rate_limiter_module.crawler_config, "rate_limit_rate", 0)
+    limiter = RateLimiter("local")
+    assert all(limiter.reserve("https://www.baidu.com/") == 0.0 for _ in range(10))
+
+
+def test_async_concurrency_cap(monkeypatch):
+    monkeypatch.setattr(rate_limiter_module.crawler_config, "rate_limit_rate", 0)
+    limiter = RateLimiter("local")
+    active, peak = 0, 0
+
+    async def request():
+        nonlocal active, peak
+        async with limiter.limit("https://www.baidu.com/"):
+            active += 1
+            peak = max(peak, active)
+            await asyncio.sleep(0.02)
+            active -= 1
+
+    async def run():
+        await asyncio.gather(*(request() for _ in range(6)))
+
+    asyncio.run(run())
+    assert peak == 2
+
+
+def test_sync_limit_waits_for_token():
+    limiter = RateLimiter("local")
+    start = time.monotonic()
+    for _ in range(3):
+        with limiter.limit_sync("https://xueqiu.com/"):
+            pass
+    # xueqiu.com 每秒 5 个请求，第三个请求在突发之后等待 0.2 秒
+    assert 0.15 < time.monotonic() - start < 0.5
+
+
+def test_concurrency_cap_is_shared_across_loops_and_threads(monkeypatch):
+    monkeypatch.setattr(rate_limiter_module.crawler_config, "rate_limit_rate", 0)
+    limiter = RateLimiter("local")
+    lock = threading.Lock()
+    active, peak = 0, 0
+
+    def enter():
+        nonlocal active, peak
+        with lock:
+            active += 1
+            peak = max(peak, active)
+
+    def leave():
+        nonlocal active
+        with lock:
+            active -= 1
+
+    async def request():
+        async with limiter.limit("https://www.baidu.com/"):
+            enter()
+            await asyncio.sleep(0.05)
+            leave()
+
+    def async_job():
+        async def run():
+            await asyncio.gather(*(request() for _ in range(3)))
+        asyncio.run(run())
+
+    def sync_job():
+        for _ in range(3):
+            with limiter.limit_sync("https://www.baidu.com/"):
+                enter()
+                time.sleep(0.05)
+                leave()
+
+    # 每个平台任务各自运行事件循环，同步爬虫在线程中请求同一主机
+    threads = [threading.Thread(target=job) for job in (async_job, async_job, sync_job)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert peak == 2
@@ -0,0 +1,67 @@
+import os
+import sys
+import threading
+
+import pytest
+
+# 添加项目根目录到系统路径
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.services import render_service
+from app.services.render_service import RenderClient, RenderError, RenderServer, StubRenderer
+from app.services.sites.hackernews import HackerNewsCrawler
+
+HN_URL = "https://news.ycombinator.com/"
+HN_ROWS = [
+    {"id": "1", "title": "Show HN: a", "url": "https://a.example/", "site": "a.example", "metadata": "meta",
+     "score": "120 points", "user": "pg", "comments": "discuss"},
+    {"id": "", "title": "not an item", "url": None, "site": None, "metadata": None,
+     "score": None, "user": None, "comments": None},
+    {"id": "2", "title": "b", "url": "https://b.example/", "site": None, "metadata": None,
+     "score": None, "user": None, "comments": None},
+]
+
+
+@pytest.fixture
+def stub():
+    renderer = StubRenderer({HN_URL: {"rows": HN_ROWS}})
+    render_service.set_renderer(renderer)
+    yield renderer
+    render_service.set_renderer(None)
+
+
+@pytest.fixture
+def client(stub):
+    server = RenderServer(("127.0.0.1", 0), stub)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield RenderClient(f"http://127.0.0.1:{server.server_address[1]}", timeout=5)
+    server.shutdown()
+    server.server_close()
+
+
+def test_client_renders_through_service(client, stub):
+    result = client.render(HN_URL, wait_for="tr.athing", extract={"rows": "tr.athing", "fields": {}})
+    assert result == {"url": HN_URL, "rows": HN_ROWS}
+    assert stub.jobs == [{"url": HN_URL, "wait_for": "tr.athing", "extract": {"rows": "tr.athing", "fields": {}}}]
+    assert client.health()["status"] == "ok"
+
+
+def test_service_errors_surface_as_render_error(client):
+    with pytest.raises(RenderError):
+        client.render("https://missing.example/")
+    response = client.session.post(f"{client.base_url}/render", json={"wait_for": "a"})
+    assert response.status_code == 400
+
+
+def test_unreachable_service_raises_render_error():
+    with pytest.raises(RenderError):
+        RenderClient("http://127.0.0.1:1", timeout=1).render(HN_URL)
+
+
+def test_crawler_uses_renderer(stub):
+    result = HackerNewsCrawler()._fetch_with_browser()
+    assert [news["title"] for news in result] == ["Show HN: a", "b"]
+    assert result[0]["content"] == "来源: a.example | 得分: 120 points | 作者: pg | 评论: 0 comments"
+    assert result[1]["content"] == "来源: "
+    assert stub.jobs[0]["allow"] == []
@@ -0,0 +1,49 @@
+import os
+import sys
+
+import pytest
+
+# 添加项目根目录到系统路径
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from crawler_benchmark import FIXTURES_DIR, fetch, load_cassette, load_crawlers
+from app.services.replay import replay
+from app.services.sites.ftpojie import FtPoJieCrawler
+from app.services.sites.news_item import build_items
+
+PLATFORMS = sorted(name[:-len(".json")] for name in os.listdir(FIXTURES_DIR) if name.endswith(".json"))
+
+
+@pytest.fixture(scope="module")
+def cassette():
+    return load_cassette()
+
+
+@pytest.fixture(scope="module")
+def crawlers():
+    return load_crawlers()
+
+
+def test_every_registered_crawler_has_a_fixture(crawlers):
+    assert sorted(crawlers) == PLATFORMS
+
+
+@pytest.mark.parametrize("name", PLATFORMS)
+def test_crawler_replays_offline(name, cassette, crawlers):
+    with replay(cassette):
+        result, _ = fetch(crawlers[name])
+
+    assert result, f"{name} parsed nothing from its fixture"
+    assert all(news['title'] and news['url'] for news in result)
+    items = build_items(name, result)
+    # 没有提供热度的平台 score 为 None
+    assert all(item.score is None or isinstance(item.score, (int, float)) for item in items)
+
+
+def test_replay_keeps_server_encoding(cassette):
+    # 52pojie 返回 GBK 编码的页面，回放后应与直接解析页面的结果一致
+    with open(os.path.join(FIXTURES_DIR, "..", "pages", "52pojie.html"), encoding="utf-8") as f:
+        expected = [news['title'] for news in FtPoJieCrawler().parse(f.read())]
+    with replay(cassette):
+        result, _ = fetch(FtPoJieCrawler())
+    assert [news['title'] for news in result] == expected
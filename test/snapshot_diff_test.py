@@ -0,0 +1,80 @@
+import os
+import sys
+
+import pytest
+
+# 添加项目根目录到系统路径
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.services import snapshot_diff
+from app.services.sites.news_item import build_items
+from app.services.publisher import content_digest
+from app.services.snapshot_store import encode_items
+from app.utils import codec
+
+pytestmark = pytest.mark.usefixtures("fake_redis")
+
+
+def test_diff_items():
+    previous = encode_items(build_items("weibo", [
+        {"title": "a", "url": "https://x.com/a"},
+        {"title": "b", "url": "https://x.com/b"},
+        {"title": "c", "url": "https://x.com/c"},
+    ]))
+    current = encode_items(build_items("weibo", [
+        {"title": "c", "url": "https://x.com/c#comments"},
+        {"title": "a (更新)", "url": "https://x.com/a"},
+        {"title": "d", "url": "https://x.com/d"},
+    ]))
+
+    diff = snapshot_diff.diff_items(previous, current)
+    assert [item["title"] for item in diff["added"]] == ["d"]
+    assert [item["title"] for item in diff["removed"]] == ["b"]
+    # 以链接作为标识，标题变化不影响匹配
+    moved = {item["title"]: item for item in diff["moved"]}
+    # 平台没有提供热度，只比较排名
+    assert moved["c"]["rank_delta"] == 2 and moved["c"]["score_delta"] is None
+    assert moved["a (更新)"]["rank_delta"] == -1
+    assert snapshot_diff.change_ratio(diff, len(current)) == pytest.approx(1 / 3)
+
+
+def test_list_length_change_does_not_move_items_without_heat():
+    previous = encode_items(build_items("weibo", [{"title": "a"}, {"title": "b"}]))
+    current = encode_items(build_items("weibo", [{"title": "a"}, {"title": "b"}, {"title": "c"}]))
+    diff = snapshot_diff.diff_items(previous, current)
+    assert [item["title"] for item in diff["added"]] == ["c"]
+    assert diff["moved"] == []
+
+
+def test_first_snapshot_is_all_added():
+    diff = snapshot_diff.diff_items(None, encode_items(build_items("weibo", [{"title": "a"}, {"title": "b"}])))
+    assert len(diff["added"]) == 2 and not diff["removed"] and not diff["moved"]
+
+
+def test_publish_time_is_carried_over():
+    def crawl(titles, crawled_at):
+        return encode_items(build_items("weibo", [{"title": t, "publish_time": crawled_at} for t in titles]))
+
+    previous = crawl(["a", "b"], "2024-01-01 10:00:00")
+    current = crawl(["a", "b"], "2024-01-01 10:10:00")
+    snapshot_diff.carry_publish_time(previous, current)
+    # 抓取时间不同但内容相同的榜单序列化结果一致，摘要不变
+    assert content_digest(codec.dumps(current)) == content_digest(codec.dumps(previous))
+
+    changed = crawl(["c", "a"], "2024-01-01 10:20:00")
+    snapshot_diff.carry_publish_time(current, changed)
+    assert [item["publish_time"] for item in changed] == ["2024-01-01 10:20:00", "2024-01-01 10:00:00"]
+
+
+def test_events_read_incrementally(fake_redis):
+    for ts in (1000, 2000):
+        pipe = fake_redis.pipeline()
+        diff = snapshot_diff.diff_items(None, encode_items(build_items("weibo", [{"title": str(ts)}])))
+        snapshot_diff.append_event(pipe, "weibo", diff, ts)
+        pipe.execute()
+
+    events = snapshot_diff.read_events()
+    assert [event["ts"] for _, event in events] == [1000, 2000]
+    assert events[0][1]["added"][0]["title"] == "1000"
+    assert snapshot_diff.read_events(events[0][0])[0][1]["ts"] == 2000
+    assert snapshot_diff.read_events(events[-1][0]) == []
@@ -0,0 +1,49 @@
+import os
+import sys
+
+import pytest
+
+# 添加项目根目录到系统路径
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.services.sites.news_item import build_items, item_id
+from app.services.snapshot_store import SnapshotStore, INDEX_KEY, encode_items
+from app.utils import codec
+
+pytestmark = pytest.mark.usefixtures("fake_redis")
+
+
+def append(client, store, news_list, ts):
+    pipe = client.pipeline()
+    store.append(pipe, "weibo", codec.dumps(encode_items(build_items("weibo", news_list))), ts=ts)
+    pipe.execute()
+
+
+def test_snapshots_are_appended_with_rank_and_score(fake_redis):
+    store = SnapshotStore(retention=3600, max_count=10)
+    append(fake_redis, store, [{"title": "a", "publish_time": "x"}, {"title": "b", "score": 50}], ts=1000)
+    append(fake_redis, store, [{"title": "c"}], ts=2000)
+
+    latest = store.latest("weibo")
+    assert latest["ts"] == 2000
+    assert [(item["title"], item["rank"], item["score"]) for item in latest["items"]] == [("c", 1, None)]
+
+    history = store.history("weibo")
+    assert [snapshot["ts"] for snapshot in history] == [1000, 2000]
+    assert history[0]["items"][0] == {
+        "title": "a", "url": "", "content": "", "source": "weibo", "publish_time": "x",
+        "id": item_id(None, "a"), "platform": "weibo", "rank": 1, "score": None,
+    }
+    assert history[0]["items"][1]["score"] == 50
+    assert [s["ts"] for s in store.history("weibo", since=1500)] == [2000]
+
+
+def test_retention_limits(fake_redis):
+    store = SnapshotStore(retention=3600, max_count=2)
+    for ts in (1000, 2000, 3000):
+        append(fake_redis, store, [{"title": str(ts)}], ts=ts)
+    assert [s["ts"] for s in store.history("weibo")] == [2000, 3000]
+
+    # 超过保留时长的快照从索引中移除
+    append(fake_redis, store, [{"title": "new"}], ts=3000 + 3600 * 1000 + 1)
+    assert fake_redis.zcard(INDEX_KEY.format("weibo")) == 1
@@ -0,0 +1,47 @@
+import os
+import sys
+import time
+from datetime import datetime
+
+import pytest
+
+# 添加项目根目录到系统路径
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.analysis.trend_analyzer import TrendAnalyzer
+from app.services.sites.news_item import build_items
+from app.services.snapshot_store import snapshot_store, encode_items
+from app.utils import codec
+
+pytestmark = pytest.mark.usefixtures("fake_redis")
+
+
+def append(client, platform, news_list, hours_ago):
+    items = encode_items(build_items(platform, news_list))
+    pipe = client.pipeline()
+    snapshot_store.append(pipe, platform, codec.dumps(items), ts=int((time.time() - hours_ago * 3600) * 1000))
+    pipe.execute()
+    return items
+
+
+def test_trend_evolution_uses_snapshot_history(fake_redis):
+    analyzer = TrendAnalyzer()
+    for hours_ago, heat in ((3, 100), (2, 150), (1, 200)):
+        current = append(fake_redis, "weibo", [
+            {"title": "稳定上升的话题", "url": "https://x.com/a", "score": heat},
+            {"title": "刚上榜的话题", "url": "https://x.com/b", "score": 90 if hours_ago == 1 else None},
+        ], hours_ago)
+
+    today = datetime.now(analyzer.shanghai_tz).strftime("%Y-%m-%d")
+    results = {topic["topic"]: topic for topic in analyzer._analyze_trend_evolution({"weibo": current}, today)}
+
+    rising = results["稳定上升的话题"]
+    assert [point["heat"] for point in rising["history"]] == [100, 150, 200]
+    # 按最近两个时间点的变化线性外推
+    assert [point["heat"] for point in rising["forecast"]] == [250, 300, 350]
+    assert rising["trend_type"] == "趋势上升"
+
+    new = results["刚上榜的话题"]
+    assert [point["heat"] for point in new["history"]] == [90]
+    assert new["forecast"] == [] and new["trend_type"] == "数据不足" and new["probability"] is None
+
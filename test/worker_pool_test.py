@@ -0,0 +1,23 @@
+import os
+import sys
+import time
+
+import pytest
+
+# 添加项目根目录到系统路径
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.services.worker_pool import CrawlerWorkerPool, WorkerTimeoutError
+
+
+def test_waiting_for_a_worker_counts_against_timeout():
+    pool = CrawlerWorkerPool(size=1, max_jobs_per_worker=1)
+    # 唯一的工作进程被其他任务占用
+    pool._slots.acquire()
+    start = time.monotonic()
+    with pytest.raises(WorkerTimeoutError):
+        pool.run("weibo", "2024-01-01", timeout=0.1)
+    assert time.monotonic() - start < 1
+    pool._slots.release()
+    # 超时的任务没有占用名额
+    assert pool._slots.acquire(blocking=False)
@@ -0,0 +1,18 @@
+# worker.py
+import os
+import sys
+import argparse
+
+sys.path.insert(0, os.path.abspath(os.path.dirname(__file__)))
+
+from app.core.config import load_config
+load_config()
+
+from app.worker import run_worker
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Crawler worker")
+    parser.add_argument("--consumer", action="store_true",
+                        help="只从任务队列领取抓取任务，不负责调度和分析")
+    args = parser.parse_args()
+    run_worker(consumer_only=args.consumer)